@@ -1,132 +1,89 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from typing import Optional
+
+import orjson
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Query
 from sqlalchemy.orm import Session
 from app.db.database import get_db
-from app.models.user import User
-from app.models.project import Project
-from app.models.experience import Experience
-from app.models.education import Education
-from app.models.skill import Skill
-from app.models.media import Media
-from app.schemas.portfolio import PortfolioResponse
+from app.api.deps import cached_json_response
+from app.services.portfolio_snapshots import (
+    portfolio_snapshots, build_portfolio, SECTIONS, PROJECT_FIELDS, PROJECT_SORTS,
+)
+from app.services.public_cache import public_cache
 
 router = APIRouter()
 
 
+def parse_choices(value: Optional[str], allowed: tuple, name: str) -> Optional[tuple]:
+    """Comma-separated query value as a tuple in canonical order; 400 on unknown names"""
+    if value is None:
+        return None
+    requested = {item.strip() for item in value.split(",") if item.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown {name}: {', '.join(sorted(unknown))}",
+        )
+    return tuple(item for item in allowed if item in requested)
+
+
 @router.get("/{portfolio_username}", response_model=dict)
 async def get_public_portfolio(
     portfolio_username: str,
+    request: Request,
     db: Session = Depends(get_db),
+    sections: Optional[str] = Query(None, description=f"Comma-separated sections: {', '.join(SECTIONS)}"),
+    fields: Optional[str] = Query(None, description=f"Comma-separated project fields: {', '.join(PROJECT_FIELDS)}"),
+    limit_projects: Optional[int] = Query(None, ge=1, le=100),
+    sort: Optional[str] = Query(None, description=f"Project order: {', '.join(PROJECT_SORTS)}"),
 ):
     """Get public portfolio by username (no authentication required)"""
-    user = db.query(User).filter(
-        User.portfolio_username == portfolio_username,
-        User.is_public == True
-    ).first()
-    
-    if not user:
+    selected_sections = parse_choices(sections, SECTIONS, "sections")
+    selected_fields = parse_choices(fields, PROJECT_FIELDS, "fields")
+    if sort is not None and sort not in PROJECT_SORTS:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Portfolio not found",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown sort: {sort}",
         )
+    if limit_projects and sort is None:
+        sort = "stars"
     
-    # Get visible projects only
-    projects = db.query(Project).filter(
-        Project.user_id == user.id,
-        Project.is_visible == True
-    ).all()
-    
-    # Get experiences
-    experiences = db.query(Experience).filter(
-        Experience.user_id == user.id
-    ).all()
-    
-    # Get education
-    education = db.query(Education).filter(
-        Education.user_id == user.id
-    ).all()
+    # The full document is served from its snapshot; partial views are built
+    # with only the queries and columns they need, then cached per variant
+    partial = any(value is not None for value in (selected_sections, selected_fields, limit_projects, sort))
+    namespace = "portfolio"
+    if partial:
+        namespace = "portfolio?" + "&".join(
+            f"{key}={','.join(value) if isinstance(value, tuple) else value}"
+            for key, value in (
+                ("sections", selected_sections), ("fields", selected_fields),
+                ("limit_projects", limit_projects), ("sort", sort),
+            )
+            if value is not None
+        )
     
-    # Get skills
-    skills = db.query(Skill).filter(
-        Skill.user_id == user.id
-    ).all()
+    entry = public_cache.get(namespace, portfolio_username)
     
-    # Get media
-    media = db.query(Media).filter(
-        Media.user_id == user.id,
-        Media.project_id == None  # Portfolio-level media
-    ).all()
+    if entry is None:
+        if partial:
+            built = build_portfolio(
+                db,
+                portfolio_username=portfolio_username,
+                sections=selected_sections or SECTIONS,
+                project_fields=selected_fields or PROJECT_FIELDS,
+                limit_projects=limit_projects,
+                sort=sort,
+            )
+            snapshot = (built[0], orjson.dumps(built[1])) if built else None
+        else:
+            snapshot = portfolio_snapshots.get(db, portfolio_username)
+        
+        if snapshot is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Portfolio not found",
+            )
+        
+        entry = public_cache.put(namespace, portfolio_username, *snapshot)
     
-    return {
-        "user": {
-            "portfolio_username": user.portfolio_username,
-            "github_username": user.github_username,
-            "bio": user.bio,
-            "location": user.location,
-            "avatar_url": user.avatar_url,
-            "profile_url": user.profile_url,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-        },
-        "projects": [
-            {
-                "id": p.id,
-                "name": p.name,
-                "description": p.description,
-                "url": p.url,
-                "deployed_url": p.deployed_url,
-                "status": p.status,
-                "languages": p.languages,
-                "stars": p.stars,
-                "forks": p.forks,
-                "media": db.query(Media).filter(Media.project_id == p.id).all()
-            }
-            for p in projects
-        ],
-        "experiences": [
-            {
-                "id": e.id,
-                "title": e.title,
-                "company": e.company,
-                "location": e.location,
-                "description": e.description,
-                "start_date": e.start_date.isoformat() if e.start_date else None,
-                "end_date": e.end_date.isoformat() if e.end_date else None,
-                "is_current": bool(e.is_current),
-            }
-            for e in experiences
-        ],
-        "education": [
-            {
-                "id": ed.id,
-                "school": ed.school,
-                "degree": ed.degree,
-                "field_of_study": ed.field_of_study,
-                "description": ed.description,
-                "start_date": ed.start_date.isoformat() if ed.start_date else None,
-                "end_date": ed.end_date.isoformat() if ed.end_date else None,
-                "is_current": bool(ed.is_current),
-            }
-            for ed in education
-        ],
-        "skills": [
-            {
-                "id": s.id,
-                "name": s.name,
-                "proficiency": s.proficiency,
-                "category": s.category,
-            }
-            for s in skills
-        ],
-        "media": [
-            {
-                "id": m.id,
-                "filename": m.filename,
-                "file_path": m.file_path,
-                "media_type": m.media_type,
-                "mime_type": m.mime_type,
-                "title": m.title,
-                "description": m.description,
-                "order": m.order,
-            }
-            for m in media
-        ],
-    }
+    return cached_json_response(request, entry)
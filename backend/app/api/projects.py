@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import Optional
@@ -7,129 +8,60 @@ from app.db.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User
 from app.models.project import Project
+from app.models.project_readme import ProjectReadme
+from app.models.sync_job import SyncJob
 from app.schemas.project import (
-    ProjectResponse, ProjectUpdate, ProjectPublicResponse, 
-    ProjectSyncRequest, ProjectListResponse
+    ProjectResponse, ProjectSummaryResponse, ProjectUpdate, ProjectPublicResponse, 
+    ProjectSyncRequest, ProjectListResponse, ProjectReadmeResponse, SyncJobResponse
+)
+from app.services.sync_jobs import sync_job_queue
+from app.services.project_pagination import (
+    PROJECT_LIST_SORTS, InvalidCursor, apply_keyset, encode_cursor, project_totals,
 )
-from app.services.github_service import github_service
 
 router = APIRouter()
 
+# Columns behind ProjectSummaryResponse, in its field order
+PROJECT_SUMMARY_COLUMNS = tuple(
+    getattr(Project, field) for field in ProjectSummaryResponse.model_fields
+)
+
 
-async def sync_user_projects(user: User, db: Session):
-    """Sync projects from GitHub for a user"""
-    if not user.access_token:
+@router.post("/sync", response_model=SyncJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def sync_projects(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    full: bool = Query(False, description="Re-fetch every repo, ignoring sync watermarks"),
+):
+    """Queue a background sync of projects from GitHub"""
+    if not current_user.access_token:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No GitHub access token available",
         )
     
-    # Fetch repositories from GitHub
-    repos = await github_service.get_user_repos(
-        user.access_token, 
-        user.github_username
-    )
-    
-    synced_projects = []
-    
-    for repo in repos:
-        # Check if project already exists
-        existing_project = db.query(Project).filter(
-            Project.github_id == repo["id"],
-            Project.user_id == user.id
-        ).first()
-        
-        # Fetch languages
-        languages = await github_service.get_repo_languages(
-            user.access_token,
-            repo["owner"]["login"],
-            repo["name"]
-        )
-        
-        # Fetch README
-        readme = await github_service.get_readme_content(
-            user.access_token,
-            repo["owner"]["login"],
-            repo["name"]
-        )
-        
-        # Detect demo URL
-        deployed_url = github_service.detect_demo_url(
-            repo.get("homepage"),
-            readme
-        )
-        
-        # Classify project
-        status_type = github_service.classify_project(
-            deployed_url,
-            bool(repo.get("homepage")),
-            repo.get("description")
-        )
-        
-        if existing_project:
-            # Update existing project
-            existing_project.name = repo["name"]
-            existing_project.description = repo.get("description")
-            existing_project.url = repo["html_url"]
-            existing_project.homepage = repo.get("homepage")
-            existing_project.readme_content = readme
-            existing_project.languages = languages
-            existing_project.stars = repo.get("stargazers_count", 0)
-            existing_project.forks = repo.get("forks_count", 0)
-            existing_project.watchers = repo.get("watchers_count", 0)
-            existing_project.is_deployed = deployed_url is not None
-            existing_project.deployed_url = deployed_url
-            existing_project.status = status_type
-            existing_project.is_archived = repo.get("archived", False)
-            existing_project.is_fork = repo.get("fork", False)
-            existing_project.github_updated_at = datetime.utcnow()
-            existing_project.updated_at = datetime.utcnow()
-            db.commit()
-            synced_projects.append(existing_project)
-        else:
-            # Create new project
-            new_project = Project(
-                user_id=user.id,
-                github_id=repo["id"],
-                name=repo["name"],
-                description=repo.get("description"),
-                url=repo["html_url"],
-                homepage=repo.get("homepage"),
-                readme_content=readme,
-                languages=languages,
-                stars=repo.get("stargazers_count", 0),
-                forks=repo.get("forks_count", 0),
-                watchers=repo.get("watchers_count", 0),
-                is_deployed=deployed_url is not None,
-                deployed_url=deployed_url,
-                status=status_type,
-                is_archived=repo.get("archived", False),
-                is_fork=repo.get("fork", False),
-                github_updated_at=datetime.utcnow(),
-            )
-            db.add(new_project)
-            db.commit()
-            db.refresh(new_project)
-            synced_projects.append(new_project)
-    
-    # Update last sync time
-    user.last_sync = datetime.utcnow()
-    db.commit()
-    
-    return synced_projects
+    return sync_job_queue.enqueue(db, current_user, full=full)
 
 
-@router.post("/sync")
-async def sync_projects(
+@router.get("/sync/{job_id}", response_model=SyncJobResponse)
+async def get_sync_job(
+    job_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Manually sync projects from GitHub"""
-    synced = await sync_user_projects(current_user, db)
-    return {
-        "message": f"Synced {len(synced)} projects",
-        "synced_count": len(synced)
-    }
+    """Get status and progress of a sync job"""
+    job = db.query(SyncJob).filter(
+        SyncJob.id == job_id,
+        SyncJob.user_id == current_user.id
+    ).first()
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sync job not found",
+        )
+    
+    return job
 
 
 @router.get("", response_model=ProjectListResponse)
@@ -139,22 +71,54 @@ async def get_user_projects(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     status_filter: Optional[str] = Query(None),
+    sort: str = Query("id", description=f"Sort key: {', '.join(PROJECT_LIST_SORTS)}"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (keyset pagination)"),
+    include_total: Optional[bool] = Query(None, description="Count all matching projects (default: only in offset mode)"),
 ):
-    """Get user's projects"""
+    """Get user's projects
+    
+    Pass `cursor` to page by keyset instead of `skip`; every response
+    carries the `next_cursor` for the following page.
+    """
+    if sort not in PROJECT_LIST_SORTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown sort: {sort}",
+        )
+    
     query = db.query(Project).filter(Project.user_id == current_user.id)
     
     if status_filter:
         query = query.filter(Project.status == status_filter)
     
-    total = query.count()
-    projects = query.offset(skip).limit(limit).all()
+    if include_total is None:
+        include_total = cursor is None
+    total = project_totals.get(query, current_user.id, status_filter) if include_total else None
     
-    return {
-        "items": projects,
-        "total": total,
-        "page": skip // limit,
-        "page_size": limit,
-    }
+    try:
+        page_query = apply_keyset(query, sort, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    if cursor is None:
+        page_query = page_query.offset(skip)
+    
+    # Fast path: select exactly the summary columns as row tuples and encode
+    # them straight to JSON, skipping ORM objects and response validation
+    rows = page_query.with_entities(*PROJECT_SUMMARY_COLUMNS).limit(limit).all()
+    
+    return Response(
+        content=orjson.dumps({
+            "items": [row._asdict() for row in rows],
+            "total": total,
+            "page": skip // limit if cursor is None else None,
+            "page_size": limit,
+            "next_cursor": encode_cursor(sort, rows[-1]) if len(rows) == limit else None,
+        }),
+        media_type="application/json",
+    )
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
@@ -178,6 +142,32 @@ async def get_project(
     return project
 
 
+@router.get("/{project_id}/readme", response_model=ProjectReadmeResponse)
+async def get_project_readme(
+    project_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Get the README of a specific project"""
+    project = db.query(Project.id).filter(
+        Project.id == project_id,
+        Project.user_id == current_user.id
+    ).first()
+    
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    
+    readme = db.query(ProjectReadme).filter(ProjectReadme.project_id == project_id).first()
+    return {
+        "project_id": project_id,
+        "readme_content": readme.text if readme else None,
+        "readme_html": readme.html_text if readme else None,
+    }
+
+
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project(
     project_id: int,
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+from app.schemas.search import SearchResponse
+from app.services.portfolio_search import portfolio_search
+
+router = APIRouter()
+
+
+@router.get("", response_model=SearchResponse)
+async def search_portfolios(
+    q: str = Query(..., min_length=1, max_length=200, description="Words that must all appear, e.g. rust webassembly"),
+    page: int = Query(0, ge=0),
+    page_size: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """Search public portfolios by projects, READMEs, skills and experience (no authentication required)"""
+    found = portfolio_search.search(db, q, page=page, page_size=page_size)
+    return {
+        "query": q,
+        "results": found["results"],
+        "total": found["total"],
+        "page": page,
+        "page_size": page_size,
+    }
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 from datetime import datetime
 
@@ -9,6 +9,9 @@ from app.models.experience import Experience
 from app.models.education import Education
 from app.models.skill import Skill
 from app.schemas.user import UserResponse, UserUpdate, UserPublicResponse
+from app.services.github_rate_limiter import github_rate_limiter
+from app.services.public_cache import public_cache
+from app.api.deps import cached_json_response
 from app.schemas.resume import (
     ExperienceResponse, ExperienceCreate, ExperienceUpdate,
     EducationResponse, EducationCreate, EducationUpdate,
@@ -46,24 +49,41 @@ async def update_user_profile(
     return current_user
 
 
+@router.get("/me/rate-limit")
+async def get_github_rate_limit(
+    current_user: User = Depends(get_current_user),
+):
+    """Get the last known GitHub API budget for the current user's token"""
+    if not current_user.access_token:
+        return {"resources": {}}
+    return {"resources": github_rate_limiter.budget_state(current_user.access_token)}
+
+
 @router.get("/{portfolio_username}", response_model=UserPublicResponse)
 async def get_public_user_profile(
     portfolio_username: str,
+    request: Request,
     db: Session = Depends(get_db),
 ):
     """Get public user profile by portfolio username"""
-    user = db.query(User).filter(
-        User.portfolio_username == portfolio_username,
-        User.is_public == True
-    ).first()
+    entry = public_cache.get("user", portfolio_username)
     
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
+    if entry is None:
+        user = db.query(User).filter(
+            User.portfolio_username == portfolio_username,
+            User.is_public == True
+        ).first()
+        
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
+        
+        body = UserPublicResponse.model_validate(user).model_dump_json().encode()
+        entry = public_cache.put("user", portfolio_username, user.id, body)
     
-    return user
+    return cached_json_response(request, entry)
 
 
 # Experience endpoints
@@ -0,0 +1,43 @@
+import json
+from fastapi import APIRouter, HTTPException, status, Request, Header
+from typing import Optional
+
+from app.core.config import settings
+from app.services.github_webhooks import github_webhook_buffer, verify_signature
+
+router = APIRouter()
+
+
+@router.post("/github", status_code=status.HTTP_202_ACCEPTED)
+async def github_webhook(
+    request: Request,
+    x_github_event: str = Header(...),
+    x_hub_signature_256: Optional[str] = Header(None),
+):
+    """Receive GitHub push, repository and star events"""
+    if not settings.GITHUB_WEBHOOK_SECRET:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Webhooks are not configured",
+        )
+
+    body = await request.body()
+    if not verify_signature(settings.GITHUB_WEBHOOK_SECRET, body, x_hub_signature_256):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid signature",
+        )
+
+    if x_github_event == "ping":
+        return {"message": "pong"}
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid JSON payload",
+        )
+
+    queued = github_webhook_buffer.add(x_github_event, payload)
+    return {"message": "Event queued" if queued else "Event ignored"}
@@ -0,0 +1,91 @@
+"""
+Command line entry point for maintenance tasks.
+
+Usage:
+    python -m app.cli resync [--limit N] [--dry-run]
+    python -m app.cli reclassify [--user-id ID]
+    python -m app.cli export [--dir DIR] [--user-id ID] [--full]
+    python -m app.cli tech-stack [--user-id ID]
+"""
+import argparse
+import asyncio
+import json
+
+import app.models  # noqa: F401  (register all tables)
+from app.db.database import SessionLocal
+from app.db.init_db import init_db
+from app.services.github_service import github_service
+from app.services.project_classifier import project_classifier
+from app.services.resync_scheduler import resync_scheduler
+from app.services.static_export import StaticPortfolioExporter
+from app.services.tech_stack import tech_stack
+from app.core.config import settings
+
+
+async def resync(args: argparse.Namespace) -> None:
+    """Resync the stalest users' projects from GitHub"""
+    try:
+        metrics = await resync_scheduler.run_once(limit=args.limit, dry_run=args.dry_run)
+    finally:
+        await github_service.shutdown()
+    print(json.dumps(metrics, indent=2, default=str))
+
+
+async def reclassify(args: argparse.Namespace) -> None:
+    """Re-run the project classifier over stored projects (no GitHub calls)"""
+    db = SessionLocal()
+    try:
+        updated = project_classifier.reclassify_stored(db, user_id=args.user_id)
+    finally:
+        db.close()
+    print(json.dumps({"reclassified": updated}))
+
+
+async def export(args: argparse.Namespace) -> None:
+    """Write public portfolios as static JSON/HTML files (incremental unless --full)"""
+    exporter = StaticPortfolioExporter(args.dir)
+    user_ids = [args.user_id] if args.user_id is not None else None
+    print(json.dumps(exporter.export(user_ids=user_ids, full=args.full)))
+
+
+async def backfill_tech_stack(args: argparse.Namespace) -> None:
+    """Recompute per-user language aggregates (and portfolio snapshots) from stored projects"""
+    db = SessionLocal()
+    try:
+        covered = tech_stack.backfill(db, user_id=args.user_id)
+    finally:
+        db.close()
+    print(json.dumps({"users": covered}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    resync_parser = commands.add_parser("resync", help="Resync stale users from GitHub")
+    resync_parser.add_argument("--limit", type=int, default=None, help="Max users in this run")
+    resync_parser.add_argument("--dry-run", action="store_true", help="Print the plan without syncing")
+    resync_parser.set_defaults(handler=resync)
+
+    reclassify_parser = commands.add_parser("reclassify", help="Re-classify stored projects offline")
+    reclassify_parser.add_argument("--user-id", type=int, default=None, help="Only this user's projects")
+    reclassify_parser.set_defaults(handler=reclassify)
+
+    export_parser = commands.add_parser("export", help="Export public portfolios as static files")
+    export_parser.add_argument("--dir", default=settings.STATIC_EXPORT_DIR or None,
+                               required=not settings.STATIC_EXPORT_DIR, help="Output directory")
+    export_parser.add_argument("--user-id", type=int, default=None, help="Only this user's portfolio")
+    export_parser.add_argument("--full", action="store_true", help="Rewrite every portfolio")
+    export_parser.set_defaults(handler=export)
+
+    tech_stack_parser = commands.add_parser("tech-stack", help="Backfill per-user tech stack aggregates")
+    tech_stack_parser.add_argument("--user-id", type=int, default=None, help="Only this user")
+    tech_stack_parser.set_defaults(handler=backfill_tech_stack)
+
+    args = parser.parse_args()
+    init_db()
+    asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,56 @@ class Settings(BaseSettings):
     GITHUB_CLIENT_ID: str
     GITHUB_CLIENT_SECRET: str
     GITHUB_OAUTH_REDIRECT_URI: str = "http://localhost:8000/auth/callback"
+    GITHUB_WEBHOOK_SECRET: str = ""  # Webhook receiver is disabled when empty
+    GITHUB_WEBHOOK_DEBOUNCE: float = 5.0  # Seconds to batch events per repo
+
+    # GitHub sync
+    GITHUB_SYNC_CONCURRENCY: int = 10  # Max in-flight per-repo enrichment requests
+    GITHUB_SYNC_ENGINE: str = "rest"  # rest (1 + 2N requests) or graphql (batched)
+    GITHUB_SYNC_MAX_REPOS: int = 500  # Max repos listed per user sync
+    SYNC_WORKERS: int = 2  # Background sync jobs run concurrently
+    SYNC_JOB_HEARTBEAT: float = 30.0  # Seconds between liveness writes of a running job
+    SYNC_JOB_STALE_AFTER: float = 300.0  # A running job without a heartbeat this long is abandoned
+    DEMO_URL_HOSTS: list = [  # Deployment hosts recognised as live demos, in precedence order
+        "vercel.app", "netlify.app", "herokuapp.com",
+        "render.com", "github.io", "surge.sh",
+    ]
+
+    # Fleet-wide scheduled resync
+    RESYNC_INTERVAL: int = 0  # Seconds between in-process resync runs; 0 disables the loop
+    RESYNC_MIN_AGE: int = 6 * 60 * 60  # Only users not synced for this many seconds
+    RESYNC_BATCH_SIZE: int = 200  # Max users per run
+    RESYNC_CONCURRENCY: int = 4  # User syncs running at once
+    RESYNC_USERS_PER_MINUTE: int = 60  # Global start rate across the fleet
+    RESYNC_JITTER: float = 5.0  # Max random delay added before each user sync
+
+    # GitHub HTTP connection pool (shared for the app lifetime)
+    GITHUB_HTTP_MAX_CONNECTIONS: int = 50
+    GITHUB_HTTP_MAX_KEEPALIVE: int = 20
+    GITHUB_HTTP_KEEPALIVE_EXPIRY: float = 30.0  # Seconds an idle connection is kept
+    GITHUB_HTTP_MAX_PER_HOST: int = 20  # Max concurrent requests to a single host
+    GITHUB_HTTP2: bool = False  # Requires the optional `h2` package
+    GITHUB_HTTP_TIMEOUT: float = 10.0
+
+    # GitHub rate-limit scheduling (shared across all syncs)
+    GITHUB_RATE_LIMIT_RESERVE: int = 50  # Requests per token syncs leave free for interactive requests (sign-in)
+    GITHUB_RATE_LIMIT_MAX_WAIT: float = 60.0  # Longest a request waits for budget before failing
+    GITHUB_RATE_LIMIT_MAX_RETRIES: int = 2  # Retries after a 403/429 rate-limit response
+
+    # GitHub conditional-request (ETag) cache, persisted in the app DB
+    GITHUB_CACHE_ENABLED: bool = True
+    GITHUB_CACHE_MAX_ENTRIES: int = 50000
+
+    # In-process cache for public portfolio / profile responses
+    PUBLIC_CACHE_MAX_ENTRIES: int = 1000
+    PUBLIC_CACHE_TTL: float = 60.0  # Seconds before an entry is rebuilt even without writes
+    PUBLIC_CACHE_CONTROL: str = "public, max-age=60, stale-while-revalidate=300"
+
+    # Languages listed in the portfolio tech_stack section; the rest are summed as "other"
+    TECH_STACK_TOP_N: int = 10
+
+    # Static portfolio export for serving straight from nginx; empty disables the post-sync export
+    STATIC_EXPORT_DIR: str = ""
 
     # App
     SECRET_KEY: str = "your-very-secure-random-secret-key-change-me"
@@ -1,22 +1,22 @@
 from sqlalchemy import text
 
 from app.db.database import engine, Base
+from app.db.migrations import run_migrations
 
 
 def init_db():
     """
-    Create all tables defined in models (when Base.metadata.create_all is called).
-    Safe to call multiple times — only creates missing tables.
+    Bring the database schema up to date by applying pending migrations
+    (see app/db/migrations.py). Safe to call multiple times.
     """
     # Optional: enable foreign key support (good practice with SQLite)
     with engine.connect() as connection:
         connection.execute(text("PRAGMA foreign_keys = ON;"))
         connection.commit()
 
-    # Create tables (will be no-op if they already exist)
-    Base.metadata.create_all(bind=engine)
+    run_migrations()
 
 
 # Optional: function to drop everything (useful in development/testing)
 def drop_db():
-    Base.metadata.drop_all(bind=engine)
\ No newline at end of file
+    Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,208 @@
+"""
+Versioned schema migrations.
+
+Each migration runs once, in version order, and is recorded in the
+schema_migrations table. Migrations are written to be idempotent so they
+also apply cleanly to databases created before versioning existed (where
+some of their changes may already be present).
+
+To change the schema, update the models and append a migration here.
+"""
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, text
+
+from app.db.database import engine, Base, SessionLocal
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[], None]
+
+
+# Kept out of Base.metadata so create_all never touches it
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def add_column(table: str, column: str) -> None:
+    """Add a model column to an existing table unless it is already there"""
+    existing = {c["name"] for c in inspect(engine).get_columns(table)}
+    if column in existing:
+        return
+    column_type = Base.metadata.tables[table].c[column].type.compile(dialect=engine.dialect)
+    with engine.begin() as connection:
+        connection.execute(text(f'ALTER TABLE "{table}" ADD COLUMN "{column}" {column_type}'))
+
+
+def create_indexes(*names: str) -> None:
+    """Create model-declared indexes by name unless they already exist"""
+    indexes = {
+        index.name: index
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+    }
+    for name in names:
+        indexes[name].create(bind=engine, checkfirst=True)
+
+
+def create_tables() -> None:
+    """Create every model table that does not exist yet (new installs get the full schema)"""
+    Base.metadata.create_all(bind=engine)
+
+
+def add_sync_columns() -> None:
+    add_column("projects", "topics")
+    add_column("projects", "status_confidence")
+    add_column("projects", "github_pushed_at")
+    add_column("projects", "readme_excerpt")
+    add_column("project_readmes", "content_hash")
+    add_column("project_readmes", "html")
+    create_indexes(
+        "uq_projects_user_github",
+        "ix_projects_user_id_id",
+        "ix_projects_user_stars",
+        "ix_projects_user_updated",
+    )
+
+
+def move_inline_readmes(chunk_size: int = 500) -> None:
+    """Compress READMEs stored inline in projects.readme_content into project_readmes.
+
+    The inline copy is cleared, and READMEs stored without HTML / excerpts
+    are pre-rendered.
+    """
+    from app.models.project_readme import decompress_readme
+    from app.services.readme_store import save_readmes
+    
+    db = SessionLocal()
+    try:
+        while True:
+            rows = db.execute(text(
+                "SELECT id, readme_content FROM projects "
+                "WHERE readme_content IS NOT NULL LIMIT :limit"
+            ), {"limit": chunk_size}).all()
+            if not rows:
+                break
+            save_readmes(db, {project_id: readme for project_id, readme in rows})
+            db.execute(
+                text("UPDATE projects SET readme_content = NULL WHERE id = :id"),
+                [{"id": project_id} for project_id, _ in rows],
+            )
+            db.commit()
+        
+        # READMEs stored before HTML pre-rendering
+        last_id = 0
+        while True:
+            rows = db.execute(text(
+                "SELECT project_id, content FROM project_readmes "
+                "WHERE project_id > :last_id AND (content_hash IS NULL OR html IS NULL) "
+                "ORDER BY project_id LIMIT :limit"
+            ), {"last_id": last_id, "limit": chunk_size}).all()
+            if not rows:
+                break
+            save_readmes(db, {project_id: decompress_readme(content) for project_id, content in rows})
+            db.commit()
+            last_id = rows[-1][0]
+    finally:
+        db.close()
+
+
+def add_hot_query_indexes() -> None:
+    create_indexes(
+        "ix_projects_user_visible",
+        "ix_projects_user_status",
+        "ix_media_project_id",
+        "ix_media_user_project",
+        "ix_experiences_user_id",
+        "ix_education_user_id",
+        "ix_skills_user_id",
+    )
+
+
+def create_search_index() -> None:
+    """Create the FTS5 portfolio search table and index every public user (rows keyed by project / user id)"""
+    from app.services.portfolio_search import CREATE_SEARCH_TABLE
+    
+    with engine.begin() as connection:
+        connection.execute(text(CREATE_SEARCH_TABLE))
+    reindex_public_users()
+
+
+def reindex_public_users(chunk_size: int = 500) -> None:
+    """Index every public user's search rows, committing per chunk"""
+    from app.models.user import User
+    from app.services.portfolio_search import portfolio_search
+    
+    db = SessionLocal()
+    try:
+        last_id = 0
+        while True:
+            user_ids = [
+                user_id for user_id, in db.query(User.id).filter(
+                    User.id > last_id, User.is_public == True
+                ).order_by(User.id).limit(chunk_size)
+            ]
+            if not user_ids:
+                break
+            portfolio_search.reindex(db, user_ids)
+            db.commit()
+            last_id = user_ids[-1]
+    finally:
+        db.close()
+
+
+def create_tech_stack() -> None:
+    """Create the per-user language aggregates and compute them for every user.
+
+    Snapshots are rebuilt for each user too, adding the tech_stack section.
+    """
+    from app.services.portfolio_snapshots import portfolio_snapshots  # noqa: F401  (registers the rebuild hook)
+    from app.services.tech_stack import tech_stack
+    
+    Base.metadata.tables["user_languages"].create(bind=engine, checkfirst=True)
+    create_indexes("ix_user_languages_user_bytes")
+    
+    db = SessionLocal()
+    try:
+        tech_stack.backfill(db)
+    finally:
+        db.close()
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "create tables", create_tables),
+    Migration(2, "sync, classification and README columns", add_sync_columns),
+    Migration(3, "move inline READMEs to project_readmes", move_inline_readmes),
+    Migration(4, "indexes for hot query shapes", add_hot_query_indexes),
+    Migration(5, "portfolio full-text search index", create_search_index),
+    Migration(6, "per-user tech stack aggregates", create_tech_stack),
+]
+
+
+def run_migrations() -> List[int]:
+    """Apply pending migrations in order; returns the versions applied"""
+    schema_migrations.create(bind=engine, checkfirst=True)
+    with engine.connect() as connection:
+        applied = {row.version for row in connection.execute(schema_migrations.select())}
+
+    done = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version in applied:
+            continue
+        migration.apply()
+        with engine.begin() as connection:
+            connection.execute(schema_migrations.insert().values(
+                version=migration.version,
+                name=migration.name,
+                applied_at=datetime.utcnow(),
+            ))
+        done.append(migration.version)
+    return done
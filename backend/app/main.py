@@ -4,16 +4,29 @@ from sqlalchemy import text
 import logging
 
 from app.db.database import engine, get_db
-from app.db.init_db import init_db
-from app.api import auth, users, projects, portfolio, resume
+from app.db.migrations import run_migrations
+from app.api import auth, users, projects, portfolio, resume, webhooks, search
+from app.services.github_service import github_service
+from app.services.github_cache import github_cache
+from app.services.github_rate_limiter import github_rate_limiter
+from app.services.public_cache import public_cache
+from app.services.sync_jobs import sync_job_queue
+from app.services.github_webhooks import github_webhook_buffer
+from app.services.resync_scheduler import resync_scheduler
 
 # Import models to create tables
 import app.models.user
 import app.models.project
+import app.models.project_readme
 import app.models.experience
 import app.models.education
 import app.models.skill
 import app.models.media
+import app.models.github_cache
+import app.models.sync_job
+import app.models.resync_run
+import app.models.portfolio_snapshot
+import app.models.user_language
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -39,10 +52,10 @@ app.add_middleware(
 async def startup():
     """Initialize database on startup"""
     try:
-        # Create all tables
-        from app.models import User, Project, Experience, Education, Skill, Media
-        from app.db.database import Base
-        Base.metadata.create_all(bind=engine)
+        # Create tables and apply pending schema migrations
+        applied = run_migrations()
+        if applied:
+            logger.info(f"Applied migrations: {applied}")
         
         # Enable foreign keys for SQLite
         with engine.connect() as connection:
@@ -52,6 +65,23 @@ async def startup():
         logger.info("Database initialized successfully")
     except Exception as e:
         logger.error(f"Error during startup: {e}")
+    
+    # Open the shared GitHub connection pool
+    await github_service.startup()
+    
+    # Start background sync workers
+    await sync_job_queue.start()
+    await resync_scheduler.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release shared resources on shutdown"""
+    await resync_scheduler.stop()
+    await sync_job_queue.stop()
+    await github_webhook_buffer.stop()
+    await github_service.shutdown()
+    github_cache.flush()
 
 # Include API routers
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -59,6 +89,8 @@ app.include_router(users.router, prefix="/users", tags=["users"])
 app.include_router(projects.router, prefix="/projects", tags=["projects"])
 app.include_router(portfolio.router, prefix="/portfolio", tags=["portfolio"])
 app.include_router(resume.router, prefix="/resume", tags=["resume"])
+app.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
+app.include_router(search.router, prefix="/search", tags=["search"])
 
 @app.get("/")
 async def read_root():
@@ -72,4 +104,10 @@ async def read_root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "ok", "database": "sqlite"}
+    return {
+        "status": "ok",
+        "database": "sqlite",
+        "github_cache": github_cache.stats(),
+        "github_rate_limit": github_rate_limiter.stats(),
+        "public_cache": public_cache.stats(),
+    }
@@ -1,8 +1,14 @@
 from app.models.user import User
 from app.models.project import Project
+from app.models.project_readme import ProjectReadme
 from app.models.experience import Experience
 from app.models.education import Education
 from app.models.skill import Skill
 from app.models.media import Media
+from app.models.github_cache import GitHubCacheEntry
+from app.models.sync_job import SyncJob
+from app.models.resync_run import ResyncRun
+from app.models.portfolio_snapshot import PortfolioSnapshot
+from app.models.user_language import UserLanguage
 
-__all__ = ["User", "Project", "Experience", "Education", "Skill", "Media"]
\ No newline at end of file
+__all__ = ["User", "Project", "ProjectReadme", "Experience", "Education", "Skill", "Media", "GitHubCacheEntry", "SyncJob", "ResyncRun", "PortfolioSnapshot", "UserLanguage"]
\ No newline at end of file
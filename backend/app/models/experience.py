@@ -8,7 +8,7 @@ class Experience(Base):
     __tablename__ = "experiences"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
     title = Column(String, nullable=False)
     company = Column(String, nullable=False)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, JSON
+from datetime import datetime
+from app.db.database import Base
+
+
+class GitHubCacheEntry(Base):
+    __tablename__ = "github_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String, unique=True, index=True, nullable=False)  # sha256 of token scope + URL
+    url = Column(String, nullable=False)
+    
+    # Validators sent back as If-None-Match / If-Modified-Since
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    
+    # Cached 200 response
+    body = Column(LargeBinary, nullable=False)
+    headers = Column(JSON, nullable=True)  # Subset of response headers worth replaying (e.g. Link)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    accessed_at = Column(DateTime, default=datetime.utcnow, index=True)  # LRU eviction order
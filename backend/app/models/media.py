@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
@@ -6,10 +6,14 @@ from app.db.database import Base
 
 class Media(Base):
     __tablename__ = "media"
+    __table_args__ = (
+        # Portfolio-level (project_id IS NULL) and per-project media of a user
+        Index("ix_media_user_project", "user_id", "project_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=True)  # NULL if portfolio-level media
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=True, index=True)  # NULL if portfolio-level media
     
     filename = Column(String, nullable=False)
     file_path = Column(String, nullable=False)  # Relative path or URL
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary
+from datetime import datetime
+from app.db.database import Base
+
+
+class PortfolioSnapshot(Base):
+    """Prebuilt public portfolio JSON for a user, rebuilt whenever their data changes"""
+    __tablename__ = "portfolio_snapshots"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    portfolio_username = Column(String, unique=True, index=True, nullable=False)
+    content = Column(LargeBinary, nullable=False)  # Serialized portfolio document (UTF-8 JSON)
+    
+    built_at = Column(DateTime, default=datetime.utcnow)
@@ -1,11 +1,22 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, JSON, Index, Float
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.db.database import Base
 
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # One row per GitHub repo per user; target of the sync upsert
+        Index("uq_projects_user_github", "user_id", "github_id", unique=True),
+        # Public (visible) and status-filtered project lists
+        Index("ix_projects_user_visible", "user_id", "is_visible"),
+        Index("ix_projects_user_status", "user_id", "status"),
+        # Keyset pagination orders for project lists
+        Index("ix_projects_user_id_id", "user_id", "id"),
+        Index("ix_projects_user_stars", "user_id", "stars", "id"),
+        Index("ix_projects_user_updated", "user_id", "updated_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     github_id = Column(Integer, index=True, nullable=False)
@@ -13,10 +24,13 @@ class Project(Base):
     description = Column(String, nullable=True)
     url = Column(String, nullable=False)
     homepage = Column(String, nullable=True)  # Live demo URL
-    readme_content = Column(String, nullable=True)
+    # Legacy uncompressed README column; bodies now live in project_readmes
+    legacy_readme_content = deferred(Column("readme_content", String, nullable=True))
+    readme_excerpt = Column(String, nullable=True)  # Plain-text README summary for list views
     
     # Tech stack
     languages = Column(JSON, nullable=True)  # {language: percentage}
+    topics = Column(JSON, nullable=True)  # GitHub repository topics
     
     # GitHub stats
     stars = Column(Integer, default=0)
@@ -24,7 +38,8 @@ class Project(Base):
     watchers = Column(Integer, default=0)
     
     # Project classification
-    status = Column(String, default="code_only")  # deployed, code_only, in_progress
+    status = Column(String, default="code_only")  # deployed, in_progress, library, stale, archived, code_only
+    status_confidence = Column(Float, nullable=True)  # 0..1 from the project classifier
     is_deployed = Column(Boolean, default=False)
     deployed_url = Column(String, nullable=True)  # Actual live demo URL found
     
@@ -36,7 +51,8 @@ class Project(Base):
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    github_updated_at = Column(DateTime, nullable=True)
+    github_updated_at = Column(DateTime, nullable=True)  # Repo `updated_at` from GitHub
+    github_pushed_at = Column(DateTime, nullable=True)  # Repo `pushed_at`; incremental sync watermark
     
     # Foreign key
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -48,4 +64,21 @@ class Project(Base):
         back_populates="project",
         lazy="select",
         cascade="all, delete-orphan"
-    )
\ No newline at end of file
+    )
+    readme = relationship(
+        "ProjectReadme",
+        back_populates="project",
+        uselist=False,
+        lazy="select",
+        cascade="all, delete-orphan"
+    )
+    
+    @property
+    def readme_content(self):
+        """Decompressed README text (loads the README row on first access)"""
+        return self.readme.text if self.readme else None
+    
+    @property
+    def readme_html(self):
+        """Sanitized HTML rendered from the README at sync time"""
+        return self.readme.html_text if self.readme else None
\ No newline at end of file
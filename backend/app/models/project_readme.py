@@ -0,0 +1,41 @@
+import zlib
+from typing import Optional
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.db.database import Base
+
+
+def compress_readme(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def decompress_readme(content: Optional[bytes]) -> Optional[str]:
+    if content is None:
+        return None
+    return zlib.decompress(content).decode("utf-8", errors="ignore")
+
+
+class ProjectReadme(Base):
+    """README body for a project, zlib-compressed and kept out of the projects table"""
+    __tablename__ = "project_readmes"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    content = Column(LargeBinary, nullable=False)  # zlib-compressed UTF-8
+    size = Column(Integer, nullable=False)  # Uncompressed size in bytes
+    content_hash = Column(String, nullable=True)  # readme_hash() of the text the HTML was rendered from
+    html = Column(LargeBinary, nullable=True)  # zlib-compressed sanitized HTML
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    project = relationship("Project", back_populates="readme")
+    
+    @property
+    def text(self) -> Optional[str]:
+        """Decompressed README text"""
+        return decompress_readme(self.content)
+    
+    @property
+    def html_text(self) -> Optional[str]:
+        """Decompressed pre-rendered HTML"""
+        return decompress_readme(self.html)
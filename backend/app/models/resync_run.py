@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from datetime import datetime
+from app.db.database import Base
+
+
+class ResyncRun(Base):
+    __tablename__ = "resync_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, default="running", index=True)  # running, completed
+    
+    # Checkpoint: users planned for this run, and those already handled
+    planned_user_ids = Column(JSON, nullable=False)
+    completed_user_ids = Column(JSON, nullable=False, default=list)
+    
+    # Metrics
+    synced = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    deferred = Column(Integer, default=0)  # Skipped because the token had no budget
+    
+    started_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
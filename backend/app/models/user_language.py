@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index
+from app.db.database import Base
+
+
+class UserLanguage(Base):
+    """Per-user language totals across visible projects, kept current by sync"""
+    __tablename__ = "user_languages"
+    __table_args__ = (
+        Index("ix_user_languages_user_bytes", "user_id", "bytes"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    language = Column(String, primary_key=True)
+    
+    bytes = Column(Integer, nullable=False, default=0)  # Sum of GitHub language bytes
+    share = Column(Float, nullable=False, default=0.0)  # Fraction of the user's total bytes
+    project_count = Column(Integer, nullable=False, default=0)  # Visible projects using it
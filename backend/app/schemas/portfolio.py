@@ -33,4 +33,5 @@ class PortfolioResponse(BaseModel):
     experiences: List[dict]  # Experience list
     education: List[dict]  # Education list
     skills: List[dict]  # Skills list
+    tech_stack: dict  # Language totals: total_bytes, top languages, other
     media: List[MediaResponse]  # Portfolio media
@@ -16,17 +16,20 @@ class ProjectUpdate(BaseModel):
     is_visible: Optional[bool] = None
 
 
-class ProjectResponse(ProjectBase):
+class ProjectSummaryResponse(ProjectBase):
+    """Project fields without the README body (used in lists)"""
     id: int
     github_id: int
     url: str
     homepage: Optional[str]
-    readme_content: Optional[str]
+    readme_excerpt: Optional[str] = None
     languages: Optional[Dict[str, int]]
+    topics: Optional[List[str]] = None
     stars: int
     forks: int
     watchers: int
-    status: str  # deployed, code_only, in_progress
+    status: str  # deployed, in_progress, library, stale, archived, code_only
+    status_confidence: Optional[float] = None
     is_deployed: bool
     deployed_url: Optional[str]
     is_visible: bool
@@ -35,11 +38,24 @@ class ProjectResponse(ProjectBase):
     created_at: datetime
     updated_at: datetime
     github_updated_at: Optional[datetime]
+    github_pushed_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
 
+class ProjectResponse(ProjectSummaryResponse):
+    readme_content: Optional[str]
+    readme_html: Optional[str] = None
+
+
+class ProjectReadmeResponse(BaseModel):
+    """README body of a single project"""
+    project_id: int
+    readme_content: Optional[str]
+    readme_html: Optional[str] = None
+
+
 class ProjectPublicResponse(BaseModel):
     """Public project info (filtered)"""
     id: int
@@ -47,6 +63,7 @@ class ProjectPublicResponse(BaseModel):
     description: Optional[str]
     url: str
     deployed_url: Optional[str]
+    readme_excerpt: Optional[str] = None
     status: str
     languages: Optional[Dict[str, int]]
     stars: int
@@ -61,8 +78,26 @@ class ProjectSyncRequest(BaseModel):
 
 
 class ProjectListResponse(BaseModel):
-    """Paginated project list"""
-    items: List[ProjectResponse]
-    total: int
-    page: int
+    """Paginated project list (offset or keyset)"""
+    items: List[ProjectSummaryResponse]
+    total: Optional[int]  # None when not requested in cursor mode
+    page: Optional[int]  # None in cursor mode
     page_size: int
+    next_cursor: Optional[str] = None
+
+
+class SyncJobResponse(BaseModel):
+    """Background sync job state"""
+    id: int
+    status: str  # queued, running, completed, failed
+    full: bool
+    repos_total: int
+    repos_done: int
+    synced_count: int
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+
+class SearchMatch(BaseModel):
+    """A matching project (or the profile, when project_id is None)"""
+    project_id: Optional[int]
+    name: Optional[str]
+    snippet: str  # HTML-escaped, matches wrapped in <mark>
+
+
+class SearchResult(BaseModel):
+    """A public portfolio matching the query"""
+    portfolio_username: str
+    github_username: str
+    avatar_url: Optional[str]
+    bio: Optional[str]
+    score: float
+    matches: List[SearchMatch]
+
+
+class SearchResponse(BaseModel):
+    """Ranked, paginated portfolio search results"""
+    query: str
+    results: List[SearchResult]
+    total: int
+    page: int
+    page_size: int
@@ -0,0 +1,97 @@
+import re
+from typing import Optional, Iterable
+from urllib.parse import urlsplit
+
+from app.core.config import settings
+
+
+# Characters allowed in the host part of a bare URL found in README text
+HOST_CHARS = r"[^\s/?#()\[\]<>\"'`]"
+
+
+class DemoUrlDetector:
+    """Live demo URL detector for homepages and READMEs.
+
+    A README is searched once for the deployment host suffixes, a literal-led
+    pattern the regex engine runs fast; only where one is found is the URL
+    around it matched against the ordered host alternatives. A scan with
+    every host folded into it is slower than the per-host searches it
+    replaced, as the engine tries each host at every position.
+    A homepage is parsed rather than searched: it counts only as an http(s)
+    URL whose host is on a deployment host.
+    Precedence is unchanged: a matching homepage wins, then the README URL
+    on the earliest host in the configured list, then the first markdown
+    link whose text mentions demo, live or preview.
+    """
+
+    def __init__(self, hosts: Iterable[str]):
+        self.hosts = list(hosts)
+        host_alternatives = "|".join(
+            rf"(?P<h{rank}>https?://{HOST_CHARS}+\.{re.escape(host)})(?![\w-])"
+            for rank, host in enumerate(self.hosts)
+        )
+        suffixes = "|".join(re.escape(host) for host in self.hosts)
+        self._host_pattern = re.compile(host_alternatives, re.IGNORECASE)
+        self._suffix_pattern = re.compile(rf"\.(?:{suffixes})(?![\w-])", re.IGNORECASE)
+        self._link_pattern = re.compile(
+            r"\[[^\]\n]*?(?:demo|live|preview)[^\]\n]*\]\((https?://[^)\s]+)\)", re.IGNORECASE
+        )
+
+    @staticmethod
+    def _rank(match: re.Match) -> int:
+        """Position in the host list of the host alternative that matched"""
+        return int(match.lastgroup[1:])
+
+    def _url_around(self, text: str, suffix: re.Match) -> Optional[re.Match]:
+        """Host URL whose host ends in the given suffix match, if it is a bare http(s) URL"""
+        # "/" is not a host character, so the scheme ends at the nearest "//"
+        slashes = text.rfind("//", 0, suffix.start())
+        if slashes < 0:
+            return None
+        for scheme_length in (len("https:"), len("http:")):
+            match = self._host_pattern.match(text, max(slashes - scheme_length, 0))
+            if match:
+                return match
+        return None
+
+    def _is_deployment(self, url: str) -> bool:
+        """Whether `url` is an http(s) URL whose host is a subdomain of a deployment host"""
+        try:
+            parts = urlsplit(url.strip())
+            hostname = parts.hostname
+        except ValueError:
+            return False
+        if parts.scheme.lower() not in ("http", "https") or not hostname:
+            return False
+        return any(hostname.endswith(f".{host}") for host in self.hosts)
+
+    def detect(self, homepage: Optional[str], readme: Optional[str]) -> Optional[str]:
+        """Detect live demo URL from homepage or README"""
+        if homepage and self._is_deployment(homepage):
+            return homepage
+
+        if not readme:
+            return None
+
+        best_rank = len(self.hosts)
+        best_url = None
+
+        for suffix in self._suffix_pattern.finditer(readme):
+            match = self._url_around(readme, suffix)
+            if not match:
+                continue
+            rank = self._rank(match)
+            if rank < best_rank:
+                best_rank, best_url = rank, match.group(0)
+                if rank == 0:
+                    break
+
+        if best_url:
+            return best_url
+
+        link = self._link_pattern.search(readme)
+        return link.group(1) if link else None
+
+
+# Global instance, built once from settings
+demo_url_detector = DemoUrlDetector(settings.DEMO_URL_HOSTS)
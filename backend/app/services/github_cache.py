@@ -0,0 +1,204 @@
+import hashlib
+import json
+from typing import Optional, Dict, Any
+from datetime import datetime
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.github_cache import GitHubCacheEntry
+
+
+class GitHubResponseCache:
+    """Persistent ETag / Last-Modified cache for GitHub GET responses.
+
+    Entries are keyed per access token and URL, so one user's private view of
+    a repo is never served to another token. 304 responses are free against
+    the GitHub rate limit, so revalidating is always cheaper than refetching.
+
+    Stores and LRU touches are buffered in memory and written by flush() in
+    one short transaction (once per sync, or when the buffer fills up), so
+    fetching never commits. A failed cache read or write only costs a
+    revalidation; it is never reported as a missing response.
+    """
+
+    # Response headers replayed on a cache hit
+    REPLAY_HEADERS = ("content-type", "link")
+
+    def __init__(self, max_entries: int, prune_every: int = 100, flush_every: int = 500):
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self.flush_every = flush_every
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._touched: Dict[str, datetime] = {}
+        self._writes_since_prune = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.flushes = 0
+        self.errors = 0
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]], access_token: Optional[str]) -> str:
+        """Build the cache key for a request (the token is only stored hashed)"""
+        scope = hashlib.sha256((access_token or "").encode()).hexdigest()
+        query = json.dumps(params or {}, sort_keys=True, default=str)
+        return hashlib.sha256(f"{scope}|{url}|{query}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[GitHubCacheEntry]:
+        """Look up a cached entry (detached), including writes not flushed yet"""
+        pending = self._pending.get(key)
+        if pending is not None:
+            return GitHubCacheEntry(**pending)
+
+        db = SessionLocal()
+        try:
+            entry = db.query(GitHubCacheEntry).filter(GitHubCacheEntry.cache_key == key).first()
+            if entry:
+                db.expunge(entry)
+            return entry
+        except Exception as e:
+            # Treated as a miss: the request goes out without validators
+            self.errors += 1
+            print(f"Error reading GitHub cache: {e}")
+            return None
+        finally:
+            db.close()
+
+    def conditional_headers(self, entry: Optional[GitHubCacheEntry]) -> Dict[str, str]:
+        """Validators to send with a revalidation request"""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def touch(self, key: str) -> None:
+        """Record a cache hit and bump the entry's LRU position on the next flush"""
+        self.hits += 1
+        now = datetime.utcnow()
+        if key in self._pending:
+            self._pending[key]["accessed_at"] = now
+        else:
+            self._touched[key] = now
+        self._maybe_flush()
+
+    def store(self, key: str, url: str, body: bytes, headers: Dict[str, str]) -> None:
+        """Buffer a 200 response if it carries a validator"""
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+
+        self._pending[key] = {
+            "cache_key": key,
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body,
+            "headers": {name: headers[name] for name in self.REPLAY_HEADERS if name in headers},
+            "accessed_at": datetime.utcnow(),
+        }
+        self._touched.pop(key, None)
+        self.stores += 1
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if len(self._pending) + len(self._touched) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered stores and touches in one transaction; returns entries written"""
+        pending, self._pending = self._pending, {}
+        touched, self._touched = self._touched, {}
+        if not pending and not touched:
+            return 0
+
+        db = SessionLocal()
+        try:
+            if pending:
+                stmt = sqlite_insert(GitHubCacheEntry)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[GitHubCacheEntry.cache_key],
+                    set_={
+                        column: stmt.excluded[column]
+                        for column in ("url", "etag", "last_modified", "body", "headers", "accessed_at")
+                    },
+                )
+                db.execute(stmt, list(pending.values()))
+            if touched:
+                db.execute(
+                    update(GitHubCacheEntry.__table__)
+                    .where(GitHubCacheEntry.__table__.c.cache_key == bindparam("key"))
+                    .values(accessed_at=bindparam("accessed")),
+                    [{"key": key, "accessed": accessed_at} for key, accessed_at in touched.items()],
+                )
+            db.commit()
+        except Exception as e:
+            # Losing buffered entries only means refetching them later
+            db.rollback()
+            self.errors += 1
+            print(f"Error writing GitHub cache: {e}")
+            return 0
+        finally:
+            db.close()
+
+        self.flushes += 1
+        self._writes_since_prune += len(pending)
+        if self._writes_since_prune >= self.prune_every:
+            self.prune()
+        return len(pending) + len(touched)
+
+    def prune(self) -> int:
+        """Evict least recently used entries beyond max_entries"""
+        self._writes_since_prune = 0
+        db = SessionLocal()
+        try:
+            total = db.query(GitHubCacheEntry).count()
+            overflow = total - self.max_entries
+            if overflow <= 0:
+                return 0
+
+            stale_ids = [
+                row.id for row in db.query(GitHubCacheEntry.id)
+                .order_by(GitHubCacheEntry.accessed_at.asc())
+                .limit(overflow)
+            ]
+            db.query(GitHubCacheEntry).filter(
+                GitHubCacheEntry.id.in_(stale_ids)
+            ).delete(synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self.errors += 1
+            print(f"Error pruning GitHub cache: {e}")
+            return 0
+        finally:
+            db.close()
+
+        self.evictions += len(stale_ids)
+        return len(stale_ids)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters since process start"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "flushes": self.flushes,
+            "errors": self.errors,
+            "buffered": len(self._pending) + len(self._touched),
+        }
+
+
+# Global instance
+github_cache = GitHubResponseCache(max_entries=settings.GITHUB_CACHE_MAX_ENTRIES)
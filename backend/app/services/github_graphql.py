@@ -0,0 +1,224 @@
+import asyncio
+from typing import Optional, List, Dict, Any, Tuple, Callable, AsyncIterator
+
+from app.core.config import settings
+from app.services.github_service import github_service
+from app.services.github_rate_limiter import GitHubRateLimitError
+
+
+REPOS_QUERY = """
+query($login: String!, $first: Int!, $after: String) {
+  user(login: $login) {
+    repositories(
+      first: $first
+      after: $after
+      privacy: PUBLIC
+      isFork: false
+      ownerAffiliations: OWNER
+      orderBy: {field: UPDATED_AT, direction: DESC}
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        databaseId
+        name
+        description
+        url
+        homepageUrl
+        stargazerCount
+        forkCount
+        isArchived
+        isFork
+        createdAt
+        updatedAt
+        pushedAt
+        owner { login }
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+        languages(first: 100, orderBy: {field: SIZE, direction: DESC}) {
+          edges { size node { name } }
+        }
+        readme: object(expression: "HEAD:README.md") { ... on Blob { text isTruncated isBinary } }
+        rootFiles: object(expression: "HEAD:") { ... on Tree { entries { name type } } }
+        githubFiles: object(expression: "HEAD:.github") { ... on Tree { entries { name type } } }
+        docsFiles: object(expression: "HEAD:docs") { ... on Tree { entries { name type } } }
+      }
+    }
+  }
+}
+"""
+
+# Directories REST /readme looks in, in its order of preference, with the
+# query alias listing each one's files
+README_DIRS = ((".github", "githubFiles"), ("", "rootFiles"), ("docs", "docsFiles"))
+
+
+def find_readme(node: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """(directory, file name) of the README REST /readme would return, from the tree listings"""
+    for directory, alias in README_DIRS:
+        names = [
+            entry["name"] for entry in ((node.get(alias) or {}).get("entries") or [])
+            if entry.get("type") == "blob" and entry["name"].lower().split(".", 1)[0] == "readme"
+        ]
+        if names:
+            # README.md wins over other extensions in the same directory
+            return directory, "README.md" if "README.md" in names else names[0]
+    return None
+
+
+class GitHubGraphQLService:
+    """Batched repository fetch over the GitHub GraphQL API.
+
+    Pulls repos, language sizes and README text in pages of up to 100 repos,
+    replacing the 1 + 2N REST requests. Exposes the same get_user_repos /
+    enrich_repos pair as GitHubService, so sync can use either engine.
+
+    README text comes inline for the common root README.md. Any other
+    README the REST endpoint would find (other case or extension, docs/,
+    .github/), and a root README.md too large or binary to inline, is
+    located from the tree listings and fetched over REST in enrich_repos,
+    so both engines return the same README.
+    """
+
+    URL = "https://api.github.com/graphql"
+    PAGE_SIZE = 100
+
+    @staticmethod
+    def _to_rest_shape(node: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a GraphQL repository node onto the REST repo dict keys"""
+        languages = {
+            edge["node"]["name"]: edge["size"]
+            for edge in (node.get("languages") or {}).get("edges", [])
+        }
+        readme_path = find_readme(node)
+        readme = None
+        blob = node.get("readme") or {}
+        # A truncated (oversized) or binary blob's text is not the README REST returns
+        if readme_path == ("", "README.md") and not (blob.get("isTruncated") or blob.get("isBinary")):
+            readme = blob.get("text")
+        return {
+            "id": node["databaseId"],
+            "name": node["name"],
+            "description": node.get("description"),
+            "html_url": node["url"],
+            "homepage": node.get("homepageUrl"),
+            "stargazers_count": node.get("stargazerCount", 0),
+            "forks_count": node.get("forkCount", 0),
+            # REST watchers_count mirrors the star count, keep both engines identical
+            "watchers_count": node.get("stargazerCount", 0),
+            "archived": node.get("isArchived", False),
+            "fork": node.get("isFork", False),
+            "created_at": node.get("createdAt"),
+            "updated_at": node.get("updatedAt"),
+            "pushed_at": node.get("pushedAt"),
+            "owner": {"login": node["owner"]["login"]},
+            "topics": [
+                topic_node["topic"]["name"]
+                for topic_node in (node.get("repositoryTopics") or {}).get("nodes", [])
+            ],
+            # Enrichment fetched in the same query, consumed by enrich_repos()
+            "languages": languages,
+            "readme": readme,
+            # README found but not inlined (or a binary/oversized blob): fetch over REST
+            "readme_fallback": readme_path is not None and readme is None,
+        }
+
+    async def _query(self, access_token: str, variables: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Run one page of the repositories query"""
+        response = await github_service._request(
+            "POST",
+            self.URL,
+            access_token,
+            json={"query": REPOS_QUERY, "variables": variables},
+        )
+        if response.status_code != 200:
+            print(f"GraphQL request failed with status {response.status_code}")
+            return None
+
+        payload = response.json()
+        if payload.get("errors"):
+            print(f"GraphQL errors: {payload['errors']}")
+        return payload.get("data")
+
+    async def iter_user_repos(
+        self,
+        access_token: str,
+        username: str,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream public, non-fork, non-archived repos with languages and README, page by page"""
+        limit = limit or settings.GITHUB_SYNC_MAX_REPOS
+        cursor = None
+        yielded = 0
+
+        try:
+            while yielded < limit:
+                data = await self._query(
+                    access_token,
+                    {"login": username, "first": self.PAGE_SIZE, "after": cursor},
+                )
+                if not data or not data.get("user"):
+                    return
+
+                connection = data["user"]["repositories"]
+                page = [
+                    repo for repo in (self._to_rest_shape(node) for node in connection["nodes"] if node)
+                    if not repo.get("fork", False) and not repo.get("archived", False)
+                ][:limit - yielded]
+                if page:
+                    yielded += len(page)
+                    yield page
+
+                if not connection["pageInfo"]["hasNextPage"]:
+                    return
+                cursor = connection["pageInfo"]["endCursor"]
+        except GitHubRateLimitError:
+            raise
+        except Exception as e:
+            print(f"Error fetching repositories via GraphQL: {e}")
+
+    async def get_user_repos(self, access_token: str, username: str) -> List[Dict[str, Any]]:
+        """Fetch public, non-fork, non-archived repos with languages and README"""
+        repos = []
+        async for page in self.iter_user_repos(access_token, username):
+            repos.extend(page)
+        return repos
+
+    async def enrich_repos(
+        self,
+        access_token: str,
+        repos: List[Dict[str, Any]],
+        concurrency: Optional[int] = None,
+        on_repo_done: Optional[Callable[[], None]] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> List[Optional[Tuple[Dict[str, int], Optional[str]]]]:
+        """Return the languages and README fetched with the listing.
+
+        READMEs the listing could not inline are fetched over REST; a repo
+        whose fallback fetch fails yields None, as in GitHubService.
+        """
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(concurrency or settings.GITHUB_SYNC_CONCURRENCY)
+
+        async def enrich(repo: Dict[str, Any]) -> Optional[Tuple[Dict[str, int], Optional[str]]]:
+            languages, readme = repo.get("languages") or {}, repo.get("readme")
+            enrichment = (languages, readme)
+            if repo.get("readme_fallback"):
+                owner = repo["owner"]["login"]
+                try:
+                    async with semaphore:
+                        enrichment = (languages, await github_service._fetch_readme(
+                            access_token, owner, repo["name"]
+                        ))
+                except GitHubRateLimitError:
+                    raise
+                except Exception as e:
+                    print(f"Error enriching {owner}/{repo['name']}: {e}")
+                    enrichment = None
+            if on_repo_done:
+                on_repo_done()
+            return enrichment
+
+        return await asyncio.gather(*(enrich(repo) for repo in repos))
+
+
+# Global instance
+github_graphql_service = GitHubGraphQLService()
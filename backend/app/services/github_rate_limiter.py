@@ -0,0 +1,150 @@
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Tuple
+
+import httpx
+
+from app.core.config import settings
+
+
+class GitHubRateLimitError(Exception):
+    """Raised when a token's budget is exhausted for longer than we are willing to wait"""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(f"GitHub rate limit exhausted, retry after {int(retry_after)}s")
+
+
+@dataclass
+class RateLimitBudget:
+    """Last known budget for one token and resource (core, graphql, ...)"""
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: float = 0.0  # Epoch seconds when `remaining` refills
+    blocked_until: float = 0.0  # Epoch seconds set by Retry-After / secondary limits
+
+
+class GitHubRateLimiter:
+    """Shared scheduler that keeps every sync inside each token's GitHub budget.
+
+    Budgets are tracked per access token (hashed) and API resource from the
+    X-RateLimit-* headers. Background requests (syncs) are held back once
+    only `reserve` requests remain, leaving those for interactive requests
+    such as sign-in, which may use the budget down to zero. Retry-After
+    from 403/429 secondary limits is honoured.
+    """
+
+    # Default wait when a secondary limit response carries no Retry-After
+    SECONDARY_LIMIT_BACKOFF = 60.0
+
+    def __init__(self, reserve: int, max_wait: float):
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self._budgets: Dict[Tuple[str, str], RateLimitBudget] = {}
+        self.throttled = 0
+        self.rejected = 0
+
+    @staticmethod
+    def _token_key(access_token: str) -> str:
+        return hashlib.sha256(access_token.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def resource_for(url: str) -> str:
+        """GitHub budget bucket a URL is charged against"""
+        return "graphql" if url.rstrip("/").endswith("/graphql") else "core"
+
+    def _budget(self, access_token: str, resource: str) -> RateLimitBudget:
+        key = (self._token_key(access_token), resource)
+        budget = self._budgets.get(key)
+        if budget is None:
+            budget = self._budgets[key] = RateLimitBudget()
+        return budget
+
+    def wait_time(self, access_token: str, resource: str = "core", background: bool = True) -> float:
+        """Seconds until a request may be sent for this token"""
+        budget = self._budget(access_token, resource)
+        now = time.time()
+        wait = max(budget.blocked_until - now, 0.0)
+        reserve = self.reserve if background else 0
+        if budget.remaining is not None and budget.remaining <= reserve and budget.reset_at > now:
+            wait = max(wait, budget.reset_at - now)
+        return wait
+
+    async def acquire(self, access_token: Optional[str], url: str, background: bool = True) -> None:
+        """Wait for budget before a request, or raise if the wait is too long"""
+        if not access_token:
+            return
+        resource = self.resource_for(url)
+        wait = self.wait_time(access_token, resource, background)
+        if wait > self.max_wait:
+            self.rejected += 1
+            raise GitHubRateLimitError(wait)
+        if wait > 0:
+            self.throttled += 1
+            await asyncio.sleep(wait)
+
+        # Reserve one request so concurrent callers see the reduced budget
+        budget = self._budget(access_token, resource)
+        if budget.remaining is not None:
+            budget.remaining -= 1
+
+    def record(self, access_token: Optional[str], url: str, response: httpx.Response) -> bool:
+        """Update the budget from a response; True if the request should be retried"""
+        if not access_token:
+            return False
+        headers = response.headers
+        budget = self._budget(access_token, headers.get("x-ratelimit-resource") or self.resource_for(url))
+
+        if "x-ratelimit-remaining" in headers:
+            budget.remaining = int(headers["x-ratelimit-remaining"])
+            budget.limit = int(headers.get("x-ratelimit-limit", budget.limit or 0))
+            budget.reset_at = float(headers.get("x-ratelimit-reset", budget.reset_at))
+
+        if response.status_code not in (403, 429):
+            return False
+
+        now = time.time()
+        if "retry-after" in headers:
+            budget.blocked_until = now + float(headers["retry-after"])
+        elif budget.remaining == 0 and budget.reset_at > now:
+            budget.blocked_until = budget.reset_at
+        elif response.status_code == 429 or "secondary rate limit" in response.text.lower():
+            budget.blocked_until = now + self.SECONDARY_LIMIT_BACKOFF
+        else:
+            # Plain permission error, not a rate limit
+            return False
+        return True
+
+    def budget_state(self, access_token: str) -> Dict[str, Any]:
+        """Current known budget for a token, per resource"""
+        token_key = self._token_key(access_token)
+        now = time.time()
+        return {
+            resource: {
+                "limit": budget.limit,
+                "remaining": budget.remaining,
+                "reset_at": int(budget.reset_at) if budget.reset_at else None,
+                "blocked_for": max(round(budget.blocked_until - now, 1), 0.0),
+            }
+            for (key, resource), budget in self._budgets.items()
+            if key == token_key
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Scheduler counters since process start"""
+        now = time.time()
+        return {
+            "tracked_budgets": len(self._budgets),
+            "blocked_budgets": sum(1 for b in self._budgets.values() if b.blocked_until > now),
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+        }
+
+
+# Global instance
+github_rate_limiter = GitHubRateLimiter(
+    reserve=settings.GITHUB_RATE_LIMIT_RESERVE,
+    max_wait=settings.GITHUB_RATE_LIMIT_MAX_WAIT,
+)
@@ -1,8 +1,18 @@
+import asyncio
+import base64
 import httpx
-import re
-from typing import Optional, List, Dict, Any
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, Tuple, Callable, AsyncIterator
 from datetime import datetime
+from urllib.parse import urlsplit
 from app.core.config import settings
+from app.services.demo_url import demo_url_detector
+from app.services.github_cache import github_cache
+from app.services.github_rate_limiter import github_rate_limiter, GitHubRateLimitError
+
+
+class GitHubFetchError(Exception):
+    """Raised when GitHub gives no usable answer for a resource that should exist"""
 
 
 class GitHubService:
@@ -14,6 +24,134 @@ class GitHubService:
     def __init__(self):
         self.client_id = settings.GITHUB_CLIENT_ID
         self.client_secret = settings.GITHUB_CLIENT_SECRET
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+    
+    @staticmethod
+    def _build_client() -> httpx.AsyncClient:
+        """Create the pooled client from settings"""
+        http2 = settings.GITHUB_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("GITHUB_HTTP2 is enabled but `h2` is not installed; using HTTP/1.1")
+                http2 = False
+        
+        return httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.GITHUB_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GITHUB_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=settings.GITHUB_HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=settings.GITHUB_HTTP_TIMEOUT,
+        )
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared pooled client, opened lazily if startup() was not called"""
+        if self._client is None:
+            self._client = self._build_client()
+        return self._client
+    
+    async def startup(self) -> None:
+        """Open the shared connection pool (called on app startup)"""
+        if self._client is None:
+            self._client = self._build_client()
+    
+    async def shutdown(self) -> None:
+        """Close the shared connection pool (called on app shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._host_slots.clear()
+    
+    @asynccontextmanager
+    async def _host_slot(self, url: str):
+        """Cap concurrent requests per host on the shared pool"""
+        host = urlsplit(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(settings.GITHUB_HTTP_MAX_PER_HOST)
+        async with slot:
+            yield
+    
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        access_token: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        background: bool = True,
+        **kwargs,
+    ) -> httpx.Response:
+        """Send a request to GitHub over the shared connection pool.
+
+        Requests wait for the token's rate-limit budget and are retried after
+        a 403/429 rate-limit response; GitHubRateLimitError is raised when the
+        budget will not recover within GITHUB_RATE_LIMIT_MAX_WAIT. Interactive
+        requests pass background=False to use the reserve syncs leave free.
+        """
+        request_headers = {**self.HEADERS, **(headers or {})}
+        if access_token:
+            request_headers["Authorization"] = f"token {access_token}"
+        
+        attempt = 0
+        while True:
+            await github_rate_limiter.acquire(access_token, url, background)
+            async with self._host_slot(url):
+                response = await self.client.request(method, url, headers=request_headers, **kwargs)
+            
+            if not github_rate_limiter.record(access_token, url, response):
+                return response
+            if attempt >= settings.GITHUB_RATE_LIMIT_MAX_RETRIES:
+                raise GitHubRateLimitError(github_rate_limiter.wait_time(
+                    access_token, github_rate_limiter.resource_for(url), background
+                ))
+            attempt += 1
+    
+    async def _cached_get(
+        self,
+        url: str,
+        access_token: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        background: bool = True,
+    ) -> httpx.Response:
+        """GET with ETag / Last-Modified revalidation against the response cache.
+
+        A 304 from GitHub is turned back into the cached 200 response, so
+        callers never see the difference. Cache writes are buffered until
+        github_cache.flush().
+        """
+        if not settings.GITHUB_CACHE_ENABLED:
+            return await self._request("GET", url, access_token, params=params, background=background)
+        
+        key = github_cache.make_key(url, params, access_token)
+        entry = github_cache.get(key)
+        
+        response = await self._request(
+            "GET",
+            url,
+            access_token,
+            headers=github_cache.conditional_headers(entry),
+            params=params,
+            background=background,
+        )
+        
+        if response.status_code == 304 and entry is not None:
+            github_cache.touch(key)
+            return httpx.Response(
+                200,
+                content=entry.body,
+                headers=entry.headers or {},
+                request=response.request,
+            )
+        
+        github_cache.misses += 1
+        if response.status_code == 200:
+            github_cache.store(key, url, response.content, response.headers)
+        return response
     
     async def get_oauth_url(self, state: str) -> str:
         """Get GitHub OAuth authorization URL"""
@@ -28,21 +166,20 @@ class GitHubService:
     async def exchange_code_for_token(self, code: str) -> Optional[Dict[str, Any]]:
         """Exchange GitHub OAuth code for access token"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://github.com/login/oauth/access_token",
-                    data={
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret,
-                        "code": code,
-                    },
-                    headers={"Accept": "application/json"},
-                    timeout=10.0,
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                return None
+            response = await self._request(
+                "POST",
+                "https://github.com/login/oauth/access_token",
+                data={
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "code": code,
+                },
+                headers={"Accept": "application/json"},
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            return None
         except Exception as e:
             print(f"Error exchanging code for token: {e}")
             return None
@@ -50,78 +187,94 @@ class GitHubService:
     async def get_user_profile(self, access_token: str) -> Optional[Dict[str, Any]]:
         """Fetch user profile from GitHub"""
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {**self.HEADERS, "Authorization": f"token {access_token}"}
-                response = await client.get(
-                    f"{self.BASE_URL}/user",
-                    headers=headers,
-                    timeout=10.0,
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                return None
+            # Sign-in: may use the budget reserved from background syncs
+            response = await self._cached_get(f"{self.BASE_URL}/user", access_token, background=False)
+            
+            if response.status_code == 200:
+                return response.json()
+            return None
         except Exception as e:
             print(f"Error fetching user profile: {e}")
             return None
     
-    async def get_user_repos(self, access_token: str, username: str) -> List[Dict[str, Any]]:
-        """Fetch all public repositories for a user"""
+    @staticmethod
+    def _is_listed(repo: Dict[str, Any]) -> bool:
+        """Forked and archived repos are not part of a portfolio"""
+        return not repo.get("fork", False) and not repo.get("archived", False)
+    
+    async def iter_user_repos(
+        self,
+        access_token: str,
+        username: str,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream a user's public repositories one page at a time.
+
+        Forks and archived repos are filtered out of each page, pages are
+        followed through the `Link: rel="next"` header, and at most `limit`
+        repos (GITHUB_SYNC_MAX_REPOS by default) are yielded in total.
+        """
+        limit = limit or settings.GITHUB_SYNC_MAX_REPOS
+        url = f"{self.BASE_URL}/users/{username}/repos"
+        params = {"per_page": 100, "sort": "updated"}
+        yielded = 0
+        
         try:
-            repos = []
-            page = 1
-            per_page = 100
-            
-            async with httpx.AsyncClient() as client:
-                headers = {**self.HEADERS, "Authorization": f"token {access_token}"}
+            while url and yielded < limit:
+                response = await self._cached_get(url, access_token, params=params)
+                if response.status_code != 200:
+                    return
                 
-                while True:
-                    response = await client.get(
-                        f"{self.BASE_URL}/users/{username}/repos",
-                        headers=headers,
-                        params={"page": page, "per_page": per_page, "sort": "updated"},
-                        timeout=10.0,
-                    )
-                    
-                    if response.status_code != 200:
-                        break
-                    
-                    data = response.json()
-                    if not data:
-                        break
-                    
-                    repos.extend(data)
-                    page += 1
-                    
-                    # Rate limit: stop after fetching enough repos
-                    if len(repos) > 500:
-                        break
-            
-            # Filter out forked and archived repos
-            filtered_repos = [
-                repo for repo in repos
-                if not repo.get("fork", False) and not repo.get("archived", False)
-            ]
-            
-            return filtered_repos
+                page = [repo for repo in response.json() if self._is_listed(repo)][:limit - yielded]
+                if page:
+                    yielded += len(page)
+                    yield page
+                
+                # The next link already carries the query string
+                url = response.links.get("next", {}).get("url")
+                params = None
+        except GitHubRateLimitError:
+            raise
         except Exception as e:
             print(f"Error fetching repositories: {e}")
-            return []
+    
+    async def get_user_repos(self, access_token: str, username: str) -> List[Dict[str, Any]]:
+        """Fetch all public repositories for a user"""
+        repos = []
+        async for page in self.iter_user_repos(access_token, username):
+            repos.extend(page)
+        return repos
+    
+    async def _fetch_languages(self, access_token: str, owner: str, repo: str) -> Dict[str, int]:
+        """Languages of a repository; raises GitHubFetchError when GitHub does not answer"""
+        response = await self._cached_get(
+            f"{self.BASE_URL}/repos/{owner}/{repo}/languages",
+            access_token,
+        )
+        if response.status_code == 200:
+            return response.json()
+        raise GitHubFetchError(f"languages of {owner}/{repo}: HTTP {response.status_code}")
+    
+    async def _fetch_readme(self, access_token: str, owner: str, repo: str) -> Optional[str]:
+        """README text, or None if the repo has none; raises GitHubFetchError on other failures"""
+        response = await self._cached_get(
+            f"{self.BASE_URL}/repos/{owner}/{repo}/readme",
+            access_token,
+        )
+        if response.status_code == 200:
+            # GitHub returns base64 encoded content
+            content = response.json().get("content", "")
+            return base64.b64decode(content).decode("utf-8", errors="ignore")
+        if response.status_code == 404:
+            return None
+        raise GitHubFetchError(f"README of {owner}/{repo}: HTTP {response.status_code}")
     
     async def get_repo_languages(self, access_token: str, owner: str, repo: str) -> Dict[str, int]:
         """Fetch programming languages distribution for a repository"""
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {**self.HEADERS, "Authorization": f"token {access_token}"}
-                response = await client.get(
-                    f"{self.BASE_URL}/repos/{owner}/{repo}/languages",
-                    headers=headers,
-                    timeout=10.0,
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                return {}
+            return await self._fetch_languages(access_token, owner, repo)
+        except GitHubRateLimitError:
+            raise
         except Exception as e:
             print(f"Error fetching repository languages: {e}")
             return {}
@@ -129,74 +282,71 @@ class GitHubService:
     async def get_readme_content(self, access_token: str, owner: str, repo: str) -> Optional[str]:
         """Fetch README content from a repository"""
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {**self.HEADERS, "Authorization": f"token {access_token}"}
-                response = await client.get(
-                    f"{self.BASE_URL}/repos/{owner}/{repo}/readme",
-                    headers=headers,
-                    timeout=10.0,
-                )
-                
-                if response.status_code == 200:
-                    # GitHub returns base64 encoded content
-                    import base64
-                    content = response.json().get("content", "")
-                    return base64.b64decode(content).decode("utf-8", errors="ignore")
-                return None
+            return await self._fetch_readme(access_token, owner, repo)
+        except GitHubRateLimitError:
+            raise
         except Exception as e:
             print(f"Error fetching README: {e}")
             return None
     
-    @staticmethod
-    def detect_demo_url(homepage: Optional[str], readme: Optional[str]) -> Optional[str]:
-        """Detect live demo URL from homepage or README"""
-        # Common deployment platforms
-        demo_patterns = [
-            r"https?://.+\.vercel\.app",
-            r"https?://.+\.netlify\.app",
-            r"https?://.+\.herokuapp\.com",
-            r"https?://.+\.render\.com",
-            r"https?://.+\.github\.io",
-            r"https?://.+\.surge\.sh",
-        ]
+    async def enrich_repos(
+        self,
+        access_token: str,
+        repos: List[Dict[str, Any]],
+        concurrency: Optional[int] = None,
+        on_repo_done: Optional[Callable[[], None]] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> List[Optional[Tuple[Dict[str, int], Optional[str]]]]:
+        """Fetch languages and README for many repos concurrently.
+
+        Returns one (languages, readme) tuple per repo, in the same order as
+        `repos`, or None for a repo whose languages or README could not be
+        fetched, so callers can tell a failure from a repo without data.
+        `on_repo_done` is called as each repo finishes, for progress reporting.
+        Pass a shared `semaphore` to bound several concurrent calls together.
+        """
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(concurrency or settings.GITHUB_SYNC_CONCURRENCY)
         
-        # Check homepage first
-        if homepage:
-            for pattern in demo_patterns:
-                if re.search(pattern, homepage, re.IGNORECASE):
-                    return homepage
+        async def limited(coro):
+            async with semaphore:
+                return await coro
         
-        # Check README for demo links
-        if readme:
-            for pattern in demo_patterns:
-                match = re.search(pattern, readme, re.IGNORECASE)
-                if match:
-                    return match.group(0)
-            
-            # Also check for "demo" or "live" links
-            demo_links = re.findall(
-                r"\[.*?(demo|live|preview).*?\]\((https?://[^\)]+)\)",
-                readme,
-                re.IGNORECASE
+        async def enrich(repo: Dict[str, Any]) -> Optional[Tuple[Dict[str, int], Optional[str]]]:
+            owner = repo["owner"]["login"]
+            languages, readme = await asyncio.gather(
+                limited(self._fetch_languages(access_token, owner, repo["name"])),
+                limited(self._fetch_readme(access_token, owner, repo["name"])),
+                return_exceptions=True,
             )
-            if demo_links:
-                return demo_links[0][1]
+            # An exhausted budget fails the whole sync instead of writing empty data
+            for result in (languages, readme):
+                if isinstance(result, GitHubRateLimitError):
+                    raise result
+            if on_repo_done:
+                on_repo_done()
+            errors = [result for result in (languages, readme) if isinstance(result, BaseException)]
+            if errors:
+                print(f"Error enriching {owner}/{repo['name']}: {errors[0]}")
+                return None
+            return languages, readme
         
-        return None
+        return await asyncio.gather(*(enrich(repo) for repo in repos))
     
     @staticmethod
-    def classify_project(deployed_url: Optional[str], has_homepage: bool, description: Optional[str]) -> str:
-        """Classify project status"""
-        if deployed_url or has_homepage:
-            return "deployed"
-        
-        if description and any(
-            keyword in description.lower()
-            for keyword in ["wip", "work in progress", "in progress", "todo", "experimental"]
-        ):
-            return "in_progress"
-        
-        return "code_only"
+    def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+        """Parse a GitHub ISO 8601 timestamp into a naive UTC datetime"""
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def detect_demo_url(homepage: Optional[str], readme: Optional[str]) -> Optional[str]:
+        """Detect live demo URL from homepage or README"""
+        return demo_url_detector.detect(homepage, readme)
 
 
 # Global instance
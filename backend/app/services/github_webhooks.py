@@ -0,0 +1,164 @@
+import asyncio
+import hashlib
+import hmac
+import time
+from typing import Optional, Dict, Any, Iterable
+from datetime import datetime
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.project import Project
+from app.models.user import User
+from app.services.github_cache import github_cache
+from app.services.github_service import github_service
+from app.services.github_rate_limiter import GitHubRateLimitError
+from app.services.project_sync import repo_to_project_row, upsert_project_rows
+from app.services.readme_store import load_readmes
+
+
+HANDLED_EVENTS = ("push", "repository", "star")
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Check the X-Hub-Signature-256 header against the raw request body"""
+    if not secret or not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(f"sha256={expected}", signature)
+
+
+def normalize_repository(repo: Dict[str, Any]) -> Dict[str, Any]:
+    """Bring a webhook `repository` object to the REST listing shape.
+
+    Push events send created_at / pushed_at as epoch seconds rather than
+    ISO 8601 strings.
+    """
+    repo = dict(repo)
+    for key in ("created_at", "updated_at", "pushed_at"):
+        if isinstance(repo.get(key), (int, float)):
+            repo[key] = datetime.utcfromtimestamp(repo[key]).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return repo
+
+
+class GitHubWebhookBuffer:
+    """Debounces webhook events per repository and applies them in batches.
+
+    Bursts of events for one repo (a push followed by stars, several pushes)
+    collapse into a single row update once the repo has been quiet for
+    GITHUB_WEBHOOK_DEBOUNCE seconds: every event restarts its repo's timer.
+    Repos that go quiet together are applied in one batch, and events that
+    arrive while a batch is being applied wait for their own quiet period.
+    """
+
+    def __init__(self, debounce: float):
+        self.debounce = debounce
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def add(self, event: str, payload: Dict[str, Any]) -> bool:
+        """Buffer an event; returns False when it does not affect any project"""
+        repository = payload.get("repository")
+        if event not in HANDLED_EVENTS or not repository:
+            return False
+
+        if event == "push":
+            default_ref = f"refs/heads/{repository.get('default_branch')}"
+            if payload.get("ref") != default_ref:
+                return False
+
+        entry = self._pending.setdefault(
+            repository["id"], {"repository": None, "pushed": False, "deleted": False}
+        )
+        entry["repository"] = normalize_repository(repository)
+        entry["pushed"] = entry["pushed"] or event == "push"
+        entry["deleted"] = event == "repository" and payload.get("action") == "deleted"
+        entry["last_event"] = time.monotonic()
+
+        # A running flush loop picks the event up; it only exits once nothing is buffered
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_when_quiet())
+        return True
+
+    async def _flush_when_quiet(self) -> None:
+        """Apply each repo once it has been quiet for `debounce` seconds, until the buffer is empty"""
+        while self._pending:
+            now = time.monotonic()
+            quiet = [
+                repo_id for repo_id, entry in self._pending.items()
+                if entry["last_event"] + self.debounce <= now
+            ]
+            if quiet:
+                await self.flush(quiet)
+            else:
+                next_quiet = min(entry["last_event"] for entry in self._pending.values()) + self.debounce
+                await asyncio.sleep(next_quiet - now)
+
+    async def stop(self) -> None:
+        """Apply anything still buffered (called on app shutdown)"""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        await self.flush()
+
+    async def flush(self, repo_ids: Optional[Iterable[int]] = None) -> int:
+        """Apply buffered events (all, or just these repos'); returns the number of projects touched"""
+        if repo_ids is None:
+            repo_ids = list(self._pending)
+        batch = {repo_id: self._pending.pop(repo_id) for repo_id in repo_ids if repo_id in self._pending}
+        if not batch:
+            return 0
+
+        db = SessionLocal()
+        try:
+            matches = db.query(Project, User).join(User, Project.user_id == User.id).filter(
+                Project.github_id.in_(list(batch.keys()))
+            ).all()
+
+            kept = []
+            pushed_rows = []
+            for project, user in matches:
+                entry = batch[project.github_id]
+                repo = entry["repository"]
+
+                if entry["deleted"]:
+                    db.delete(project)
+                    continue
+
+                if entry["pushed"] and user.access_token:
+                    # Default-branch push: README and languages may have changed
+                    try:
+                        [enrichment] = await github_service.enrich_repos(user.access_token, [repo])
+                    except GitHubRateLimitError as e:
+                        print(f"Skipping README refresh for {repo.get('full_name')}: {e}")
+                        enrichment = None
+                    if enrichment is not None:
+                        pushed_rows.append(repo_to_project_row(user, repo, *enrichment))
+                        continue
+
+                kept.append((project, user, repo))
+
+            # Stars, repository edits and pushes that could not be enriched keep
+            # the stored README and languages, and so the stored pushed_at
+            # watermark: the next incremental sync must still see a pushed repo
+            # as changed and enrich it.
+            readmes = load_readmes(db, [project.id for project, _, _ in kept])
+            rows = []
+            for project, user, repo in kept:
+                row = repo_to_project_row(user, repo, project.languages, readmes.get(project.id))
+                row["github_pushed_at"] = project.github_pushed_at
+                rows.append(row)
+
+            upsert_project_rows(db, pushed_rows)
+            upsert_project_rows(db, rows, store_readmes=False)
+            db.commit()
+            github_cache.flush()
+            return len(matches)
+        except Exception as e:
+            db.rollback()
+            print(f"Error applying GitHub webhook batch: {e}")
+            return 0
+        finally:
+            db.close()
+
+
+# Global instance
+github_webhook_buffer = GitHubWebhookBuffer(debounce=settings.GITHUB_WEBHOOK_DEBOUNCE)
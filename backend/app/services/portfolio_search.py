@@ -0,0 +1,251 @@
+import html
+import re
+from typing import Dict, Any, Iterable, List, Set
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.project import Project
+from app.models.experience import Experience
+from app.models.skill import Skill
+from app.services.readme_store import load_readmes
+
+
+# One row per visible project of a public user (rowid = project id) plus one
+# profile row per public user with skills and experience titles (rowid = -user id)
+CREATE_SEARCH_TABLE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS portfolio_search USING fts5("
+    "user_id UNINDEXED, project_id UNINDEXED, "
+    "name, description, readme, tags, profile, "
+    "tokenize = 'porter unicode61')"
+)
+
+# bm25 column weights: name, description, readme, tags (topics/languages), profile
+RANK = "bm25(portfolio_search, 0, 0, 10.0, 5.0, 1.0, 5.0, 2.0)"
+
+# Snippet markers, swapped for <mark> after HTML-escaping the snippet
+MARK_START, MARK_END = "\x02", "\x03"
+
+SEARCH_TERM = re.compile(r"\w+", re.UNICODE)
+
+# Matching projects shown per portfolio
+MATCHES_PER_PORTFOLIO = 3
+
+STALE_KEY = "stale_search_rows"
+
+# Project attributes copied into its search row; is_visible decides whether it has one
+PROJECT_SEARCH_ATTRIBUTES = ("name", "description", "topics", "languages", "is_visible")
+
+INSERT_ROWS = text(
+    "INSERT INTO portfolio_search "
+    "(rowid, user_id, project_id, name, description, readme, tags, profile) "
+    "VALUES (:rowid, :user_id, :project_id, :name, :description, :readme, :tags, :profile)"
+)
+DELETE_ROWS = text("DELETE FROM portfolio_search WHERE rowid IN :rowids").bindparams(
+    bindparam("rowids", expanding=True)
+)
+
+
+class PortfolioSearch:
+    """Full-text discovery search across public portfolios (SQLite FTS5).
+
+    The index is maintained from the same post-commit hook that refreshes
+    portfolio snapshots, so API writes, webhooks and GitHub syncs all keep
+    it current. Writers flag what changed with mark_stale(): single
+    projects and profiles are replaced by rowid, and only a user's
+    visibility change or deletion rewrites all of their rows. Results are
+    ranked per portfolio by its best matching row.
+    """
+
+    @staticmethod
+    def mark_stale(
+        db: Session,
+        user_ids: Iterable[int] = (),
+        project_ids: Iterable[int] = (),
+        profile_user_ids: Iterable[int] = (),
+    ) -> None:
+        """Reindex, when `db` next commits, all rows of `user_ids`, the rows of
+        `project_ids` and the profile rows of `profile_user_ids`"""
+        stale = db.info.setdefault(STALE_KEY, {"users": set(), "projects": set(), "profiles": set()})
+        stale["users"].update(user_ids)
+        stale["projects"].update(project_ids)
+        stale["profiles"].update(profile_user_ids)
+
+    def refresh(self, db: Session, stale: Dict[str, Set[int]]) -> None:
+        """Reindex the rows flagged with mark_stale(); the caller commits"""
+        self.reindex(db, stale["users"])
+        self._reindex_projects(db, stale["projects"], skip_user_ids=stale["users"])
+        self._reindex_profiles(db, stale["profiles"] - stale["users"])
+
+    def reindex(self, db: Session, user_ids: Iterable[int]) -> None:
+        """Replace every search row of these users; the caller commits"""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        # project_id and user_id are unindexed, so this scans the table; it
+        # only runs for visibility changes, deleted users and backfills
+        db.execute(
+            text("DELETE FROM portfolio_search WHERE user_id IN :user_ids").bindparams(
+                bindparam("user_ids", expanding=True)
+            ),
+            {"user_ids": user_ids},
+        )
+        public_ids = self._public(db, user_ids)
+        if not public_ids:
+            return
+
+        projects = db.query(
+            Project.id, Project.user_id, Project.name, Project.description,
+            Project.topics, Project.languages,
+        ).filter(Project.user_id.in_(public_ids), Project.is_visible == True).all()
+        self._insert(db, self._project_rows(db, projects) + self._profile_rows(db, public_ids))
+
+    def _reindex_projects(self, db: Session, project_ids: Set[int], skip_user_ids: Set[int]) -> None:
+        """Replace the rows of these projects, dropping hidden or deleted ones"""
+        if not project_ids:
+            return
+        db.execute(DELETE_ROWS, {"rowids": list(project_ids)})
+        projects = db.query(
+            Project.id, Project.user_id, Project.name, Project.description,
+            Project.topics, Project.languages,
+        ).join(User, User.id == Project.user_id).filter(
+            Project.id.in_(project_ids),
+            Project.is_visible == True,
+            User.is_public == True,
+            Project.user_id.notin_(skip_user_ids),
+        ).all()
+        self._insert(db, self._project_rows(db, projects))
+
+    def _reindex_profiles(self, db: Session, user_ids: Set[int]) -> None:
+        """Replace the profile rows of these users"""
+        if not user_ids:
+            return
+        db.execute(DELETE_ROWS, {"rowids": [-user_id for user_id in user_ids]})
+        self._insert(db, self._profile_rows(db, self._public(db, user_ids)))
+
+    @staticmethod
+    def _public(db: Session, user_ids: Iterable[int]) -> List[int]:
+        return [
+            user_id for user_id, in db.query(User.id).filter(
+                User.id.in_(list(user_ids)), User.is_public == True
+            )
+        ]
+
+    @staticmethod
+    def _project_rows(db: Session, projects: list) -> List[Dict[str, Any]]:
+        readmes = load_readmes(db, [p.id for p in projects])
+        return [
+            {
+                "rowid": p.id,
+                "user_id": p.user_id,
+                "project_id": p.id,
+                "name": p.name,
+                "description": p.description or "",
+                "readme": readmes.get(p.id) or "",
+                "tags": " ".join([*(p.topics or []), *(p.languages or {})]),
+                "profile": "",
+            }
+            for p in projects
+        ]
+
+    @staticmethod
+    def _profile_rows(db: Session, user_ids: List[int]) -> List[Dict[str, Any]]:
+        if not user_ids:
+            return []
+        profiles: Dict[int, List[str]] = {user_id: [] for user_id in user_ids}
+        for user_id, name in db.query(Skill.user_id, Skill.name).filter(Skill.user_id.in_(user_ids)):
+            profiles[user_id].append(name)
+        for user_id, title in db.query(Experience.user_id, Experience.title).filter(
+            Experience.user_id.in_(user_ids)
+        ):
+            profiles[user_id].append(title)
+        return [
+            {
+                "rowid": -user_id,
+                "user_id": user_id,
+                "project_id": None,
+                "name": "",
+                "description": "",
+                "readme": "",
+                "tags": "",
+                "profile": "\n".join(entries),
+            }
+            for user_id, entries in profiles.items() if entries
+        ]
+
+    @staticmethod
+    def _insert(db: Session, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            db.execute(INSERT_ROWS, rows)
+
+    @staticmethod
+    def to_match_query(query: str) -> str:
+        """FTS5 MATCH expression requiring every word of a free-text query"""
+        return " ".join(f'"{term}"' for term in SEARCH_TERM.findall(query))
+
+    @staticmethod
+    def _highlight(snippet: str) -> str:
+        return html.escape(snippet).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+
+    def search(self, db: Session, query: str, page: int = 0, page_size: int = 20) -> Dict[str, Any]:
+        """Public portfolios matching `query`, best first, with highlighted matches"""
+        match = self.to_match_query(query)
+        if not match:
+            return {"results": [], "total": 0}
+
+        # bm25() cannot be used inside a flattened subquery, so hits are materialized
+        hits = (
+            f"WITH hits AS MATERIALIZED (SELECT user_id, {RANK} AS rank FROM portfolio_search "
+            "WHERE portfolio_search MATCH :match) "
+        )
+        total = db.execute(
+            text(f"{hits} SELECT COUNT(DISTINCT user_id) FROM hits"), {"match": match}
+        ).scalar()
+        ranked = db.execute(text(
+            f"{hits} SELECT user_id, MIN(rank) AS best FROM hits "
+            "GROUP BY user_id ORDER BY best, user_id LIMIT :limit OFFSET :offset"
+        ), {"match": match, "limit": page_size, "offset": page * page_size}).all()
+        if not ranked:
+            return {"results": [], "total": total}
+
+        user_ids = [row.user_id for row in ranked]
+        users = {
+            user.id: user for user in db.query(
+                User.id, User.portfolio_username, User.github_username, User.avatar_url, User.bio
+            ).filter(User.id.in_(user_ids))
+        }
+
+        matches: Dict[int, List[Dict[str, Any]]] = {user_id: [] for user_id in user_ids}
+        rows = db.execute(text(
+            f"SELECT user_id, project_id, name, "
+            f"snippet(portfolio_search, -1, '{MARK_START}', '{MARK_END}', '…', 12) AS snippet "
+            f"FROM portfolio_search WHERE portfolio_search MATCH :match "
+            f"AND user_id IN :user_ids ORDER BY {RANK}"
+        ).bindparams(bindparam("user_ids", expanding=True)), {"match": match, "user_ids": user_ids})
+        for row in rows:
+            if len(matches[row.user_id]) < MATCHES_PER_PORTFOLIO:
+                matches[row.user_id].append({
+                    "project_id": row.project_id,
+                    "name": row.name or None,
+                    "snippet": self._highlight(row.snippet),
+                })
+
+        return {
+            "results": [
+                {
+                    "portfolio_username": users[row.user_id].portfolio_username,
+                    "github_username": users[row.user_id].github_username,
+                    "avatar_url": users[row.user_id].avatar_url,
+                    "bio": users[row.user_id].bio,
+                    "score": round(-row.best, 4),
+                    "matches": matches[row.user_id],
+                }
+                for row in ranked
+            ],
+            "total": total,
+        }
+
+
+# Global instance
+portfolio_search = PortfolioSearch()
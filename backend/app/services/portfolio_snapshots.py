@@ -0,0 +1,323 @@
+import orjson
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional, Dict, Iterable, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.models.user import User
+from app.models.project import Project
+from app.models.experience import Experience
+from app.models.education import Education
+from app.models.skill import Skill
+from app.models.media import Media
+from app.models.portfolio_snapshot import PortfolioSnapshot
+from app.services.public_cache import public_cache
+from app.services.portfolio_search import (
+    portfolio_search, STALE_KEY as SEARCH_STALE_KEY, PROJECT_SEARCH_ATTRIBUTES,
+)
+from app.services.tech_stack import tech_stack, STALE_KEY as TECH_STACK_STALE_KEY
+
+
+# Models whose rows appear in a user's public portfolio
+PORTFOLIO_MODELS = (Project, Experience, Education, Skill, Media)
+
+STALE_KEY = "stale_portfolio_user_ids"
+
+# Portfolio sections, in document order
+SECTIONS = ("user", "projects", "experiences", "education", "skills", "tech_stack", "media")
+
+# Columns published for each section, in output order
+USER_COLUMNS = (
+    User.portfolio_username, User.github_username, User.bio, User.location,
+    User.avatar_url, User.profile_url, User.created_at,
+)
+PROJECT_COLUMNS = {
+    column.key: column for column in (
+        Project.id, Project.name, Project.description, Project.url, Project.deployed_url,
+        Project.readme_excerpt, Project.status, Project.languages, Project.stars, Project.forks,
+    )
+}
+EXPERIENCE_COLUMNS = (
+    Experience.id, Experience.title, Experience.company, Experience.location,
+    Experience.description, Experience.start_date, Experience.end_date, Experience.is_current,
+)
+EDUCATION_COLUMNS = (
+    Education.id, Education.school, Education.degree, Education.field_of_study,
+    Education.description, Education.start_date, Education.end_date, Education.is_current,
+)
+SKILL_COLUMNS = (Skill.id, Skill.name, Skill.proficiency, Skill.category)
+MEDIA_COLUMNS = (
+    Media.id, Media.filename, Media.file_path, Media.media_type,
+    Media.mime_type, Media.title, Media.description, Media.order,
+)
+
+# Project attributes feeding the per-user tech stack aggregates
+TECH_STACK_ATTRIBUTES = ("languages", "is_visible")
+
+# Attributes of profile rows feeding the search index's per-user profile row
+PROFILE_SEARCH_ATTRIBUTES = {Skill: "name", Experience: "title"}
+
+# Project fields that can be requested; "media" is the per-project media list
+PROJECT_FIELDS = (*PROJECT_COLUMNS, "media")
+
+# Server-side project orderings for limited project lists
+PROJECT_SORTS = {
+    "stars": (Project.stars.desc(), Project.id),
+    "recent": (Project.github_pushed_at.is_(None), Project.github_pushed_at.desc(), Project.id),
+}
+
+
+def _dated(row) -> dict:
+    """Row dict with dates as ISO strings and is_current as a bool"""
+    item = row._asdict()
+    for key in ("start_date", "end_date", "created_at"):
+        if key in item:
+            item[key] = item[key].isoformat() if item[key] else None
+    if "is_current" in item:
+        item["is_current"] = bool(item["is_current"])
+    return item
+
+
+def build_portfolio(
+    db: Session,
+    user_id: Optional[int] = None,
+    portfolio_username: Optional[str] = None,
+    sections: Iterable[str] = SECTIONS,
+    project_fields: Iterable[str] = PROJECT_FIELDS,
+    limit_projects: Optional[int] = None,
+    sort: Optional[str] = None,
+) -> Optional[Tuple[int, dict]]:
+    """(user_id, public portfolio document or the requested part of it), or None if not public.
+
+    Only the requested sections are queried and only the requested project
+    columns are loaded, so the query count is fixed (at most seven) and does
+    not grow with portfolio size.
+    """
+    sections = set(sections)
+    project_fields = set(project_fields)
+    
+    user_query = db.query(User.id, *(USER_COLUMNS if "user" in sections else ())).filter(
+        User.is_public == True
+    )
+    if user_id is not None:
+        user_query = user_query.filter(User.id == user_id)
+    else:
+        user_query = user_query.filter(User.portfolio_username == portfolio_username)
+    user = user_query.first()
+    
+    if not user:
+        return None
+    
+    projects = []
+    if "projects" in sections:
+        # Get visible projects only; id is always loaded to attach media
+        columns = [PROJECT_COLUMNS["id"]] + [
+            column for key, column in PROJECT_COLUMNS.items() if key in project_fields and key != "id"
+        ]
+        query = db.query(*columns).filter(
+            Project.user_id == user.id,
+            Project.is_visible == True
+        )
+        if sort:
+            query = query.order_by(*PROJECT_SORTS[sort])
+        if limit_projects:
+            query = query.limit(limit_projects)
+        projects = query.all()
+    
+    # One media query covers both portfolio-level and per-project media
+    media = []
+    project_media = defaultdict(list)
+    want_project_media = "media" in project_fields and projects
+    if "media" in sections or want_project_media:
+        query = db.query(Media.project_id, *MEDIA_COLUMNS).filter(Media.user_id == user.id)
+        if "media" not in sections:
+            query = query.filter(Media.project_id.in_([p.id for p in projects]))
+        elif not want_project_media:
+            query = query.filter(Media.project_id == None)
+        for row in query:
+            item = row._asdict()
+            project_id = item.pop("project_id")
+            if project_id is None:
+                media.append(item)
+            else:
+                project_media[project_id].append(item)
+    
+    document = {}
+    if "user" in sections:
+        document["user"] = _dated(user)
+        del document["user"]["id"]
+    if "projects" in sections:
+        document["projects"] = []
+        for p in projects:
+            item = p._asdict()
+            if "id" not in project_fields:
+                del item["id"]
+            if "media" in project_fields:
+                item["media"] = project_media[p.id]
+            document["projects"].append(item)
+    if "experiences" in sections:
+        document["experiences"] = [
+            _dated(e) for e in db.query(*EXPERIENCE_COLUMNS).filter(Experience.user_id == user.id)
+        ]
+    if "education" in sections:
+        document["education"] = [
+            _dated(ed) for ed in db.query(*EDUCATION_COLUMNS).filter(Education.user_id == user.id)
+        ]
+    if "skills" in sections:
+        document["skills"] = [
+            s._asdict() for s in db.query(*SKILL_COLUMNS).filter(Skill.user_id == user.id)
+        ]
+    if "tech_stack" in sections:
+        document["tech_stack"] = tech_stack.get(db, user.id)
+    if "media" in sections:
+        document["media"] = media
+    return user.id, document
+
+
+class PortfolioSnapshotStore:
+    """Materialized public portfolios, one serialized document per user.
+
+    Writes are tracked per session: ORM changes to a user's portfolio rows
+    are picked up on flush, bulk/Core writes call mark_stale(), and the
+    affected snapshots are rebuilt right after the session commits (tech
+    stack aggregates first, for users whose project languages changed).
+    Search rows are refreshed in the same pass, only for the projects and
+    profiles whose searchable fields changed.
+    Reads are a single indexed lookup of prebuilt bytes.
+    """
+
+    @staticmethod
+    def mark_stale(db: Session, user_ids: Iterable[int]) -> None:
+        """Rebuild these users' snapshots when `db` next commits"""
+        db.info.setdefault(STALE_KEY, set()).update(user_ids)
+
+    def _after_flush(self, db: Session, flush_context) -> None:
+        user_ids = set()
+        tech_stack_user_ids = set()
+        search_user_ids = set()
+        search_project_ids = set()
+        search_profile_user_ids = set()
+        for obj in (*db.new, *db.dirty, *db.deleted):
+            added_or_deleted = obj in db.new or obj in db.deleted
+            if isinstance(obj, User):
+                user_ids.add(obj.id)
+                if obj in db.deleted or (
+                    obj in db.dirty and inspect(obj).attrs.is_public.history.has_changes()
+                ):
+                    search_user_ids.add(obj.id)
+            elif isinstance(obj, PORTFOLIO_MODELS):
+                user_ids.add(obj.user_id)
+                if isinstance(obj, Project):
+                    if added_or_deleted or any(
+                        inspect(obj).attrs[key].history.has_changes() for key in TECH_STACK_ATTRIBUTES
+                    ):
+                        tech_stack_user_ids.add(obj.user_id)
+                    if added_or_deleted or any(
+                        inspect(obj).attrs[key].history.has_changes() for key in PROJECT_SEARCH_ATTRIBUTES
+                    ):
+                        search_project_ids.add(obj.id)
+                elif type(obj) in PROFILE_SEARCH_ATTRIBUTES and (
+                    added_or_deleted
+                    or inspect(obj).attrs[PROFILE_SEARCH_ATTRIBUTES[type(obj)]].history.has_changes()
+                ):
+                    search_profile_user_ids.add(obj.user_id)
+        user_ids.discard(None)
+        tech_stack_user_ids.discard(None)
+        search_profile_user_ids.discard(None)
+        if user_ids:
+            self.mark_stale(db, user_ids)
+        if tech_stack_user_ids:
+            tech_stack.mark_stale(db, tech_stack_user_ids)
+        if search_user_ids or search_project_ids or search_profile_user_ids:
+            portfolio_search.mark_stale(db, search_user_ids, search_project_ids, search_profile_user_ids)
+
+    def _after_commit(self, db: Session) -> None:
+        tech_stack_user_ids = db.info.pop(TECH_STACK_STALE_KEY, set())
+        user_ids = db.info.pop(STALE_KEY, set()) | tech_stack_user_ids
+        stale_search = db.info.pop(SEARCH_STALE_KEY, None)
+        if user_ids or stale_search:
+            public_cache.bump(user_ids)
+            # The committed session cannot emit SQL here; rebuild in a fresh one
+            self.rebuild(user_ids, tech_stack_user_ids, stale_search)
+
+    def _after_rollback(self, db: Session, previous_transaction) -> None:
+        db.info.pop(STALE_KEY, None)
+        db.info.pop(TECH_STACK_STALE_KEY, None)
+        db.info.pop(SEARCH_STALE_KEY, None)
+
+    def register(self, session_factory) -> None:
+        """Track portfolio writes on every session made by `session_factory`"""
+        event.listen(session_factory, "after_flush", self._after_flush)
+        event.listen(session_factory, "after_commit", self._after_commit)
+        event.listen(session_factory, "after_soft_rollback", self._after_rollback)
+
+    def rebuild(
+        self,
+        user_ids: Set[int],
+        tech_stack_user_ids: Iterable[int] = (),
+        stale_search: Optional[Dict[str, Set[int]]] = None,
+    ) -> None:
+        """Regenerate snapshots and the flagged search rows; users who are gone or private lose theirs"""
+        db = SessionLocal()
+        try:
+            tech_stack.refresh(db, tech_stack_user_ids)
+            for user_id in user_ids:
+                self._store(db, user_id)
+            if stale_search:
+                portfolio_search.refresh(db, stale_search)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Error rebuilding portfolio snapshots: {e}")
+        finally:
+            db.close()
+
+    def _store(self, db: Session, user_id: int) -> Optional[bytes]:
+        built = build_portfolio(db, user_id)
+        if built is None:
+            db.query(PortfolioSnapshot).filter(
+                PortfolioSnapshot.user_id == user_id
+            ).delete(synchronize_session=False)
+            return None
+        
+        _, document = built
+        content = orjson.dumps(document)
+        stmt = sqlite_insert(PortfolioSnapshot).values(
+            user_id=user_id,
+            portfolio_username=document["user"]["portfolio_username"],
+            content=content,
+            built_at=datetime.utcnow(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PortfolioSnapshot.user_id],
+            set_={column: stmt.excluded[column] for column in ("portfolio_username", "content", "built_at")},
+        )
+        db.execute(stmt)
+        return content
+
+    def get(self, db: Session, portfolio_username: str) -> Optional[Tuple[int, bytes]]:
+        """(user_id, serialized public portfolio), built on first read if missing"""
+        snapshot = db.query(PortfolioSnapshot.user_id, PortfolioSnapshot.content).filter(
+            PortfolioSnapshot.portfolio_username == portfolio_username
+        ).first()
+        if snapshot is not None:
+            return snapshot.user_id, snapshot.content
+        
+        user_id = db.query(User.id).filter(
+            User.portfolio_username == portfolio_username,
+            User.is_public == True
+        ).scalar()
+        if user_id is None:
+            return None
+        content = self._store(db, user_id)
+        db.commit()
+        return user_id, content
+
+
+# Global instance, tracking writes made through the app's sessions
+portfolio_snapshots = PortfolioSnapshotStore()
+portfolio_snapshots.register(SessionLocal)
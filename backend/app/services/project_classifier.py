@@ -0,0 +1,155 @@
+import re
+from typing import Optional, List, Dict, Any, Tuple, Iterable
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.services.readme_store import load_readmes
+from app.services.portfolio_snapshots import portfolio_snapshots
+
+
+# Project statuses, in tie-break order
+STATUSES = ("deployed", "in_progress", "library", "stale", "archived", "code_only")
+
+# Keyword tables, compiled once into a single scanner. Group names are the
+# status a hit votes for; weights say how strong a hit is.
+KEYWORD_TABLES = {
+    "in_progress": [
+        r"wip", r"work in progress", r"in progress", r"todo", r"experimental",
+        r"under construction", r"coming soon", r"roadmap", r"alpha", r"prototype",
+    ],
+    "library": [
+        r"library", r"package", r"sdk", r"framework", r"plugin", r"cli tool",
+        r"pip install", r"npm install", r"yarn add", r"cargo add", r"go get",
+        r"pypi", r"npm", r"crates\.io",
+    ],
+    "deployed": [
+        r"live demo", r"live site", r"demo", r"website", r"deployed", r"try it",
+    ],
+}
+
+KEYWORD_WEIGHTS = {"in_progress": 0.35, "library": 0.3, "deployed": 0.2}
+
+KEYWORD_SCANNER = re.compile(
+    "|".join(
+        rf"(?P<{status}>\b(?:{'|'.join(words)})\b)"
+        for status, words in KEYWORD_TABLES.items()
+    ),
+    re.IGNORECASE,
+)
+
+README_HEADING = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$", re.MULTILINE)
+
+STALE_AFTER = timedelta(days=730)
+
+WEB_LANGUAGES = {"HTML", "CSS", "JavaScript", "TypeScript", "Vue", "Svelte", "Astro"}
+
+
+class ProjectClassifier:
+    """Batch project status classifier.
+
+    Takes project rows (the dicts built by sync, or stored Project columns)
+    and classifies them all in one pass, using description, topics, README
+    headings, homepage / detected demo URL, language mix and push activity.
+    Returns a status from STATUSES with a 0..1 confidence for each row.
+    """
+
+    @staticmethod
+    def _signal_text(row: Dict[str, Any]) -> str:
+        """Text scanned for keywords: description, topics and README headings"""
+        parts = [row.get("description") or ""]
+        parts.extend(topic.replace("-", " ") for topic in row.get("topics") or [])
+        readme = row.get("readme_content")
+        if readme:
+            parts.extend(README_HEADING.findall(readme))
+        return "\n".join(parts)
+
+    def classify(self, row: Dict[str, Any], now: datetime) -> Tuple[str, float]:
+        if row.get("is_archived"):
+            return "archived", 1.0
+
+        scores = dict.fromkeys(STATUSES, 0.0)
+
+        if row.get("deployed_url"):
+            scores["deployed"] += 0.9
+        elif row.get("homepage"):
+            scores["deployed"] += 0.7
+
+        has_url = scores["deployed"] > 0
+
+        hits = {}
+        for match in KEYWORD_SCANNER.finditer(self._signal_text(row)):
+            hits[match.lastgroup] = hits.get(match.lastgroup, 0) + 1
+        for status, count in hits.items():
+            # Demo wording only supports a deployment that has a URL
+            if status == "deployed" and not has_url:
+                continue
+            # Diminishing returns for repeated keywords
+            scores[status] += KEYWORD_WEIGHTS[status] * min(count, 3)
+
+        # A web-first codebase with a homepage is very likely the live site
+        languages = row.get("languages") or {}
+        if has_url and languages and max(languages, key=languages.get) in WEB_LANGUAGES:
+            scores["deployed"] += 0.1
+
+        pushed_at = row.get("github_pushed_at")
+        if pushed_at and now - pushed_at > STALE_AFTER:
+            scores["stale"] += 0.6
+            scores["in_progress"] *= 0.5
+
+        status = max(STATUSES, key=lambda name: scores[name])
+        if scores[status] <= 0:
+            return "code_only", 0.5
+        return status, round(min(scores[status], 1.0), 2)
+
+    def classify_batch(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        now: Optional[datetime] = None,
+    ) -> List[Tuple[str, float]]:
+        """Classify many project rows; results are in input order"""
+        now = now or datetime.utcnow()
+        return [self.classify(row, now) for row in rows]
+
+    def apply(self, rows: List[Dict[str, Any]]) -> None:
+        """Set status / status_confidence on project rows in place"""
+        for row, (status, confidence) in zip(rows, self.classify_batch(rows)):
+            row["status"] = status
+            row["status_confidence"] = confidence
+
+    def reclassify_stored(self, db: Session, user_id: Optional[int] = None, chunk_size: int = 500) -> int:
+        """Re-classify stored projects from their saved columns, without calling GitHub"""
+        columns = (
+            Project.id, Project.user_id, Project.description, Project.topics,
+            Project.homepage, Project.deployed_url, Project.languages,
+            Project.github_pushed_at, Project.is_archived,
+        )
+        query = db.query(*columns).order_by(Project.id)
+        if user_id is not None:
+            query = query.filter(Project.user_id == user_id)
+
+        updated = 0
+        last_id = 0
+        while True:
+            chunk = [row._asdict() for row in query.filter(Project.id > last_id).limit(chunk_size)]
+            if not chunk:
+                break
+            readmes = load_readmes(db, [row["id"] for row in chunk])
+            for row in chunk:
+                row["readme_content"] = readmes.get(row["id"])
+            self.apply(chunk)
+            db.bulk_update_mappings(Project, [
+                {"id": row["id"], "status": row["status"], "status_confidence": row["status_confidence"]}
+                for row in chunk
+            ])
+            portfolio_snapshots.mark_stale(db, {row["user_id"] for row in chunk})
+            db.commit()
+            updated += len(chunk)
+            last_id = chunk[-1]["id"]
+
+        return updated
+
+
+# Global instance
+project_classifier = ProjectClassifier()
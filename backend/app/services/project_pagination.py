@@ -0,0 +1,103 @@
+import base64
+import binascii
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Any, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+from app.core.config import settings
+from app.models.project import Project
+from app.services.public_cache import public_cache
+
+
+# Stable sort keys for project lists; every order ends on the primary key
+# and is backed by a (user_id, key, id) index on projects
+PROJECT_LIST_SORTS = {
+    "id": Project.id,
+    "stars": Project.stars,
+    "updated_at": Project.updated_at,
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort: str, row: Any) -> str:
+    """Opaque cursor pointing just past `row` in the given order"""
+    value = getattr(row, sort)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort, value, row.id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """(sort value, id) from a cursor; raises InvalidCursor if it is malformed or for another sort"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, last_id = json.loads(payload)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursor("Malformed cursor")
+    if cursor_sort != sort:
+        raise InvalidCursor("Cursor was issued for a different sort")
+    if sort == "updated_at" and value is not None:
+        value = datetime.fromisoformat(value)
+    return value, last_id
+
+
+def apply_keyset(query: Query, sort: str, cursor: Optional[str]) -> Query:
+    """Order by the sort key and resume after `cursor`.
+
+    `id` ascends (insertion order, as before); stars and updated_at descend.
+    """
+    if sort == "id":
+        query = query.order_by(Project.id)
+        if cursor:
+            _, last_id = decode_cursor(cursor, sort)
+            query = query.filter(Project.id > last_id)
+        return query
+
+    column = PROJECT_LIST_SORTS[sort]
+    query = query.order_by(column.desc(), Project.id.desc())
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort)
+        query = query.filter(tuple_(column, Project.id) < tuple_(value, last_id))
+    return query
+
+
+class ProjectTotalCache:
+    """Per-user project list totals, valid until the user's data changes.
+
+    Uses the public cache's per-user version counter, which every commit
+    touching the user's projects bumps. Like the public cache, the TTL
+    bounds staleness across worker processes, which do not share counters.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._totals: "OrderedDict[Tuple[int, Optional[str]], Tuple[int, int, float]]" = OrderedDict()
+
+    def get(self, query: Query, user_id: int, status_filter: Optional[str]) -> int:
+        key = (user_id, status_filter)
+        version = public_cache.version(user_id)
+        cached = self._totals.get(key)
+        if cached is not None and cached[0] == version and cached[2] > time.monotonic():
+            self._totals.move_to_end(key)
+            return cached[1]
+
+        total = query.order_by(None).count()
+        self._totals[key] = (version, total, time.monotonic() + self.ttl)
+        self._totals.move_to_end(key)
+        while len(self._totals) > self.max_entries:
+            self._totals.popitem(last=False)
+        return total
+
+
+# Global instance
+project_totals = ProjectTotalCache(ttl=settings.PUBLIC_CACHE_TTL)
@@ -0,0 +1,275 @@
+import asyncio
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import datetime
+from typing import Optional, Callable
+
+from app.core.config import settings
+from app.models.user import User
+from app.models.project import Project
+from app.services.github_cache import github_cache
+from app.services.github_service import github_service
+from app.services.github_graphql import github_graphql_service
+from app.services.project_classifier import project_classifier
+from app.services.readme_store import load_readmes, save_readmes
+from app.services.portfolio_snapshots import portfolio_snapshots
+from app.services.portfolio_search import portfolio_search
+from app.services.tech_stack import tech_stack
+
+
+def get_sync_engine():
+    """GitHub fetch engine selected by GITHUB_SYNC_ENGINE"""
+    if settings.GITHUB_SYNC_ENGINE == "graphql":
+        return github_graphql_service
+    return github_service
+
+
+# Synced columns copied into a project's search row
+SEARCHED_PROJECT_COLUMNS = ("name", "description", "topics", "languages")
+
+# Columns rewritten by sync; user-controlled columns (is_visible) are left alone
+SYNCED_PROJECT_COLUMNS = (
+    "name", "description", "url", "homepage", "languages", "topics",
+    "stars", "forks", "watchers", "is_deployed", "deployed_url", "status", "status_confidence",
+    "is_archived", "is_fork", "github_updated_at", "github_pushed_at", "updated_at",
+)
+
+
+def repo_to_project_row(
+    user: User,
+    repo: dict,
+    languages: Optional[dict],
+    readme: Optional[str],
+) -> dict:
+    """Build the projects row values for a GitHub repo listing entry.
+
+    `readme_content` is stored separately (compressed) by upsert_project_rows(),
+    which also fills in `status` / `status_confidence`.
+    """
+    # Detect demo URL
+    deployed_url = github_service.detect_demo_url(
+        repo.get("homepage"),
+        readme
+    )
+    
+    return {
+        "user_id": user.id,
+        "github_id": repo["id"],
+        "name": repo["name"],
+        "description": repo.get("description"),
+        "url": repo["html_url"],
+        "homepage": repo.get("homepage"),
+        "readme_content": readme,
+        "languages": languages,
+        "topics": repo.get("topics") or [],
+        "stars": repo.get("stargazers_count", 0),
+        "forks": repo.get("forks_count", 0),
+        "watchers": repo.get("watchers_count", 0),
+        "is_deployed": deployed_url is not None,
+        "deployed_url": deployed_url,
+        "is_archived": repo.get("archived", False),
+        "is_fork": repo.get("fork", False),
+        "github_updated_at": github_service.parse_timestamp(repo.get("updated_at")),
+        "github_pushed_at": github_service.parse_timestamp(repo.get("pushed_at")),
+        "updated_at": datetime.utcnow(),
+    }
+
+
+def upsert_project_rows(db: Session, rows: list, store_readmes: bool = True) -> None:
+    """Classify, then insert or update synced project rows in one statement per chunk.
+
+    Relies on the unique (user_id, github_id) index; the caller commits.
+    README bodies go to project_readmes unless `store_readmes` is False
+    (rows built from an already stored README).
+    """
+    if not rows:
+        return
+    
+    # Classify the whole batch in one pass before writing
+    project_classifier.apply(rows)
+    
+    # Owners of new repos or repos whose languages changed need their tech stack refreshed
+    stored = {
+        (row.user_id, row.github_id): row
+        for row in db.query(
+            Project.user_id, Project.github_id, *(getattr(Project, key) for key in SEARCHED_PROJECT_COLUMNS)
+        ).filter(Project.github_id.in_({row["github_id"] for row in rows}))
+    }
+    tech_stack.mark_stale(db, {
+        row["user_id"] for row in rows
+        if (row["user_id"], row["github_id"]) not in stored
+        or stored[(row["user_id"], row["github_id"])].languages != row["languages"]
+    })
+    # New repos and repos whose searchable fields changed need their search row rebuilt
+    search_stale = [
+        (row["user_id"], row["github_id"]) for row in rows
+        if (row["user_id"], row["github_id"]) not in stored or any(
+            getattr(stored[(row["user_id"], row["github_id"])], key) != row[key]
+            for key in SEARCHED_PROJECT_COLUMNS
+        )
+    ]
+    
+    stmt = sqlite_insert(Project)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Project.user_id, Project.github_id],
+        set_={column: stmt.excluded[column] for column in SYNCED_PROJECT_COLUMNS},
+    )
+    values = [
+        {key: value for key, value in row.items() if key != "readme_content"}
+        for row in rows
+    ]
+    
+    # Stay well below SQLite's bound-parameter limit
+    chunk_size = 500
+    for i in range(0, len(values), chunk_size):
+        db.execute(stmt, values[i:i + chunk_size])
+    
+    # Core upserts bypass the ORM, so flag the owners' snapshots explicitly
+    portfolio_snapshots.mark_stale(db, {row["user_id"] for row in rows})
+    
+    if not (store_readmes or search_stale):
+        return
+    project_ids = {
+        (user_id, github_id): project_id
+        for project_id, user_id, github_id in db.query(
+            Project.id, Project.user_id, Project.github_id
+        ).filter(Project.github_id.in_({row["github_id"] for row in rows}))
+    }
+    stale_project_ids = [project_ids[key] for key in search_stale]
+    if store_readmes:
+        stale_project_ids += save_readmes(db, {
+            project_ids[(row["user_id"], row["github_id"])]: row["readme_content"]
+            for row in rows
+        })
+    portfolio_search.mark_stale(db, project_ids=stale_project_ids)
+
+
+async def sync_user_projects(
+    user: User,
+    db: Session,
+    full: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None,
+):
+    """Sync projects from GitHub for a user
+
+    Incremental by default: repos whose `pushed_at` matches the stored
+    watermark are not re-enriched, and repos whose `updated_at` also matches
+    are not rewritten at all. Pass full=True to refetch everything.
+    Repos whose languages or README could not be fetched keep their stored
+    data and watermark, so they are retried on the next sync.
+    `progress(done, total)` is called as changed repos are processed.
+    Raises GitHubRateLimitError if the token's budget runs out mid-sync.
+    """
+    if not user.access_token:
+        raise ValueError("No GitHub access token available")
+    
+    engine = get_sync_engine()
+    
+    # Sync watermarks for every stored project, keyed by GitHub repo id
+    watermarks = {
+        github_id: (pushed_at, updated_at)
+        for github_id, pushed_at, updated_at in db.query(
+            Project.github_id, Project.github_pushed_at, Project.github_updated_at
+        ).filter(Project.user_id == user.id)
+    }
+    
+    total = 0
+    done = 0
+    
+    def report():
+        if progress:
+            progress(done, total)
+    
+    def repo_done():
+        nonlocal done
+        done += 1
+        report()
+    
+    def write_page(to_enrich, to_refresh, enrichments) -> list:
+        rows = []
+        failed = set()
+        for repo, enrichment in zip(to_enrich, enrichments):
+            if enrichment is not None:
+                rows.append(repo_to_project_row(user, repo, *enrichment))
+            elif repo["id"] in watermarks:
+                failed.add(repo["id"])
+            # A new repo that failed is left out; it is still new on the next sync
+        
+        upsert_project_rows(db, rows)
+        
+        # Metadata-only changes keep the stored languages and README. So do
+        # stored repos whose enrichment failed, but they also keep their old
+        # pushed_at watermark, so the next sync enriches them again.
+        to_refresh = to_refresh + [repo for repo in to_enrich if repo["id"] in failed]
+        if to_refresh:
+            stored = db.query(Project.id, Project.github_id, Project.languages).filter(
+                Project.user_id == user.id,
+                Project.github_id.in_([repo["id"] for repo in to_refresh])
+            ).all()
+            readmes = load_readmes(db, [project_id for project_id, _, _ in stored])
+            stored = {
+                github_id: (languages, readmes.get(project_id))
+                for project_id, github_id, languages in stored
+            }
+            refreshed = []
+            for repo in to_refresh:
+                row = repo_to_project_row(user, repo, *stored[repo["id"]])
+                if repo["id"] in failed:
+                    row["github_pushed_at"] = watermarks[repo["id"]][0]
+                refreshed.append(row)
+            upsert_project_rows(db, refreshed, store_readmes=False)
+            rows.extend(refreshed)
+        
+        return rows
+    
+    # Pages are enriched while the next page is listed, and written together
+    # once every page is enriched. Nothing touches the session between
+    # awaits: SQLite has a single writer, and a write transaction held open
+    # across them would lock out the GitHub cache, job progress and API writes.
+    semaphore = asyncio.Semaphore(settings.GITHUB_SYNC_CONCURRENCY)
+    pending = []
+    
+    try:
+        async for page in engine.iter_user_repos(user.access_token, user.github_username):
+            # New or pushed repos need languages/README; repos with only
+            # metadata changes (stars, description, ...) reuse what is stored
+            to_enrich = []
+            to_refresh = []
+            for repo in page:
+                watermark = watermarks.get(repo["id"])
+                if (
+                    full
+                    or watermark is None
+                    or watermark[0] != github_service.parse_timestamp(repo.get("pushed_at"))
+                ):
+                    to_enrich.append(repo)
+                elif watermark[1] != github_service.parse_timestamp(repo.get("updated_at")):
+                    to_refresh.append(repo)
+            
+            # Refreshed repos need no GitHub calls, so they count as done up front
+            total += len(to_enrich) + len(to_refresh)
+            done += len(to_refresh)
+            report()
+            
+            task = asyncio.create_task(engine.enrich_repos(
+                user.access_token, to_enrich, on_repo_done=repo_done, semaphore=semaphore
+            ))
+            pending.append((to_enrich, to_refresh, task))
+        
+        pages = [(to_enrich, to_refresh, await task) for to_enrich, to_refresh, task in pending]
+    finally:
+        for _, _, task in pending:
+            task.cancel()
+    
+    synced_rows = []
+    for to_enrich, to_refresh, enrichments in pages:
+        synced_rows.extend(write_page(to_enrich, to_refresh, enrichments))
+    
+    # Changed projects and the sync time are committed together
+    user.last_sync = datetime.utcnow()
+    db.commit()
+    
+    # Responses cached during the sync are written once, after the sync's own commit
+    github_cache.flush()
+    
+    return synced_rows
@@ -0,0 +1,99 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Iterable, Tuple
+
+from app.core.config import settings
+
+
+@dataclass
+class PublicCacheEntry:
+    """A cached public response body"""
+    user_id: int
+    version: int
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+class PublicResponseCache:
+    """Bounded in-process LRU + TTL cache for public portfolio / profile responses.
+
+    Entries are keyed by (namespace, username) and remember the owner's
+    version counter when stored; commits touching a user's data bump that
+    counter, so stale entries are dropped on the next lookup. The TTL bounds
+    staleness across worker processes, which do not share counters.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str], PublicCacheEntry]" = OrderedDict()
+        self._versions: Dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_etag(body: bytes) -> str:
+        """Strong ETag for a response body"""
+        return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    def get(self, namespace: str, username: str) -> Optional[PublicCacheEntry]:
+        key = (namespace, username)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic() or entry.version != self._versions.get(entry.user_id, 0):
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, namespace: str, username: str, user_id: int, body: bytes) -> PublicCacheEntry:
+        entry = PublicCacheEntry(
+            user_id=user_id,
+            version=self._versions.get(user_id, 0),
+            body=body,
+            etag=self.make_etag(body),
+            expires_at=time.monotonic() + self.ttl,
+        )
+        self._entries[(namespace, username)] = entry
+        self._entries.move_to_end((namespace, username))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def version(self, user_id: int) -> int:
+        """Current version counter of a user's data"""
+        return self._versions.get(user_id, 0)
+
+    def bump(self, user_ids: Iterable[int]) -> None:
+        """Invalidate every cached response owned by these users"""
+        for user_id in user_ids:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters since process start"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+        }
+
+
+# Global instance
+public_cache = PublicResponseCache(
+    max_entries=settings.PUBLIC_CACHE_MAX_ENTRIES,
+    ttl=settings.PUBLIC_CACHE_TTL,
+)
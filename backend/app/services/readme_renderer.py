@@ -0,0 +1,103 @@
+import hashlib
+import re
+from typing import Optional, List
+
+import nh3
+from markdown_it import MarkdownIt
+from markdown_it.token import Token
+
+
+# Bump when rendering output changes so stored HTML is regenerated on the next sync
+RENDER_VERSION = 2
+
+EXCERPT_LENGTH = 200
+
+SAFE_URL_SCHEMES = {"http", "https", "mailto"}
+
+# Markup kept in rendered READMEs; everything else is stripped by the sanitizer
+ALLOWED_TAGS = {
+    "h1", "h2", "h3", "h4", "h5", "h6", "p", "br", "hr", "blockquote", "pre", "code",
+    "ul", "ol", "li", "a", "img", "strong", "em", "del", "s", "sup", "sub", "kbd",
+    "table", "thead", "tbody", "tr", "th", "td", "details", "summary", "div", "span",
+}
+ALIGNABLE = {"p", "div", "h1", "h2", "h3", "h4", "h5", "h6", "th", "td"}
+ALLOWED_ATTRIBUTES = {
+    "a": {"href", "title"},
+    "img": {"src", "alt", "title", "width", "height", "align"},
+    "code": {"class"},  # language-* from fenced code blocks
+    "ol": {"start"},
+    **{tag: {"align"} for tag in ALIGNABLE},
+}
+
+
+# Inline raw HTML whose content is not readable text
+HIDDEN_OPEN = re.compile(r"<(script|style)\b", re.IGNORECASE)
+HIDDEN_CLOSE = re.compile(r"</(script|style)\s*>", re.IGNORECASE)
+
+
+def readme_hash(text: str) -> str:
+    """Content hash of a README, including the renderer version"""
+    return hashlib.sha256(f"{RENDER_VERSION}:{text}".encode("utf-8")).hexdigest()
+
+
+class ReadmeRenderer:
+    """Renders README markdown to sanitized HTML and a plain-text excerpt.
+
+    Markdown is parsed by markdown-it (CommonMark plus GitHub tables and
+    strikethrough), so inline formatting never reaches into link URLs or
+    code. The HTML then goes through nh3: tags and attributes outside the
+    allow-lists are dropped, URLs keep only http(s), mailto or relative
+    schemes, and links get rel="nofollow noopener".
+    """
+
+    def __init__(self):
+        self._markdown = MarkdownIt("commonmark", {"html": True}).enable(["table", "strikethrough"])
+
+    def render(self, text: str) -> str:
+        """Sanitized HTML for a README"""
+        return nh3.clean(
+            self._markdown.render(text),
+            tags=ALLOWED_TAGS,
+            attributes=ALLOWED_ATTRIBUTES,
+            url_schemes=SAFE_URL_SCHEMES,
+            link_rel="nofollow noopener",
+        )
+
+    @staticmethod
+    def _plain(children: List[Token]) -> str:
+        """Readable text of a paragraph's inline tokens (images and raw HTML dropped)"""
+        parts = []
+        hidden = False
+        for child in children:
+            if child.type == "html_inline":
+                if HIDDEN_OPEN.match(child.content):
+                    hidden = True
+                elif HIDDEN_CLOSE.match(child.content):
+                    hidden = False
+            elif hidden:
+                continue
+            elif child.type in ("text", "code_inline"):
+                parts.append(child.content)
+            elif child.type in ("softbreak", "hardbreak"):
+                parts.append(" ")
+        return "".join(parts)
+
+    def excerpt(self, text: str, length: int = EXCERPT_LENGTH) -> Optional[str]:
+        """Short plain-text summary: the opening paragraphs, cut at a word boundary"""
+        words = []
+        size = 0
+        tokens = self._markdown.parse(text)
+        for opening, inline in zip(tokens, tokens[1:]):
+            # Top-level paragraphs only, not list items or quotes
+            if opening.type != "paragraph_open" or opening.level != 0:
+                continue
+            for word in self._plain(inline.children or []).split():
+                if size + len(word) > length:
+                    return " ".join(words) + "…" if words else None
+                words.append(word)
+                size += len(word) + 1
+        return " ".join(words) or None
+
+
+# Global instance
+readme_renderer = ReadmeRenderer()
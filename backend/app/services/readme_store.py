@@ -0,0 +1,76 @@
+from typing import Optional, Dict, Iterable, List
+from datetime import datetime
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.project_readme import ProjectReadme, compress_readme, decompress_readme
+from app.services.readme_renderer import readme_renderer, readme_hash
+
+
+def load_readmes(db: Session, project_ids: Iterable[int]) -> Dict[int, str]:
+    """Decompressed README text for the given projects, in one query"""
+    project_ids = list(project_ids)
+    if not project_ids:
+        return {}
+    rows = db.query(ProjectReadme.project_id, ProjectReadme.content).filter(
+        ProjectReadme.project_id.in_(project_ids)
+    )
+    return {project_id: decompress_readme(content) for project_id, content in rows}
+
+
+def save_readmes(db: Session, readmes: Dict[int, Optional[str]]) -> List[int]:
+    """Upsert (or delete, for None) README bodies keyed by project id; the caller commits.
+
+    HTML and excerpt are rendered only for READMEs whose content hash changed.
+    Returns the ids of projects whose README was rendered or removed.
+    """
+    removed = [project_id for project_id, text in readmes.items() if text is None]
+    if removed:
+        db.query(ProjectReadme).filter(
+            ProjectReadme.project_id.in_(removed)
+        ).delete(synchronize_session=False)
+        db.query(Project).filter(Project.id.in_(removed)).update(
+            {Project.readme_excerpt: None}, synchronize_session=False
+        )
+
+    hashes = {
+        project_id: readme_hash(text)
+        for project_id, text in readmes.items() if text is not None
+    }
+    if not hashes:
+        return removed
+    stored = dict(db.query(ProjectReadme.project_id, ProjectReadme.content_hash).filter(
+        ProjectReadme.project_id.in_(list(hashes))
+    ))
+    changed = [project_id for project_id, digest in hashes.items() if stored.get(project_id) != digest]
+    if not changed:
+        return removed
+
+    now = datetime.utcnow()
+    values = []
+    excerpts = []
+    for project_id in changed:
+        text = readmes[project_id]
+        values.append({
+            "project_id": project_id,
+            "content": compress_readme(text),
+            "size": len(text.encode("utf-8")),
+            "content_hash": hashes[project_id],
+            "html": compress_readme(readme_renderer.render(text)),
+            "updated_at": now,
+        })
+        excerpts.append({"id": project_id, "readme_excerpt": readme_renderer.excerpt(text)})
+
+    stmt = sqlite_insert(ProjectReadme)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ProjectReadme.project_id],
+        set_={
+            column: stmt.excluded[column]
+            for column in ("content", "size", "content_hash", "html", "updated_at")
+        },
+    )
+    db.execute(stmt, values)
+    db.bulk_update_mappings(Project, excerpts)
+    return removed + changed
@@ -0,0 +1,206 @@
+import asyncio
+import random
+import time
+from typing import Optional, List, Dict, Any
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.project import Project
+from app.models.resync_run import ResyncRun
+from app.models.user import User
+from app.services.github_rate_limiter import github_rate_limiter
+from app.services.sync_jobs import sync_job_queue
+
+
+class ResyncScheduler:
+    """Fleet-wide periodic resync of users' GitHub projects.
+
+    Users are picked by staleness of `User.last_sync`, boosted when they
+    pushed recently, and synced under a global concurrency limit with random
+    start jitter. Each run is checkpointed in resync_runs so an interrupted
+    run resumes where it stopped.
+    """
+
+    # Staleness multiplier for users who pushed within ACTIVE_WINDOW
+    ACTIVE_BOOST = 2.0
+    ACTIVE_WINDOW = timedelta(days=7)
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._next_start = 0.0
+
+    def plan(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Users due for a resync, highest priority first"""
+        limit = limit or settings.RESYNC_BATCH_SIZE
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=settings.RESYNC_MIN_AGE)
+        active_since = now - self.ACTIVE_WINDOW
+
+        db = SessionLocal()
+        try:
+            last_push = db.query(
+                Project.user_id,
+                func.max(Project.github_pushed_at).label("last_push"),
+            ).group_by(Project.user_id).subquery()
+
+            candidates = db.query(
+                User.id, User.github_username, User.last_sync, last_push.c.last_push
+            ).outerjoin(
+                last_push, last_push.c.user_id == User.id
+            ).filter(
+                User.access_token != None,
+                (User.last_sync == None) | (User.last_sync < stale_before),
+            ).all()
+        finally:
+            db.close()
+
+        plan = []
+        for user_id, username, last_sync, pushed in candidates:
+            active = pushed is not None and pushed >= active_since
+            staleness = (now - last_sync).total_seconds() if last_sync else None
+            plan.append({
+                "user_id": user_id,
+                "github_username": username,
+                "last_sync": last_sync.isoformat() if last_sync else None,
+                "active": active,
+                "priority": (
+                    round(staleness * (self.ACTIVE_BOOST if active else 1.0))
+                    if staleness is not None else None
+                ),
+            })
+
+        # Never-synced users first, then by boosted staleness
+        plan.sort(key=lambda entry: (entry["priority"] is None, entry["priority"] or 0), reverse=True)
+        return plan[:limit]
+
+    def _checkpoint(self, limit: Optional[int]) -> ResyncRun:
+        """Resume the unfinished run, or start a new one from a fresh plan"""
+        db = SessionLocal()
+        try:
+            run = db.query(ResyncRun).filter(ResyncRun.status == "running").order_by(
+                ResyncRun.id.desc()
+            ).first()
+            if run is None:
+                run = ResyncRun(
+                    planned_user_ids=[entry["user_id"] for entry in self.plan(limit)],
+                    completed_user_ids=[],
+                )
+                db.add(run)
+                db.commit()
+                db.refresh(run)
+            db.expunge(run)
+            return run
+        finally:
+            db.close()
+
+    def _record(self, run_id: int, user_id: int, outcome: str) -> None:
+        """Checkpoint one finished user and bump the run metrics"""
+        db = SessionLocal()
+        try:
+            run = db.query(ResyncRun).filter(ResyncRun.id == run_id).first()
+            run.completed_user_ids = [*run.completed_user_ids, user_id]
+            if outcome == "completed":
+                run.synced += 1
+            elif outcome == "deferred":
+                run.deferred += 1
+            else:
+                run.failed += 1
+            db.commit()
+        finally:
+            db.close()
+
+    async def _sync_user(self, run_id: int, user_id: int, semaphore: asyncio.Semaphore) -> str:
+        async with semaphore:
+            # Global start budget: at most RESYNC_USERS_PER_MINUTE user syncs
+            # begin per minute, each offset by random jitter
+            now = time.monotonic()
+            start_at = max(self._next_start, now)
+            self._next_start = start_at + 60.0 / settings.RESYNC_USERS_PER_MINUTE
+            await asyncio.sleep(start_at - now + random.uniform(0, settings.RESYNC_JITTER))
+
+            db = SessionLocal()
+            try:
+                user = db.query(User).filter(User.id == user_id).first()
+                if user is None or not user.access_token:
+                    outcome = "failed"
+                elif github_rate_limiter.wait_time(user.access_token) > 0:
+                    # Leave the budget to interactive use; picked up next run
+                    outcome = "deferred"
+                else:
+                    job = sync_job_queue.enqueue(db, user, dispatch=False)
+                    # None: a live sync of this user is already running elsewhere
+                    outcome = await sync_job_queue.run_job(job.id) or "deferred"
+            finally:
+                db.close()
+
+            self._record(run_id, user_id, outcome)
+            return outcome
+
+    async def run_once(self, limit: Optional[int] = None, dry_run: bool = False) -> Dict[str, Any]:
+        """Run (or resume) one resync pass and return its metrics"""
+        if dry_run:
+            plan = self.plan(limit)
+            return {"dry_run": True, "planned": len(plan), "users": plan}
+
+        started = time.monotonic()
+        db = SessionLocal()
+        try:
+            # Jobs left "running" by a killed process would block their users
+            sync_job_queue.reclaim_stale(db)
+        finally:
+            db.close()
+        run = self._checkpoint(limit)
+        completed = set(run.completed_user_ids)
+        remaining = [user_id for user_id in run.planned_user_ids if user_id not in completed]
+
+        semaphore = asyncio.Semaphore(settings.RESYNC_CONCURRENCY)
+        self._next_start = time.monotonic()
+        outcomes = await asyncio.gather(
+            *(self._sync_user(run.id, user_id, semaphore) for user_id in remaining)
+        )
+
+        db = SessionLocal()
+        try:
+            run = db.query(ResyncRun).filter(ResyncRun.id == run.id).first()
+            run.status = "completed"
+            run.finished_at = datetime.utcnow()
+            db.commit()
+            return {
+                "run_id": run.id,
+                "planned": len(run.planned_user_ids),
+                "resumed": len(run.planned_user_ids) - len(remaining),
+                "synced": run.synced,
+                "failed": run.failed,
+                "deferred": run.deferred,
+                "this_pass": len(outcomes),
+                "duration_seconds": round(time.monotonic() - started, 2),
+            }
+        finally:
+            db.close()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                metrics = await self.run_once()
+                print(f"Resync run finished: {metrics}")
+            except Exception as e:
+                print(f"Error during scheduled resync: {e}")
+            await asyncio.sleep(settings.RESYNC_INTERVAL)
+
+    async def start(self) -> None:
+        """Start the in-process loop when RESYNC_INTERVAL is set"""
+        if settings.RESYNC_INTERVAL > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+# Global instance
+resync_scheduler = ResyncScheduler()
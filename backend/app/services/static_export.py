@@ -0,0 +1,162 @@
+import gzip
+import html
+import json
+import os
+import shutil
+from typing import Optional, Dict, Any, Iterable
+from urllib.parse import urlsplit
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.portfolio_snapshot import PortfolioSnapshot
+from app.models.user import User
+from app.services.portfolio_snapshots import portfolio_snapshots
+
+
+MANIFEST_NAME = ".export-manifest.json"
+
+# Link schemes written into exported pages; anything else (javascript:, data:) is dropped
+SAFE_LINK_SCHEMES = {"http", "https"}
+
+
+def safe_link(*urls: Optional[str]) -> Optional[str]:
+    """First of `urls` with an http(s) scheme and a host"""
+    for url in urls:
+        if not url:
+            continue
+        try:
+            parts = urlsplit(url.strip())
+        except ValueError:
+            continue
+        if parts.scheme.lower() in SAFE_LINK_SCHEMES and parts.netloc:
+            return url.strip()
+    return None
+
+
+def render_portfolio_page(document: Dict[str, Any]) -> str:
+    """Minimal static HTML page for a portfolio document"""
+    user = document["user"]
+    name = html.escape(user["github_username"])
+    projects = []
+    for project in document["projects"]:
+        link = safe_link(project["deployed_url"], project["url"])
+        title = html.escape(project["name"])
+        if link:
+            title = f'<a href="{html.escape(link, quote=True)}">{title}</a>'
+        summary = project["description"] or project.get("readme_excerpt") or ""
+        projects.append(f'<li>{title}{" — " + html.escape(summary) if summary else ""}</li>')
+    return (
+        "<!DOCTYPE html>\n"
+        '<html lang="en"><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f"<title>{name} · Portfolio</title></head>\n"
+        f"<body><h1>{name}</h1>"
+        f'<p>{html.escape(user["bio"] or "")}</p>'
+        f'<h2>Projects</h2><ul>{"".join(projects)}</ul></body></html>\n'
+    )
+
+
+class StaticPortfolioExporter:
+    """Writes public portfolios to a directory tree nginx can serve directly.
+
+    Each public user gets `<username>/portfolio.json` (the public portfolio
+    endpoint's body) and `<username>/index.html`, each with a pre-compressed
+    `.gz` variant for gzip_static. A manifest of exported snapshot times makes
+    runs incremental, and users who went private or were deleted have their
+    files removed.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @staticmethod
+    def _write_plain(path: str, data: bytes) -> None:
+        """Replace a file atomically"""
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _write(self, path: str, data: bytes) -> None:
+        """Write a file and its pre-compressed .gz variant"""
+        self._write_plain(path, data)
+        self._write_plain(f"{path}.gz", gzip.compress(data, 9, mtime=0))
+
+    def _remove(self, username: str) -> None:
+        shutil.rmtree(os.path.join(self.root, username), ignore_errors=True)
+
+    def _load_manifest(self) -> Dict[str, Dict[str, str]]:
+        try:
+            with open(os.path.join(self.root, MANIFEST_NAME)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, Dict[str, str]]) -> None:
+        self._write_plain(os.path.join(self.root, MANIFEST_NAME), json.dumps(manifest).encode())
+
+    def export(self, user_ids: Optional[Iterable[int]] = None, full: bool = False) -> Dict[str, int]:
+        """Export changed portfolios (all users, or only `user_ids`) and prune private ones"""
+        os.makedirs(self.root, exist_ok=True)
+        scope = set(user_ids) if user_ids is not None else None
+
+        db = SessionLocal()
+        try:
+            # Snapshots are built lazily on first read; make sure every public user has one
+            missing = db.query(User.id).outerjoin(
+                PortfolioSnapshot, PortfolioSnapshot.user_id == User.id
+            ).filter(User.is_public == True, PortfolioSnapshot.user_id == None)
+            if scope is not None:
+                missing = missing.filter(User.id.in_(scope))
+            missing = {user_id for user_id, in missing}
+            if missing:
+                portfolio_snapshots.rebuild(missing)
+
+            query = db.query(
+                PortfolioSnapshot.user_id, PortfolioSnapshot.portfolio_username, PortfolioSnapshot.built_at
+            )
+            if scope is not None:
+                query = query.filter(PortfolioSnapshot.user_id.in_(scope))
+            snapshots = {user_id: (username, built_at.isoformat()) for user_id, username, built_at in query}
+
+            manifest = self._load_manifest()
+            metrics = {"written": 0, "unchanged": 0, "removed": 0}
+
+            for user_id, (username, built_at) in snapshots.items():
+                if "/" in username or username.startswith("."):
+                    print(f"Skipping static export of unsafe username {username!r}")
+                    continue
+                exported = manifest.get(str(user_id))
+                if not full and exported == {"username": username, "built_at": built_at}:
+                    metrics["unchanged"] += 1
+                    continue
+                if exported and exported["username"] != username:
+                    # Portfolio username changed: drop the old path
+                    self._remove(exported["username"])
+
+                content = db.query(PortfolioSnapshot.content).filter(
+                    PortfolioSnapshot.user_id == user_id
+                ).scalar()
+                directory = os.path.join(self.root, username)
+                os.makedirs(directory, exist_ok=True)
+                self._write(os.path.join(directory, "portfolio.json"), content)
+                page = render_portfolio_page(json.loads(content))
+                self._write(os.path.join(directory, "index.html"), page.encode("utf-8"))
+                manifest[str(user_id)] = {"username": username, "built_at": built_at}
+                metrics["written"] += 1
+
+            for user_id, exported in list(manifest.items()):
+                if int(user_id) in snapshots or (scope is not None and int(user_id) not in scope):
+                    continue
+                self._remove(exported["username"])
+                del manifest[user_id]
+                metrics["removed"] += 1
+
+            self._save_manifest(manifest)
+            return metrics
+        finally:
+            db.close()
+
+
+# Global instance
+static_exporter = StaticPortfolioExporter(settings.STATIC_EXPORT_DIR)
@@ -0,0 +1,200 @@
+import asyncio
+import time
+from typing import Optional, List
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.sync_job import SyncJob
+from app.models.user import User
+from app.services.project_sync import sync_user_projects
+from app.services.static_export import static_exporter
+
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class SyncJobQueue:
+    """In-process queue running GitHub syncs outside the request handler.
+
+    Jobs are persisted in the sync_jobs table so their state and progress
+    survive the request, and a user never has more than one active job:
+    enqueueing again returns the job already queued or running. A running
+    job bumps `updated_at` every SYNC_JOB_HEARTBEAT seconds; one left by a
+    killed process stops doing so and is reclaimed after SYNC_JOB_STALE_AFTER.
+    """
+
+    # Minimum seconds between progress writes for one job
+    PROGRESS_INTERVAL = 1.0
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Start the worker pool and dispatch jobs still queued from a previous run.
+
+        Running jobs are left to their heartbeat: another process may still
+        be running them, and only those whose heartbeat went stale are
+        reclaimed.
+        """
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+
+        db = SessionLocal()
+        try:
+            self.reclaim_stale(db)
+            queued = db.query(SyncJob.id).filter(SyncJob.status == "queued").order_by(SyncJob.id)
+            for job_id, in queued:
+                self._queue.put_nowait(job_id)
+        finally:
+            db.close()
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the worker pool; interrupted jobs are reclaimed once their heartbeat goes stale"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @staticmethod
+    def reclaim_stale(db: Session, user_id: Optional[int] = None) -> int:
+        """Fail running jobs whose heartbeat stopped (all users, or one); returns the number reclaimed"""
+        query = db.query(SyncJob).filter(
+            SyncJob.status == "running",
+            SyncJob.updated_at < datetime.utcnow() - timedelta(seconds=settings.SYNC_JOB_STALE_AFTER),
+        )
+        if user_id is not None:
+            query = query.filter(SyncJob.user_id == user_id)
+        reclaimed = query.update({
+            SyncJob.status: "failed",
+            SyncJob.error: "Abandoned: the process running it stopped",
+            SyncJob.finished_at: datetime.utcnow(),
+        }, synchronize_session=False)
+        if reclaimed:
+            db.commit()
+        return reclaimed
+
+    def enqueue(self, db: Session, user: User, full: bool = False, dispatch: bool = True) -> SyncJob:
+        """Queue a sync for a user, coalescing with an already active job.
+
+        With dispatch=False the job is only recorded; the caller runs it
+        through run_job() itself.
+        """
+        self.reclaim_stale(db, user.id)
+        job = db.query(SyncJob).filter(
+            SyncJob.user_id == user.id,
+            SyncJob.status.in_(ACTIVE_STATUSES),
+        ).first()
+
+        if job:
+            if full and not job.full and job.status == "queued":
+                job.full = True
+                db.commit()
+            return job
+
+        job = SyncJob(user_id=user.id, full=full)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+
+        if dispatch and self._queue is not None:
+            self._queue.put_nowait(job.id)
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self.run_job(job_id)
+            except Exception as e:
+                print(f"Error running sync job {job_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _write_progress(job_id: int, **values) -> None:
+        """Update a job's progress columns (and heartbeat) in their own short transaction"""
+        db = SessionLocal()
+        try:
+            db.query(SyncJob).filter(SyncJob.id == job_id).update(
+                {**values, "updated_at": datetime.utcnow()}, synchronize_session=False
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Error recording progress of sync job {job_id}: {e}")
+        finally:
+            db.close()
+
+    async def run_job(self, job_id: int) -> Optional[str]:
+        """Run one queued job to completion, recording progress and outcome.
+
+        Returns the final job status, or None if the job was not queued.
+        """
+        db = SessionLocal()
+        try:
+            # Claim in one conditional UPDATE: with several workers (or processes)
+            # holding the same job id, only one sees it still queued
+            claimed = db.query(SyncJob).filter(SyncJob.id == job_id, SyncJob.status == "queued").update({
+                SyncJob.status: "running",
+                SyncJob.started_at: datetime.utcnow(),
+                SyncJob.updated_at: datetime.utcnow(),
+            }, synchronize_session=False)
+            db.commit()
+            if claimed != 1:
+                return None
+            job = db.query(SyncJob).filter(SyncJob.id == job_id).first()
+            user = db.query(User).filter(User.id == job.user_id).first()
+
+            last_write = 0.0
+
+            def progress(done: int, total: int) -> None:
+                # Never commits the sync session, which writes everything at the end
+                nonlocal last_write
+                now = time.monotonic()
+                if done >= total or now - last_write >= self.PROGRESS_INTERVAL:
+                    self._write_progress(job_id, repos_done=done, repos_total=total)
+                    last_write = now
+
+            async def heartbeat() -> None:
+                while True:
+                    await asyncio.sleep(settings.SYNC_JOB_HEARTBEAT)
+                    self._write_progress(job_id)
+
+            beating = asyncio.create_task(heartbeat())
+            try:
+                if user is None:
+                    raise ValueError("User no longer exists")
+                synced = await sync_user_projects(user, db, full=job.full, progress=progress)
+                job.status = "completed"
+                job.synced_count = len(synced)
+            except Exception as e:
+                db.rollback()
+                job.status = "failed"
+                job.error = str(e)
+            finally:
+                beating.cancel()
+
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            
+            if job.status == "completed" and settings.STATIC_EXPORT_DIR:
+                # Post-sync hook: refresh this user's static portfolio files
+                try:
+                    static_exporter.export(user_ids=[job.user_id])
+                except Exception as e:
+                    print(f"Error exporting static portfolio for user {job.user_id}: {e}")
+            return job.status
+        finally:
+            db.close()
+
+
+# Global instance
+sync_job_queue = SyncJobQueue(workers=settings.SYNC_WORKERS)
@@ -0,0 +1,104 @@
+from collections import defaultdict
+from typing import Dict, Any, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import User
+from app.models.project import Project
+from app.models.user_language import UserLanguage
+
+
+STALE_KEY = "stale_tech_stack_user_ids"
+
+
+class TechStackStore:
+    """Per-user language aggregates behind the portfolio tech_stack section.
+
+    Sync and API writes flag users whose project languages (or project set
+    / visibility) changed with mark_stale(); the portfolio snapshot hook
+    refreshes just those users after commit, so views read a handful of
+    precomputed rows instead of summing every project's languages.
+    """
+
+    @staticmethod
+    def mark_stale(db: Session, user_ids: Iterable[int]) -> None:
+        """Refresh these users' aggregates (and portfolio snapshots) when `db` next commits"""
+        db.info.setdefault(STALE_KEY, set()).update(user_ids)
+
+    def refresh(self, db: Session, user_ids: Iterable[int]) -> None:
+        """Recompute the aggregates of these users from their visible projects; the caller commits"""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        db.query(UserLanguage).filter(
+            UserLanguage.user_id.in_(user_ids)
+        ).delete(synchronize_session=False)
+
+        totals: Dict[int, Dict[str, list]] = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+        for user_id, languages in db.query(Project.user_id, Project.languages).filter(
+            Project.user_id.in_(user_ids), Project.is_visible == True
+        ):
+            for language, size in (languages or {}).items():
+                entry = totals[user_id][language]
+                entry[0] += size or 0
+                entry[1] += 1
+
+        rows = []
+        for user_id, languages in totals.items():
+            total = sum(size for size, _ in languages.values())
+            rows.extend(
+                {
+                    "user_id": user_id,
+                    "language": language,
+                    "bytes": size,
+                    "share": round(size / total, 4) if total else 0.0,
+                    "project_count": count,
+                }
+                for language, (size, count) in languages.items()
+            )
+        if rows:
+            db.bulk_insert_mappings(UserLanguage, rows)
+
+    def get(self, db: Session, user_id: int, top_n: Optional[int] = None) -> Dict[str, Any]:
+        """Tech stack section: top languages by bytes, plus the remainder as `other`"""
+        top_n = top_n or settings.TECH_STACK_TOP_N
+        rows = db.query(
+            UserLanguage.language, UserLanguage.bytes, UserLanguage.share, UserLanguage.project_count
+        ).filter(UserLanguage.user_id == user_id).order_by(
+            UserLanguage.bytes.desc(), UserLanguage.language
+        ).all()
+        top, rest = rows[:top_n], rows[top_n:]
+        return {
+            "total_bytes": sum(row.bytes for row in rows),
+            "languages": [row._asdict() for row in top],
+            "other": {
+                "bytes": sum(row.bytes for row in rest),
+                "share": round(sum((row.share for row in rest), 0.0), 4),
+                "language_count": len(rest),
+            },
+        }
+
+    def backfill(self, db: Session, user_id: Optional[int] = None, chunk_size: int = 500) -> int:
+        """Flag every user (or one) for refresh, committing per chunk; returns users covered"""
+        query = db.query(User.id).order_by(User.id)
+        if user_id is not None:
+            query = query.filter(User.id == user_id)
+
+        covered = 0
+        last_id = 0
+        while True:
+            user_ids = [uid for uid, in query.filter(User.id > last_id).limit(chunk_size)]
+            if not user_ids:
+                break
+            self.mark_stale(db, user_ids)
+            # The portfolio snapshot hook refreshes flagged users after commit
+            db.commit()
+            covered += len(user_ids)
+            last_id = user_ids[-1]
+
+        return covered
+
+
+# Global instance
+tech_stack = TechStackStore()
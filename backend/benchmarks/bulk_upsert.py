@@ -0,0 +1,90 @@
+"""
+Persisting a sync: one SELECT + commit per repo vs one bulk upsert.
+
+The per-repo path mirrors the original sync loop (query the project, update
+or insert it, commit, refresh). Both paths store the same rows, READMEs
+included, for an initial sync (all inserts) and a resync (all updates).
+
+    python -m benchmarks.bulk_upsert [--repos 250]
+"""
+import argparse
+import time
+
+from benchmarks.common import count_commits, make_user, report, setup_database
+from app.models.project import Project
+from app.services.project_sync import repo_to_project_row, upsert_project_rows
+from app.services.readme_store import save_readmes
+
+
+def fake_repo(i: int, stars: int) -> dict:
+    return {
+        "id": 10_000 + i,
+        "name": f"repo-{i}",
+        "description": f"Repository number {i}",
+        "html_url": f"https://github.com/benchmark/repo-{i}",
+        "homepage": f"https://repo-{i}.vercel.app" if i % 3 == 0 else None,
+        "stargazers_count": stars,
+        "forks_count": i % 7,
+        "watchers_count": stars,
+        "archived": False,
+        "fork": False,
+        "topics": ["benchmark"],
+        "updated_at": "2024-05-01T00:00:00Z",
+        "pushed_at": "2024-05-01T00:00:00Z",
+        "owner": {"login": "benchmark"},
+    }
+
+
+def per_repo_commits(db, user, rows: list) -> None:
+    """Original shape: a lookup and a commit (plus a refresh on insert) for every repo"""
+    for row in rows:
+        project = db.query(Project).filter(
+            Project.github_id == row["github_id"],
+            Project.user_id == user.id,
+        ).first()
+        values = {key: value for key, value in row.items() if key != "readme_content"}
+        if project:
+            for key, value in values.items():
+                setattr(project, key, value)
+            db.flush()
+        else:
+            project = Project(**values)
+            db.add(project)
+            db.flush()
+        save_readmes(db, {project.id: row["readme_content"]})
+        db.commit()
+        db.refresh(project)
+
+
+def bulk_upsert(db, user, rows: list) -> None:
+    upsert_project_rows(db, rows)
+    db.commit()
+
+
+def main(repo_count: int) -> None:
+    Session = setup_database()
+    commits = count_commits()
+
+    results = []
+    for label, persist in (("per-repo commit", per_repo_commits), ("bulk upsert", bulk_upsert)):
+        db = Session()
+        user = make_user(db, f"bench-{label.split()[0]}")
+        for phase, stars in (("initial sync", 1), ("resync", 2)):
+            rows = [
+                repo_to_project_row(user, fake_repo(i, stars), {"Python": 1000 + i}, f"# Repo {i}\n\nText {stars}")
+                for i in range(repo_count)
+            ]
+            commits.clear()
+            started = time.perf_counter()
+            persist(db, user, rows)
+            elapsed = time.perf_counter() - started
+            results.append((label, phase, len(commits), f"{elapsed * 1000:.0f} ms"))
+        db.close()
+
+    report(f"Persisting {repo_count} synced repos", ("path", "phase", "commits", "wall time"), results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repos", type=int, default=250)
+    main(parser.parse_args().repos)
@@ -0,0 +1,88 @@
+"""
+Shared setup for the benchmark scripts.
+
+Benchmarks run against a throwaway SQLite database in a temp directory and
+never touch GitHub. Run them from backend/:
+
+    python -m benchmarks.http_pool
+"""
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, List, Sequence
+
+# Settings are read on import; DB_NAME is relative to the working directory
+os.environ.setdefault("GITHUB_CLIENT_ID", "benchmark")
+os.environ.setdefault("GITHUB_CLIENT_SECRET", "benchmark")
+os.environ.setdefault("DB_NAME", "benchmark.db")
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+WORK_DIR = tempfile.mkdtemp(prefix="onelink-bench-")
+os.chdir(WORK_DIR)
+
+
+def timed(fn: Callable[[], object], repeat: int = 5, clock: Callable[[], float] = time.perf_counter) -> float:
+    """Best time of `repeat` runs, in seconds (wall time unless another clock is given)"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = clock()
+        fn()
+        best = min(best, clock() - started)
+    return best
+
+
+def report(title: str, header: Sequence[str], rows: List[Sequence[object]]) -> None:
+    """Print a result table"""
+    table = [list(map(str, header))] + [[str(cell) for cell in row] for row in rows]
+    widths = [max(len(row[i]) for row in table) for i in range(len(header))]
+    print(f"\n{title}")
+    for i, row in enumerate(table):
+        print("  " + "  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+        if i == 0:
+            print("  " + "  ".join("-" * width for width in widths))
+
+
+def setup_database():
+    """Migrate the throwaway database and return a session factory without the app's write hooks.
+
+    Benchmarks that measure persistence use plain sessions, so snapshot and
+    search rebuilds after commit do not blur the numbers.
+    """
+    from sqlalchemy.orm import sessionmaker
+
+    import app.models  # noqa: F401  (register all tables)
+    from app.db.database import engine
+    from app.db.migrations import run_migrations
+
+    run_migrations()
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def make_user(db, username: str = "benchmark"):
+    """Public user with a GitHub token"""
+    from app.models.user import User
+
+    user = User(
+        github_id=abs(hash(username)) % 10**8,
+        github_username=username,
+        portfolio_username=username,
+        access_token=f"token-{username}",
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def count_commits():
+    """List that collects one entry per commit on the app engine"""
+    from sqlalchemy import event
+    from app.db.database import engine
+
+    commits = []
+    event.listen(engine, "commit", lambda connection: commits.append(1))
+    return commits
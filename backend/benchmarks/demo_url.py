@@ -0,0 +1,97 @@
+"""
+Demo URL detection: one regex search per host vs the suffix-anchored detector.
+
+The per-host path mirrors the original detector (a `.+` search per
+deployment host, then a findall for demo/live/preview links). Both run over
+the same synthetic READMEs: large ones with no demo URL at all (every host
+pattern scans the whole text), ones with a link near the end, ones full of
+GitHub Pages docs links (a suffix hit on every line), and small ones.
+
+    python -m benchmarks.demo_url [--readme-kb 64] [--readmes 50]
+"""
+import argparse
+import re
+from typing import Optional
+
+from benchmarks.common import report, timed
+from app.services.demo_url import demo_url_detector
+
+LEGACY_PATTERNS = [
+    r"https?://.+\.vercel\.app",
+    r"https?://.+\.netlify\.app",
+    r"https?://.+\.herokuapp\.com",
+    r"https?://.+\.render\.com",
+    r"https?://.+\.github\.io",
+    r"https?://.+\.surge\.sh",
+]
+
+
+def per_host_search(homepage: Optional[str], readme: Optional[str]) -> Optional[str]:
+    """Original shape: a search per host pattern, then a findall for demo links"""
+    if homepage:
+        for pattern in LEGACY_PATTERNS:
+            if re.search(pattern, homepage, re.IGNORECASE):
+                return homepage
+    if readme:
+        for pattern in LEGACY_PATTERNS:
+            match = re.search(pattern, readme, re.IGNORECASE)
+            if match:
+                return match.group(0)
+        demo_links = re.findall(r"\[.*?(demo|live|preview).*?\]\((https?://[^\)]+)\)", readme, re.IGNORECASE)
+        if demo_links:
+            return demo_links[0][1]
+    return None
+
+
+def make_readme(size_kb: int, tail: str = "", docs_host: str = "docs.example.com") -> str:
+    """Markdown with plenty of ordinary links and code, about `size_kb` KiB long"""
+    section = (
+        "## Usage\n\n"
+        f"See [the docs](https://{docs_host}/guide) and https://example.com/api for details.\n"
+        "```bash\npip install example && example --serve http://localhost:8000\n```\n"
+        "- [Changelog](https://github.com/example/example/blob/main/CHANGELOG.md)\n\n"
+    )
+    body = section * (size_kb * 1024 // len(section) + 1)
+    return f"# Example\n\n{body}{tail}"
+
+
+def main(readme_kb: int, readme_count: int) -> None:
+    corpora = {
+        f"{readme_kb} KiB, no demo URL": [make_readme(readme_kb) for _ in range(readme_count)],
+        f"{readme_kb} KiB, demo link at end": [
+            make_readme(readme_kb, "\n[Live demo](https://example.netlify.app)\n") for _ in range(readme_count)
+        ],
+        f"{readme_kb} KiB, github.io docs links": [
+            make_readme(readme_kb, docs_host="example.github.io") for _ in range(readme_count)
+        ],
+        "2 KiB, deployment URL": [
+            make_readme(2, "\nDeployed at https://example.vercel.app\n") for _ in range(readme_count)
+        ],
+    }
+
+    results = []
+    for label, readmes in corpora.items():
+        for readme in readmes:
+            assert per_host_search(None, readme) == demo_url_detector.detect(None, readme)
+        legacy = timed(lambda: [per_host_search(None, readme) for readme in readmes])
+        anchored = timed(lambda: [demo_url_detector.detect(None, readme) for readme in readmes])
+        results.append((
+            label,
+            f"{legacy / readme_count * 1e6:.0f} us",
+            f"{anchored / readme_count * 1e6:.0f} us",
+            f"{legacy / anchored:.1f}x",
+        ))
+
+    report(
+        f"Demo URL detection over {readme_count} READMEs per corpus (time per README)",
+        ("corpus", "per-host search", "suffix-anchored", "speedup"),
+        results,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readme-kb", type=int, default=64)
+    parser.add_argument("--readmes", type=int, default=50)
+    args = parser.parse_args()
+    main(args.readme_kb, args.readmes)
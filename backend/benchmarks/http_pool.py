@@ -0,0 +1,107 @@
+"""
+Connections opened per sync: one client per call vs the shared pool.
+
+A local stand-in for api.github.com counts accepted TCP connections while
+the languages + README enrichment of N repos runs both ways.
+
+    python -m benchmarks.http_pool [--repos 200]
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.common import report
+from app.core.config import settings
+from app.services.github_service import github_service
+
+
+class StandInServer:
+    """Minimal keep-alive HTTP/1.1 server answering every GET with a small JSON body"""
+
+    BODY = b'{"Python": 1024}'
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                self.requests += 1
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(self.BODY)).encode() + b"\r\n\r\n" + self.BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    def reset(self) -> None:
+        self.connections = 0
+        self.requests = 0
+
+
+async def per_call_clients(base_url: str, repos: list) -> None:
+    """Baseline: every GitHub call opens and closes its own client"""
+    semaphore = asyncio.Semaphore(settings.GITHUB_SYNC_CONCURRENCY)
+
+    async def get(path: str) -> None:
+        async with semaphore:
+            async with httpx.AsyncClient() as client:
+                await client.get(f"{base_url}{path}")
+
+    await asyncio.gather(*(
+        get(f"/repos/{repo['owner']['login']}/{repo['name']}/{endpoint}")
+        for repo in repos for endpoint in ("languages", "readme")
+    ))
+
+
+async def shared_pool(repos: list) -> None:
+    await github_service.enrich_repos("benchmark-token", repos)
+
+
+async def main(repo_count: int) -> None:
+    settings.GITHUB_CACHE_ENABLED = False
+    server = StandInServer()
+    base_url = await server.start()
+    github_service.BASE_URL = base_url
+    repos = [{"name": f"repo-{i}", "owner": {"login": "bench"}} for i in range(repo_count)]
+
+    rows = []
+    for label, run in (
+        ("client per call", lambda: per_call_clients(base_url, repos)),
+        ("shared pool", lambda: shared_pool(repos)),
+    ):
+        server.reset()
+        started = time.perf_counter()
+        await run()
+        elapsed = time.perf_counter() - started
+        rows.append((label, server.requests, server.connections, f"{elapsed * 1000:.0f} ms"))
+
+    await github_service.shutdown()
+    await server.stop()
+    report(f"Enrichment of {repo_count} repos", ("client", "requests", "connections", "wall time"), rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repos", type=int, default=200)
+    asyncio.run(main(parser.parse_args().repos))
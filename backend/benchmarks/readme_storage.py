@@ -0,0 +1,131 @@
+"""
+README storage: inline in projects vs compressed in project_readmes.
+
+The inline layout mirrors the original schema (README text in
+projects.readme_content, loaded with every project row). Both layouts store
+the same synthetic READMEs; the report gives the database growth after
+VACUUM and the time and peak Python memory of listing every project the
+way the list endpoints do.
+
+    python -m benchmarks.readme_storage [--projects 2000] [--readme-kb 8]
+"""
+import argparse
+import os
+import random
+import time
+import tracemalloc
+
+from sqlalchemy.orm import undefer
+
+from benchmarks.common import make_user, report, setup_database
+from app.core.config import settings
+from app.db.database import engine
+from app.models.project import Project
+from app.services.readme_store import save_readmes
+
+WORDS = [
+    "install", "run", "the", "server", "config", "api", "token", "build", "deploy", "docker",
+    "python", "react", "component", "database", "query", "cache", "test", "coverage", "license",
+    "example", "usage", "request", "response", "client", "async", "route", "model", "schema",
+]
+
+
+def make_readme(rng: random.Random, size_kb: int) -> str:
+    """Markdown of headings, prose and code blocks, about `size_kb` KiB long"""
+    parts = [f"# Project {rng.randrange(10**6)}\n"]
+    size = 0
+    while size < size_kb * 1024:
+        prose = " ".join(rng.choice(WORDS) for _ in range(rng.randint(30, 80)))
+        part = f"\n## {rng.choice(WORDS).title()}\n\n{prose}.\n\n```bash\n{rng.choice(WORDS)} --{rng.choice(WORDS)}\n```\n"
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)
+
+
+def database_size() -> int:
+    with engine.connect() as connection:
+        connection.exec_driver_sql("VACUUM")
+    return os.path.getsize(settings.DB_NAME)
+
+
+def store_inline(db, user_id: int, readmes: list) -> None:
+    db.add_all([
+        Project(user_id=user_id, github_id=i, name=f"repo-{i}", url=f"https://github.com/b/repo-{i}",
+                legacy_readme_content=text)
+        for i, text in enumerate(readmes)
+    ])
+    db.commit()
+
+
+def store_compressed(db, user_id: int, readmes: list) -> None:
+    projects = [
+        Project(user_id=user_id, github_id=i, name=f"repo-{i}", url=f"https://github.com/b/repo-{i}")
+        for i in range(len(readmes))
+    ]
+    db.add_all(projects)
+    db.flush()
+    save_readmes(db, {project.id: text for project, text in zip(projects, readmes)})
+    db.commit()
+
+
+def list_inline(db, user_id: int) -> int:
+    """Original list: full rows, README bodies included"""
+    projects = db.query(Project).options(undefer(Project.legacy_readme_content)).filter(
+        Project.user_id == user_id
+    ).all()
+    return sum(len(p.legacy_readme_content or "") for p in projects)
+
+
+def list_compressed(db, user_id: int) -> int:
+    """Current list: excerpts only, README rows never loaded"""
+    projects = db.query(Project).filter(Project.user_id == user_id).all()
+    return sum(len(p.readme_excerpt or "") for p in projects)
+
+
+def main(project_count: int, readme_kb: int) -> None:
+    Session = setup_database()
+    rng = random.Random(14)
+    readmes = [make_readme(rng, readme_kb) for _ in range(project_count)]
+    raw = sum(len(text.encode("utf-8")) for text in readmes)
+
+    results = []
+    for label, store, list_projects in (
+        ("inline projects.readme_content", store_inline, list_inline),
+        ("compressed project_readmes", store_compressed, list_compressed),
+    ):
+        db = Session()
+        user_id = make_user(db, f"bench-{label.split()[0]}").id
+        before = database_size()
+        store(db, user_id, readmes)
+        growth = database_size() - before
+        db.close()
+
+        db = Session()
+        tracemalloc.start()
+        started = time.perf_counter()
+        list_projects(db, user_id)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        db.close()
+
+        results.append((
+            label,
+            f"{growth / 2**20:.1f} MiB",
+            f"{elapsed * 1000:.0f} ms",
+            f"{peak / 2**20:.1f} MiB",
+        ))
+
+    report(
+        f"{project_count} projects, {raw / 2**20:.1f} MiB of README text",
+        ("layout", "DB growth", "list query", "list peak memory"),
+        results,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=2000)
+    parser.add_argument("--readme-kb", type=int, default=8)
+    args = parser.parse_args()
+    main(args.projects, args.readme_kb)
@@ -0,0 +1,133 @@
+"""
+Portfolio search on a synthetic corpus: index build, query latency and reindex cost per edit.
+
+Projects are spread over users (with one heavy user), each with a README of
+generated prose: mostly filler words, with topical terms sprinkled in so
+each one matches a small share of projects. Write costs compare the
+original hook, which rewrote all of the user's rows (decompressing every
+README) on each commit, with the per-project and per-profile refresh.
+Each write is rolled back, so the corpus is the same for every run.
+
+    python -m benchmarks.search [--projects 100000] [--per-user 100] [--heavy-user 500]
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from benchmarks.common import report, setup_database, timed
+from app.db.migrations import reindex_public_users
+from app.models.experience import Experience
+from app.models.project import Project
+from app.models.project_readme import ProjectReadme, compress_readme
+from app.models.skill import Skill
+from app.models.user import User
+from app.services.portfolio_search import portfolio_search
+
+WORDS = (
+    "parser server client async runtime cache query index stream queue worker scheduler "
+    "compiler tokenizer graph vector tensor model training inference api gateway proxy "
+    "database storage replication consensus raft kafka redis postgres sqlite rust go python "
+    "typescript react svelte kubernetes docker terraform wasm webassembly embedded firmware"
+).split()
+
+FILLER = [f"w{i}" for i in range(20_000)]
+
+QUERIES = ("rust", "webassembly compiler", "kubernetes operator", "raft consensus storage", "zzzz")
+
+
+def sentence(rng: random.Random, length: int, topical: float = 0.03) -> str:
+    """`length` words, each a topical term with probability `topical`"""
+    return " ".join(rng.choice(WORDS if rng.random() < topical else FILLER) for _ in range(length))
+
+
+def populate(db, project_count: int, per_user: int, heavy_user: int) -> int:
+    """Users, projects, READMEs and skills written in bulk; returns the heavy user's id"""
+    rng = random.Random(24)
+    now = datetime.utcnow()
+    user_count = max(1, (project_count - heavy_user) // per_user) + 1
+    db.execute(insert(User), [
+        {"id": user_id, "github_id": user_id, "github_username": f"user{user_id}",
+         "portfolio_username": f"user{user_id}", "is_public": True, "created_at": now}
+        for user_id in range(1, user_count + 1)
+    ])
+    db.execute(insert(Skill), [
+        {"user_id": user_id, "name": rng.choice(WORDS)}
+        for user_id in range(1, user_count + 1) for _ in range(3)
+    ])
+    db.execute(insert(Experience), [
+        {"user_id": user_id, "title": f"{rng.choice(WORDS)} engineer", "company": "Acme", "start_date": now}
+        for user_id in range(1, user_count + 1)
+    ])
+
+    owners = [1] * heavy_user + [2 + i // per_user for i in range(project_count - heavy_user)]
+    chunk = 5000
+    for start in range(0, project_count, chunk):
+        ids = range(start + 1, min(start + chunk, project_count) + 1)
+        db.execute(insert(Project), [
+            {"id": i, "user_id": owners[i - 1], "github_id": i, "name": f"repo-{i}", "url": f"https://github.com/x/{i}",
+             "description": sentence(rng, 8, topical=0.2), "topics": [rng.choice(WORDS)], "languages": {rng.choice(WORDS): 100},
+             "is_visible": True}
+            for i in ids
+        ])
+        db.execute(insert(ProjectReadme), [
+            {"project_id": i, "content": compress_readme(f"# repo-{i}\n\n{sentence(rng, 150)}"), "size": 0}
+            for i in ids
+        ])
+    db.commit()
+    return 1
+
+
+def main(project_count: int, per_user: int, heavy_user: int) -> None:
+    Session = setup_database()
+    db = Session()
+    heavy_id = populate(db, project_count, per_user, heavy_user)
+
+    started = time.perf_counter()
+    reindex_public_users()
+    build = time.perf_counter() - started
+
+    searches = [
+        (f'"{query}"', f"{timed(lambda: portfolio_search.search(db, query), repeat=10) * 1000:.1f} ms")
+        for query in QUERIES
+    ]
+    report(f"Search over {project_count} projects (index built in {build:.1f} s)", ("query", "latency"), searches)
+
+    project_id = db.query(Project.id).filter(Project.user_id == heavy_id).first()[0]
+    small_id = heavy_id + 1
+    small_project_id = db.query(Project.id).filter(Project.user_id == small_id).first()[0]
+    edits = (
+        (f"project edit ({heavy_user}-project user)", heavy_id,
+         {"users": set(), "projects": {project_id}, "profiles": set()}),
+        (f"project edit ({per_user}-project user)", small_id,
+         {"users": set(), "projects": {small_project_id}, "profiles": set()}),
+        ("skill / experience edit", small_id, {"users": set(), "projects": set(), "profiles": {small_id}}),
+        ("bio edit", small_id, None),
+    )
+    writes = []
+    for label, user_id, stale in edits:
+        def full():
+            portfolio_search.reindex(db, [user_id])
+            db.rollback()
+
+        def incremental():
+            if stale:
+                portfolio_search.refresh(db, stale)
+            db.rollback()
+
+        before, after = timed(full), timed(incremental)
+        writes.append((label, f"{before * 1000:.1f} ms", f"{after * 1000:.1f} ms"))
+    db.close()
+
+    report("Search reindex per commit", ("write", "all user rows", "changed rows only"), writes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=100_000)
+    parser.add_argument("--per-user", type=int, default=100)
+    parser.add_argument("--heavy-user", type=int, default=500)
+    args = parser.parse_args()
+    main(args.projects, args.per_user, args.heavy_user)
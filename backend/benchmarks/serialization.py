@@ -0,0 +1,112 @@
+"""
+Response serialization: ORM objects through Pydantic/json vs row tuples through orjson.
+
+The ORM paths mirror the original endpoints: the portfolio document built
+from Project instances and encoded with json.dumps, and GET /projects
+validating ORM instances against ProjectListResponse, dumping the model and
+encoding with json.dumps as FastAPI does for a response_model. Both sides
+produce the same JSON; the report gives the best CPU time per request.
+
+    python -m benchmarks.serialization [--projects 200]
+"""
+import argparse
+import json
+import time
+
+import orjson
+
+from benchmarks.common import make_user, report, setup_database, timed
+from app.api.projects import PROJECT_SUMMARY_COLUMNS
+from app.models.media import Media
+from app.models.project import Project
+from app.schemas.project import ProjectListResponse
+from app.services.portfolio_snapshots import PROJECT_COLUMNS, MEDIA_COLUMNS, build_portfolio
+
+PAGE_SIZE = 100
+
+
+def populate(db, user_id: int, project_count: int) -> None:
+    for i in range(project_count):
+        project = Project(
+            user_id=user_id, github_id=i, name=f"repo-{i}", description=f"Repository number {i}",
+            url=f"https://github.com/benchmark/repo-{i}", homepage=None,
+            readme_excerpt="A small tool that does one thing well. " * 4,
+            languages={"Python": 40_000 + i, "TypeScript": 12_000, "Shell": 300},
+            topics=["benchmark", "fastapi", "sqlite"], stars=i, forks=i % 7, watchers=i,
+            status="deployed" if i % 3 == 0 else "code_only",
+            deployed_url=f"https://repo-{i}.vercel.app" if i % 3 == 0 else None,
+        )
+        db.add(project)
+        db.flush()
+        db.add(Media(user_id=user_id, project_id=project.id, filename=f"{i}.png",
+                     file_path=f"/uploads/{i}.png", media_type="screenshot", title=f"Screenshot {i}"))
+    db.commit()
+
+
+def portfolio_from_orm(db, user_id: int) -> bytes:
+    """Original shape: Project instances copied field by field, encoded with json"""
+    projects = db.query(Project).filter(Project.user_id == user_id, Project.is_visible == True).all()
+    media = {}
+    for m in db.query(Media).filter(Media.user_id == user_id):
+        media.setdefault(m.project_id, []).append({column.key: getattr(m, column.key) for column in MEDIA_COLUMNS})
+    document = {"projects": [
+        {**{key: getattr(p, key) for key in PROJECT_COLUMNS}, "media": media.get(p.id, [])}
+        for p in projects
+    ]}
+    return json.dumps(document, separators=(",", ":")).encode("utf-8")
+
+
+def portfolio_from_rows(db, user_id: int) -> bytes:
+    _, document = build_portfolio(db, user_id, sections=("projects",))
+    return orjson.dumps(document)
+
+
+def list_from_orm(db, user_id: int) -> bytes:
+    """Original shape: ORM page validated against the response model, then json-encoded"""
+    projects = db.query(Project).filter(Project.user_id == user_id).limit(PAGE_SIZE).all()
+    model = ProjectListResponse.model_validate({
+        "items": projects, "total": None, "page": 0, "page_size": PAGE_SIZE, "next_cursor": None,
+    })
+    return json.dumps(model.model_dump(mode="json"), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def list_from_rows(db, user_id: int) -> bytes:
+    rows = db.query(*PROJECT_SUMMARY_COLUMNS).filter(Project.user_id == user_id).limit(PAGE_SIZE).all()
+    return orjson.dumps({
+        "items": [row._asdict() for row in rows], "total": None, "page": 0,
+        "page_size": PAGE_SIZE, "next_cursor": None,
+    })
+
+
+def main(project_count: int) -> None:
+    Session = setup_database()
+    db = Session()
+    user_id = make_user(db).id
+    populate(db, user_id, project_count)
+
+    results = []
+    for label, before, after in (
+        (f"portfolio projects ({project_count})", portfolio_from_orm, portfolio_from_rows),
+        (f"GET /projects page ({PAGE_SIZE})", list_from_orm, list_from_rows),
+    ):
+        assert json.loads(before(db, user_id)) == json.loads(after(db, user_id))
+        cpu = []
+        for build in (before, after):
+            def request():
+                build(db, user_id)
+                db.expunge_all()
+            cpu.append(timed(request, repeat=20, clock=time.process_time))
+        results.append((label, f"{cpu[0] * 1000:.1f} ms", f"{cpu[1] * 1000:.1f} ms", f"{cpu[0] / cpu[1]:.1f}x"))
+    db.close()
+
+    report(
+        "CPU time per request",
+        ("response", "ORM + Pydantic/json", "row tuples + orjson", "speedup"),
+        results,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=200)
+    main(parser.parse_args().projects)
@@ -0,0 +1,174 @@
+import asyncio
+import base64
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+# Settings are read on import; DB_NAME is relative to the working directory
+os.environ.setdefault("GITHUB_CLIENT_ID", "test")
+os.environ.setdefault("GITHUB_CLIENT_SECRET", "test")
+os.environ["DB_NAME"] = "test.db"
+os.chdir(tempfile.mkdtemp(prefix="onelink-test-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.models  # noqa: E402,F401  (register all tables)
+from app.db.database import Base, SessionLocal, engine  # noqa: E402
+from app.db.migrations import run_migrations  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.github_cache import github_cache  # noqa: E402
+from app.services.github_rate_limiter import github_rate_limiter  # noqa: E402
+from app.services.github_service import github_service  # noqa: E402
+from app.services.portfolio_snapshots import portfolio_snapshots  # noqa: E402,F401  (registers hooks)
+from app.services.public_cache import public_cache  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+run_migrations()
+
+
+def load_fixture(name: str) -> Any:
+    """Parsed JSON fixture from tests/fixtures"""
+    with open(os.path.join(FIXTURES_DIR, name)) as f:
+        return json.load(f)
+
+
+@contextmanager
+def recorded_queries():
+    """List of (statement, parameters) for every SQL statement run on the app engine inside the block"""
+    statements = []
+
+    def record(connection, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def get(path: str, token: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+    """GET from the app in-process, as the bearer of `token` if given"""
+    from app.main import app
+
+    async def request():
+        request_headers = {**(headers or {}), **({"Authorization": f"Bearer {token}"} if token else {})}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver", headers=request_headers) as client:
+            return await client.get(path)
+    return asyncio.run(request())
+
+
+def rest_repo(github_id: int, name: str, pushed_at: str, updated_at: str = None, **values) -> dict:
+    """Repo entry as listed by GET /users/{username}/repos"""
+    return {
+        "id": github_id,
+        "name": name,
+        "description": f"{name} description",
+        "html_url": f"https://github.com/octocat/{name}",
+        "homepage": None,
+        "stargazers_count": 1,
+        "forks_count": 0,
+        "watchers_count": 1,
+        "archived": False,
+        "fork": False,
+        "topics": [],
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": updated_at or pushed_at,
+        "pushed_at": pushed_at,
+        "owner": {"login": "octocat"},
+        **values,
+    }
+
+
+def serve_repo(github: "GitHubStub", name: str, languages: dict, readme: str = None) -> None:
+    github.json("GET", f"/repos/octocat/{name}/languages", languages)
+    if readme is not None:
+        github.json("GET", f"/repos/octocat/{name}/readme", {
+            "content": base64.b64encode(readme.encode()).decode(),
+        })
+
+
+class GitHubStub:
+    """Recorded GitHub responses served through httpx.MockTransport.
+
+    Routes map (method, path) to a response or a callable building one;
+    unrouted requests get a 404. Every request is kept in `requests`.
+    """
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], Any] = {}
+        self.requests: List[httpx.Request] = []
+
+    def add(self, method: str, path: str, response: Any) -> None:
+        self.routes[(method, path)] = response
+
+    def json(self, method: str, path: str, payload: Any, status: int = 200,
+             headers: Optional[Dict[str, str]] = None) -> None:
+        self.add(method, path, httpx.Response(status, json=payload, headers=headers))
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        route = self.routes.get((request.method, request.url.path))
+        if route is None:
+            return httpx.Response(404, json={"message": "Not Found"})
+        if isinstance(route, Callable):
+            return route(request)
+        return route
+
+    def paths(self, method: str = "GET") -> List[str]:
+        return [r.url.path for r in self.requests if r.method == method]
+
+
+@pytest.fixture
+def db():
+    """Session on an emptied database"""
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+        connection.exec_driver_sql("DELETE FROM portfolio_search")
+    public_cache._entries.clear()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def github():
+    """GitHubStub wired into the shared GitHub client"""
+    stub = GitHubStub()
+    github_service._client = httpx.AsyncClient(transport=httpx.MockTransport(stub.handler))
+    github_service._host_slots.clear()
+    github_rate_limiter._budgets.clear()
+    github_cache._pending.clear()
+    github_cache._touched.clear()
+    yield stub
+    github_service._client = None
+    github_service._host_slots.clear()
+
+
+@pytest.fixture
+def make_user(db):
+    """Factory for users with a GitHub token"""
+    def make(username: str = "octocat", **values) -> User:
+        user = User(
+            github_id=values.pop("github_id", abs(hash(username)) % 10**8),
+            github_username=username,
+            portfolio_username=username,
+            access_token=values.pop("access_token", f"token-{username}"),
+            **values,
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+    return make
@@ -0,0 +1,45 @@
+import pytest
+
+from app.services.demo_url import DemoUrlDetector
+
+HOSTS = ["vercel.app", "netlify.app", "github.io"]
+
+
+@pytest.mark.parametrize("readme, expected", [
+    # The earliest host in the list wins, wherever it appears
+    ("https://a.github.io and https://b.netlify.app", "https://b.netlify.app"),
+    ("Deployed at HTTP://A.VERCEL.APP/path", "HTTP://A.VERCEL.APP"),
+    ("[docs](https://a.netlify.app/guide)", "https://a.netlify.app"),
+    ("[demo](https://example.com/?next=https://a.github.io)", "https://a.github.io"),
+    ("https://a.vercel.app:3000/ready", "https://a.vercel.app"),
+    # Look-alikes and hosts in paths are not deployments
+    ("https://example.com/a.vercel.app", None),
+    ("https://a.vercel.application", None),
+    ("//a.vercel.app", None),
+    # Without a deployment host, the first demo/live/preview link
+    ("[Docs](https://docs.example.com) [Live preview](https://example.com/app)", "https://example.com/app"),
+    ("[Live demo](https://example.com) then https://a.github.io", "https://a.github.io"),
+])
+def test_readme_precedence(readme, expected):
+    assert DemoUrlDetector(HOSTS).detect(None, readme) == expected
+
+
+def test_matching_homepage_wins():
+    detector = DemoUrlDetector(HOSTS)
+
+    assert detector.detect("https://me.github.io/site", "https://a.vercel.app") == "https://me.github.io/site"
+    assert detector.detect("https://example.com", "https://a.vercel.app") == "https://a.vercel.app"
+
+
+@pytest.mark.parametrize("homepage", [
+    "javascript:alert(document.domain)//https://a.vercel.app",
+    "https://example.com/?next=https://a.vercel.app",
+    "https://a.vercel.app.example.com",
+    "ftp://a.vercel.app",
+    "https://vercel.app",
+])
+def test_homepage_must_be_on_a_deployment_host(homepage):
+    detector = DemoUrlDetector(HOSTS)
+
+    assert detector.detect(homepage, None) is None
+    assert detector.detect(homepage, "https://b.netlify.app") == "https://b.netlify.app"
@@ -0,0 +1,64 @@
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+from app.db.database import engine
+from app.models.github_cache import GitHubCacheEntry
+from app.services import github_cache as github_cache_module
+from app.services.github_cache import github_cache
+from app.services.github_service import github_service
+
+LANGUAGES_PATH = "/repos/octocat/hello/languages"
+
+
+def languages_route(request: httpx.Request) -> httpx.Response:
+    if request.headers.get("if-none-match") == '"v1"':
+        return httpx.Response(304)
+    return httpx.Response(200, json={"Python": 100}, headers={"ETag": '"v1"'})
+
+
+@pytest.fixture
+def commits():
+    """Commits on the app engine while the test runs"""
+    seen = []
+
+    def record(connection):
+        seen.append(connection)
+
+    event.listen(engine, "commit", record)
+    yield seen
+    event.remove(engine, "commit", record)
+
+
+def test_cache_writes_are_buffered_until_flush(db, github, commits):
+    github.add("GET", LANGUAGES_PATH, languages_route)
+
+    first = asyncio.run(github_service.get_repo_languages("token", "octocat", "hello"))
+    second = asyncio.run(github_service.get_repo_languages("token", "octocat", "hello"))
+    assert first == second == {"Python": 100}
+    # The second request revalidated against the buffered entry
+    assert github.requests[1].headers["if-none-match"] == '"v1"'
+    assert commits == []
+
+    assert github_cache.flush() == 1
+    assert len(commits) == 1
+    assert db.query(GitHubCacheEntry).count() == 1
+
+
+def test_cache_read_failure_is_a_miss_not_empty_data(db, github, monkeypatch):
+    github.add("GET", LANGUAGES_PATH, languages_route)
+
+    class LockedSession:
+        def query(self, *entities):
+            raise RuntimeError("database is locked")
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(github_cache_module, "SessionLocal", LockedSession)
+    languages = asyncio.run(github_service.get_repo_languages("token", "octocat", "hello"))
+
+    assert languages == {"Python": 100}
+    assert "if-none-match" not in github.requests[0].headers
@@ -0,0 +1,99 @@
+import asyncio
+import base64
+
+from app.core.config import settings
+from app.models.project import Project
+from app.services.github_graphql import github_graphql_service
+from app.services.project_sync import sync_user_projects
+from app.services.readme_store import load_readmes
+
+from conftest import load_fixture
+
+
+def serve_fixtures(github) -> None:
+    """Recorded REST and GraphQL responses for the same five repos"""
+    github.json("GET", "/users/octocat/repos", load_fixture("github/rest_repos.json"))
+    for name, enrichment in load_fixture("github/rest_enrichment.json").items():
+        github.json("GET", f"/repos/octocat/{name}/languages", enrichment["languages"])
+        if enrichment["readme"] is not None:
+            github.json("GET", f"/repos/octocat/{name}/readme", {
+                "content": base64.b64encode(enrichment["readme"].encode()).decode(),
+            })
+    github.json("POST", "/graphql", load_fixture("github/graphql_repos.json"))
+
+
+def sync_with(engine: str, db, user, monkeypatch) -> dict:
+    """Stored project data after a full sync with one engine, keyed by repo id"""
+    monkeypatch.setattr(settings, "GITHUB_SYNC_ENGINE", engine)
+    rows = asyncio.run(sync_user_projects(user, db, full=True))
+    projects = db.query(Project).all()
+    readmes = load_readmes(db, [p.id for p in projects])
+    return {
+        "rows": {
+            row["github_id"]: {key: value for key, value in row.items() if key != "updated_at"}
+            for row in rows
+        },
+        "readmes": {p.github_id: readmes.get(p.id) for p in projects},
+    }
+
+
+def test_engines_store_identical_projects(db, github, make_user, monkeypatch):
+    serve_fixtures(github)
+    user = make_user()
+
+    rest = sync_with("rest", db, user, monkeypatch)
+    db.query(Project).delete()
+    db.commit()
+    graphql = sync_with("graphql", db, user, monkeypatch)
+
+    assert graphql == rest
+    assert rest["readmes"] == {
+        101: "# Alpha\n\nA command line tool. Try the [live demo](https://alpha.vercel.app).",
+        102: "# Beta\n\nDocs live in docs/.",
+        103: "# Gamma\n\nShown from .github.",
+        104: "Delta is a *small* crate.",
+        105: None,
+    }
+    assert rest["rows"][101]["deployed_url"] == "https://alpha.vercel.app"
+
+
+def test_graphql_falls_back_to_rest_only_for_readmes_it_cannot_inline(db, github, make_user, monkeypatch):
+    serve_fixtures(github)
+    monkeypatch.setattr(settings, "GITHUB_SYNC_ENGINE", "graphql")
+
+    asyncio.run(sync_user_projects(make_user(), db))
+
+    assert github.paths("POST") == ["/graphql"]
+    assert sorted(github.paths("GET")) == [
+        "/repos/octocat/beta/readme",
+        "/repos/octocat/delta/readme",
+        "/repos/octocat/gamma/readme",
+    ]
+
+
+def test_graphql_truncated_readme_falls_back_to_rest(db, github, make_user, monkeypatch):
+    serve_fixtures(github)
+    response = load_fixture("github/graphql_repos.json")
+    alpha = response["data"]["user"]["repositories"]["nodes"][0]
+    # Oversized blobs come back cut short and flagged
+    alpha["readme"] = {"text": "# Alpha\n\nA command", "isTruncated": True, "isBinary": False}
+    github.json("POST", "/graphql", response)
+    user = make_user()
+
+    graphql = sync_with("graphql", db, user, monkeypatch)
+
+    assert "/repos/octocat/alpha/readme" in github.paths("GET")
+    assert graphql["readmes"][101] == load_fixture("github/rest_enrichment.json")["alpha"]["readme"]
+    assert graphql["rows"][101]["deployed_url"] == "https://alpha.vercel.app"
+
+
+def test_graphql_node_maps_to_rest_shape():
+    node = load_fixture("github/graphql_repos.json")["data"]["user"]["repositories"]["nodes"][0]
+    repo = github_graphql_service._to_rest_shape(node)
+    rest = load_fixture("github/rest_repos.json")[0]
+
+    for key in ("id", "name", "description", "html_url", "homepage", "stargazers_count",
+                "forks_count", "watchers_count", "archived", "fork", "pushed_at", "topics"):
+        assert repo[key] == rest[key], key
+    assert repo["languages"] == {"Python": 1200, "Shell": 300}
+    assert repo["readme_fallback"] is False
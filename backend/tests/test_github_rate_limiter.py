@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.github_rate_limiter import GitHubRateLimitError, github_rate_limiter
+from app.services.github_service import github_service
+
+TOKEN = "token-octocat"
+URL = "https://api.github.com/user"
+
+
+def budget_headers(remaining: int, reset_in: float) -> dict:
+    return {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(time.time() + reset_in),
+        "X-RateLimit-Resource": "core",
+    }
+
+
+def request(**kwargs) -> httpx.Response:
+    return asyncio.run(github_service._request("GET", URL, TOKEN, **kwargs))
+
+
+def replies(github, *responses: httpx.Response) -> None:
+    """Serve GET /user with the given responses in turn"""
+    queue = list(responses)
+    github.add("GET", "/user", lambda request: queue.pop(0))
+
+
+def test_background_request_waits_for_budget_beyond_the_reserve(github):
+    replies(
+        github,
+        httpx.Response(200, json={}, headers=budget_headers(github_rate_limiter.reserve, 0.3)),
+        httpx.Response(200, json={}),
+    )
+    request()
+
+    started = time.monotonic()
+    request()
+
+    assert time.monotonic() - started >= 0.2
+    assert github_rate_limiter.throttled >= 1
+
+
+def test_interactive_request_uses_the_reserve(github, monkeypatch):
+    monkeypatch.setattr(github_rate_limiter, "max_wait", 1.0)
+    replies(
+        github,
+        httpx.Response(200, json={}, headers=budget_headers(github_rate_limiter.reserve, 30)),
+        httpx.Response(200, json={}),
+    )
+    request()
+
+    started = time.monotonic()
+    assert request(background=False).status_code == 200
+    assert time.monotonic() - started < 0.2
+    with pytest.raises(GitHubRateLimitError):
+        request()
+
+
+@pytest.mark.parametrize("limited", [
+    httpx.Response(429, json={}, headers={"Retry-After": "0"}),
+    httpx.Response(403, json={"message": "You have exceeded a secondary rate limit"}, headers={"Retry-After": "0"}),
+])
+def test_rate_limited_response_is_retried(github, limited):
+    replies(github, limited, httpx.Response(200, json={"login": "octocat"}))
+
+    response = request()
+
+    assert response.json() == {"login": "octocat"}
+    assert github.paths() == ["/user", "/user"]
+
+
+def test_permission_error_is_not_retried(github):
+    replies(github, httpx.Response(403, json={"message": "Resource not accessible"}))
+
+    assert request().status_code == 403
+    assert github.paths() == ["/user"]
+
+
+def test_wait_beyond_max_wait_raises(github, monkeypatch):
+    monkeypatch.setattr(github_rate_limiter, "max_wait", 1.0)
+    replies(github, httpx.Response(403, json={}, headers=budget_headers(0, 600)))
+
+    with pytest.raises(GitHubRateLimitError) as error:
+        request()
+
+    assert error.value.retry_after > 500
+    assert github.paths() == ["/user"]
+    assert github_rate_limiter.rejected >= 1
@@ -0,0 +1,156 @@
+import asyncio
+import hashlib
+import hmac
+import os
+import time
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.main import app
+from app.models.project import Project
+from app.services.github_webhooks import github_webhook_buffer
+from app.services.project_sync import repo_to_project_row, upsert_project_rows
+from app.services.readme_store import load_readmes
+
+from conftest import FIXTURES_DIR, rest_repo, serve_repo
+
+SECRET = "webhook-secret"
+DEBOUNCE = 0.05
+
+
+def recorded(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, "webhooks", name), "rb") as f:
+        return f.read()
+
+
+async def replay(recording, secret: str = SECRET):
+    """POST recorded payloads to /webhooks/github after the given delays, then wait for the buffer to drain.
+
+    `recording` is a list of (delay in seconds, event name, fixture file).
+    """
+    responses = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        for delay, event, name in recording:
+            await asyncio.sleep(delay)
+            body = recorded(name)
+            signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+            responses.append(await client.post("/webhooks/github", content=body, headers={
+                "X-GitHub-Event": event,
+                "X-Hub-Signature-256": f"sha256={signature}",
+                "Content-Type": "application/json",
+            }))
+    task = github_webhook_buffer._flush_task
+    if task is not None and not task.done():
+        await task
+    return responses
+
+
+@pytest.fixture
+def alpha(db, make_user, monkeypatch):
+    """Stored project for the repo in the recorded payloads"""
+    monkeypatch.setattr(settings, "GITHUB_WEBHOOK_SECRET", SECRET)
+    monkeypatch.setattr(github_webhook_buffer, "debounce", DEBOUNCE)
+    github_webhook_buffer._pending.clear()
+
+    user = make_user()
+    repo = rest_repo(101, "alpha", "2024-05-01T00:00:00Z", stargazers_count=1)
+    upsert_project_rows(db, [repo_to_project_row(user, repo, {"Python": 10}, "# Old")])
+    db.commit()
+    return user
+
+
+def stored(db) -> Project:
+    db.expire_all()
+    return db.query(Project).filter(Project.github_id == 101).one_or_none()
+
+
+def test_push_refreshes_readme_and_languages(db, github, alpha):
+    serve_repo(github, "alpha", {"Python": 40}, "# New")
+
+    [response] = asyncio.run(replay([(0, "push", "push.json")]))
+
+    assert response.json() == {"message": "Event queued"}
+    project = stored(db)
+    assert project.languages == {"Python": 40}
+    assert load_readmes(db, [project.id]) == {project.id: "# New"}
+    assert project.github_pushed_at.isoformat() == "2024-06-01T09:30:00"
+
+
+def test_event_during_flush_is_applied(db, github, alpha):
+    async def slow_languages(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, json={"Python": 40})
+
+    serve_repo(github, "alpha", {}, "# New")
+    github.add("GET", "/repos/octocat/alpha/languages", slow_languages)
+
+    # The star arrives while the push batch is waiting on GitHub
+    asyncio.run(replay([(0, "push", "push.json"), (DEBOUNCE + 0.03, "star", "star_created.json")]))
+
+    project = stored(db)
+    assert project.stars == 3
+    assert load_readmes(db, [project.id]) == {project.id: "# New"}
+
+
+def test_repo_is_applied_once_it_has_been_quiet(db, github, alpha, monkeypatch):
+    flushes = []
+    flush = github_webhook_buffer.flush
+
+    async def record_flush(repo_ids=None):
+        flushes.append(time.monotonic())
+        return await flush(repo_ids)
+
+    monkeypatch.setattr(github_webhook_buffer, "flush", record_flush)
+    events = []
+    add = github_webhook_buffer.add
+
+    def record_add(event, payload):
+        events.append(time.monotonic())
+        return add(event, payload)
+
+    monkeypatch.setattr(github_webhook_buffer, "add", record_add)
+
+    asyncio.run(replay([
+        (0, "star", "star_created.json"),
+        (DEBOUNCE * 0.8, "star", "star_created_again.json"),
+    ]))
+
+    assert len(flushes) == 1
+    assert flushes[0] - events[-1] >= DEBOUNCE
+    assert stored(db).stars == 4
+
+
+def test_star_keeps_stored_watermark_and_readme(db, github, alpha):
+    asyncio.run(replay([(0, "star", "star_created.json")]))
+
+    project = stored(db)
+    assert project.stars == 3
+    assert project.languages == {"Python": 10}
+    assert load_readmes(db, [project.id]) == {project.id: "# Old"}
+    # The payload's pushed_at is newer, but the README was not re-fetched
+    assert project.github_pushed_at.isoformat() == "2024-05-01T00:00:00"
+    assert github.requests == []
+
+
+def test_feature_branch_push_is_ignored(db, github, alpha):
+    [response] = asyncio.run(replay([(0, "push", "push_feature_branch.json")]))
+
+    assert response.json() == {"message": "Event ignored"}
+    assert github.requests == []
+    assert stored(db).stars == 1
+
+
+def test_repository_deleted_removes_project(db, github, alpha):
+    asyncio.run(replay([(0, "repository", "repository_deleted.json")]))
+
+    assert stored(db) is None
+
+
+def test_bad_signature_is_rejected(db, github, alpha):
+    [response] = asyncio.run(replay([(0, "star", "star_created.json")], secret="wrong"))
+
+    assert response.status_code == 403
+    assert stored(db).stars == 1
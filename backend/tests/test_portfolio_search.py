@@ -0,0 +1,101 @@
+import pytest
+
+from app.models.project import Project
+from app.models.skill import Skill
+from app.services import portfolio_search as portfolio_search_module
+from app.services.portfolio_search import portfolio_search
+from app.services.project_sync import repo_to_project_row, upsert_project_rows
+
+from conftest import rest_repo
+
+
+@pytest.fixture
+def indexed(db, make_user, monkeypatch):
+    """User with two synced projects; returns (user, {name: project id}, README loads)"""
+    user = make_user()
+    upsert_project_rows(db, [
+        repo_to_project_row(user, rest_repo(1, "alpha", "2024-01-01T00:00:00Z"), {"Rust": 10}, "# Alpha parser"),
+        repo_to_project_row(user, rest_repo(2, "beta", "2024-01-01T00:00:00Z"), {"Go": 10}, "# Beta server"),
+    ])
+    db.commit()
+    projects = dict(db.query(Project.name, Project.id))
+
+    loads = []
+    load_readmes = portfolio_search_module.load_readmes
+
+    def record_loads(session, project_ids):
+        loads.append(sorted(project_ids))
+        return load_readmes(session, project_ids)
+
+    monkeypatch.setattr(portfolio_search_module, "load_readmes", record_loads)
+    return user, projects, loads
+
+
+def found(db, query: str) -> set:
+    """(portfolio, project id) pairs matching `query`"""
+    return {
+        (result["portfolio_username"], match["project_id"])
+        for result in portfolio_search.search(db, query)["results"]
+        for match in result["matches"]
+    }
+
+
+def test_project_edit_reindexes_only_that_project(db, indexed):
+    user, projects, loads = indexed
+    project = db.get(Project, projects["alpha"])
+
+    project.description = "A fast tokenizer"
+    db.commit()
+
+    assert loads == [[projects["alpha"]]]
+    assert found(db, "tokenizer") == {("octocat", projects["alpha"])}
+    assert found(db, "server") == {("octocat", projects["beta"])}
+
+
+def test_profile_and_unsearched_edits_load_no_readmes(db, indexed):
+    user, projects, loads = indexed
+
+    user.bio = "Systems programmer"
+    db.get(Project, projects["beta"]).stars = 99
+    db.add(Skill(user_id=user.id, name="Kubernetes"))
+    db.commit()
+
+    assert loads == []
+    assert found(db, "kubernetes") == {("octocat", None)}
+
+
+def test_hidden_deleted_and_private_rows_leave_the_index(db, indexed):
+    user, projects, loads = indexed
+
+    db.get(Project, projects["alpha"]).is_visible = False
+    db.commit()
+    assert found(db, "parser") == set()
+
+    db.delete(db.get(Project, projects["beta"]))
+    db.commit()
+    assert found(db, "server") == set()
+
+    db.get(Project, projects["alpha"]).is_visible = True
+    db.commit()
+    user.is_public = False
+    db.commit()
+    assert found(db, "parser") == set()
+
+    user.is_public = True
+    db.commit()
+    assert found(db, "parser") == {("octocat", projects["alpha"])}
+
+
+def test_resync_reindexes_only_changed_repos(db, indexed):
+    user, projects, loads = indexed
+
+    upsert_project_rows(db, [
+        repo_to_project_row(user, rest_repo(1, "alpha", "2024-01-01T00:00:00Z", stargazers_count=5),
+                            {"Rust": 10}, "# Alpha parser"),
+        repo_to_project_row(user, rest_repo(2, "beta", "2024-02-01T00:00:00Z"), {"Go": 10}, "# Beta proxy"),
+    ])
+    db.commit()
+
+    assert loads == [[projects["beta"]]]
+    assert found(db, "proxy") == {("octocat", projects["beta"])}
+    assert found(db, "server") == set()
@@ -0,0 +1,39 @@
+from app.db.database import engine
+from app.models.project import Project
+from app.services import project_pagination
+from app.services.project_pagination import ProjectTotalCache
+
+
+def insert_project(user, github_id: int) -> None:
+    """Write that bypasses the app's sessions, as another worker process would"""
+    with engine.begin() as connection:
+        connection.execute(Project.__table__.insert().values(
+            user_id=user.id, github_id=github_id, name=f"repo-{github_id}", url="https://github.com/octocat/x",
+        ))
+
+
+def test_total_expires_after_ttl_without_a_version_bump(db, make_user, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(project_pagination.time, "monotonic", lambda: now[0])
+    totals = ProjectTotalCache(ttl=60.0)
+    user = make_user()
+    query = db.query(Project).filter(Project.user_id == user.id)
+    insert_project(user, 1)
+
+    assert totals.get(query, user.id, None) == 1
+    insert_project(user, 2)
+    now[0] += 59
+    assert totals.get(query, user.id, None) == 1
+    now[0] += 2
+    assert totals.get(query, user.id, None) == 2
+
+
+def test_total_is_recounted_after_a_session_commit(db, make_user):
+    totals = ProjectTotalCache(ttl=60.0)
+    user = make_user()
+    query = db.query(Project).filter(Project.user_id == user.id)
+
+    assert totals.get(query, user.id, None) == 0
+    db.add(Project(user_id=user.id, github_id=1, name="alpha", url="https://github.com/octocat/alpha"))
+    db.commit()
+    assert totals.get(query, user.id, None) == 1
@@ -0,0 +1,111 @@
+import asyncio
+import sqlite3
+
+import httpx
+
+from app.db.database import engine
+from app.models.project import Project
+from app.services.project_sync import sync_user_projects
+from app.services.readme_store import load_readmes
+
+from conftest import rest_repo, serve_repo
+
+
+def stored(db, name: str) -> Project:
+    db.expire_all()
+    return db.query(Project).filter(Project.name == name).one()
+
+
+def test_failed_enrichment_keeps_stored_data_and_watermark(db, github, make_user):
+    user = make_user()
+    github.json("GET", "/users/octocat/repos", [
+        rest_repo(1, "alpha", "2024-02-01T00:00:00Z"),
+        rest_repo(2, "beta", "2024-02-01T00:00:00Z"),
+    ])
+    serve_repo(github, "alpha", {"Rust": 500}, "# Alpha")
+    serve_repo(github, "beta", {"Go": 300}, "# Beta")
+    asyncio.run(sync_user_projects(user, db))
+
+    # alpha is pushed again, but GitHub fails while it is enriched
+    github.json("GET", "/users/octocat/repos", [
+        rest_repo(1, "alpha", "2024-03-01T00:00:00Z", stargazers_count=7),
+        rest_repo(2, "beta", "2024-02-01T00:00:00Z"),
+    ])
+    github.add("GET", "/repos/octocat/alpha/languages", httpx.Response(502))
+    asyncio.run(sync_user_projects(user, db))
+
+    alpha = stored(db, "alpha")
+    assert alpha.languages == {"Rust": 500}
+    assert load_readmes(db, [alpha.id]) == {alpha.id: "# Alpha"}
+    assert alpha.stars == 7
+    assert alpha.github_pushed_at.isoformat() == "2024-02-01T00:00:00"
+
+    # The next sync retries alpha and advances its watermark
+    serve_repo(github, "alpha", {"Rust": 900}, "# Alpha v2")
+    asyncio.run(sync_user_projects(user, db))
+
+    alpha = stored(db, "alpha")
+    assert alpha.languages == {"Rust": 900}
+    assert load_readmes(db, [alpha.id]) == {alpha.id: "# Alpha v2"}
+    assert alpha.github_pushed_at.isoformat() == "2024-03-01T00:00:00"
+
+
+def test_failed_enrichment_of_new_repo_is_not_stored(db, github, make_user):
+    user = make_user()
+    github.json("GET", "/users/octocat/repos", [rest_repo(1, "alpha", "2024-02-01T00:00:00Z")])
+    github.add("GET", "/repos/octocat/alpha/readme", httpx.Response(500))
+    github.json("GET", "/repos/octocat/alpha/languages", {"Rust": 500})
+
+    synced = asyncio.run(sync_user_projects(user, db))
+
+    assert synced == []
+    assert db.query(Project).count() == 0
+
+
+def test_repo_without_readme_is_not_a_failure(db, github, make_user):
+    user = make_user()
+    github.json("GET", "/users/octocat/repos", [rest_repo(1, "alpha", "2024-02-01T00:00:00Z")])
+    serve_repo(github, "alpha", {})
+
+    asyncio.run(sync_user_projects(user, db))
+
+    alpha = stored(db, "alpha")
+    assert alpha.languages == {}
+    assert alpha.github_pushed_at.isoformat() == "2024-02-01T00:00:00"
+
+
+def test_sync_holds_no_write_lock_while_fetching(db, github, make_user):
+    user = make_user()
+    next_page = "https://api.github.com/users/octocat/repos?page=2"
+    serve_repo(github, "alpha", {"Rust": 500}, "# Alpha")
+
+    lock_free = []
+
+    def languages_of_page_two(request: httpx.Request) -> httpx.Response:
+        # Another writer must get the database while the sync is fetching
+        connection = sqlite3.connect(engine.url.database, timeout=0)
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.rollback()
+            lock_free.append(True)
+        except sqlite3.OperationalError:
+            lock_free.append(False)
+        finally:
+            connection.close()
+        return httpx.Response(200, json={"Go": 300})
+
+    async def listing(request: httpx.Request) -> httpx.Response:
+        if request.url.params.get("page") == "2":
+            # Page one is fully enriched before page two arrives
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json=[rest_repo(2, "beta", "2024-02-01T00:00:00Z")])
+        return httpx.Response(200, json=[rest_repo(1, "alpha", "2024-02-01T00:00:00Z")],
+                              headers={"Link": f'<{next_page}>; rel="next"'})
+
+    github.add("GET", "/users/octocat/repos", listing)
+    github.add("GET", "/repos/octocat/beta/languages", languages_of_page_two)
+
+    synced = asyncio.run(sync_user_projects(user, db))
+
+    assert lock_free == [True]
+    assert sorted(row["name"] for row in synced) == ["alpha", "beta"]
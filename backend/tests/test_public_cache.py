@@ -0,0 +1,54 @@
+import pytest
+
+from app.models.project import Project
+from app.services.public_cache import public_cache
+
+from conftest import get
+
+
+@pytest.fixture
+def octocat(db, make_user):
+    user = make_user(bio="Builds tools")
+    db.add(Project(user_id=user.id, github_id=1, name="alpha", url="https://github.com/octocat/alpha"))
+    db.commit()
+    return user
+
+
+@pytest.mark.parametrize("path", ["/portfolio/octocat", "/users/octocat"])
+def test_matching_etag_gets_304(octocat, path):
+    first = get(path)
+    etag = first.headers["etag"]
+
+    not_modified = public_cache.not_modified
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}'):
+        response = get(path, headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    assert public_cache.not_modified == not_modified + 3
+
+    assert get(path, headers={"If-None-Match": '"other"'}).content == first.content
+
+
+def test_project_edit_changes_the_portfolio_etag(db, octocat):
+    first = get("/portfolio/octocat")
+
+    db.query(Project).filter(Project.user_id == octocat.id).one().description = "A parser"
+    db.commit()
+    response = get("/portfolio/octocat", headers={"If-None-Match": first.headers["etag"]})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != first.headers["etag"]
+    assert response.json()["projects"][0]["description"] == "A parser"
+
+
+def test_profile_edit_changes_the_profile_etag(db, octocat):
+    first = get("/users/octocat")
+
+    octocat.bio = "Builds compilers"
+    db.commit()
+    response = get("/users/octocat", headers={"If-None-Match": first.headers["etag"]})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != first.headers["etag"]
+    assert response.json()["bio"] == "Builds compilers"
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from app.models.education import Education
+from app.models.experience import Experience
+from app.models.media import Media
+from app.models.project import Project
+from app.models.skill import Skill
+from app.services.portfolio_snapshots import build_portfolio
+
+from conftest import get, recorded_queries
+
+
+def populate(db, user, size: int) -> None:
+    """`size` rows in every portfolio section, each project with its own media"""
+    started = datetime(2020, 1, 1)
+    for i in range(size):
+        project = Project(
+            user_id=user.id, github_id=i, name=f"repo-{i}", url=f"https://github.com/octocat/repo-{i}",
+            languages={"Python": 100 + i}, stars=i,
+        )
+        db.add(project)
+        db.flush()
+        db.add_all([
+            Media(user_id=user.id, project_id=project.id, filename=f"{i}.png", file_path=f"/{i}.png", media_type="screenshot"),
+            Media(user_id=user.id, filename=f"p{i}.png", file_path=f"/p{i}.png", media_type="screenshot"),
+            Experience(user_id=user.id, title=f"Role {i}", company="Acme", start_date=started),
+            Education(user_id=user.id, school=f"School {i}", degree="BSc", start_date=started),
+            Skill(user_id=user.id, name=f"skill-{i}"),
+        ])
+    db.commit()
+
+
+def test_build_portfolio_query_count_does_not_grow(db, make_user):
+    small, large = make_user("small"), make_user("large")
+    populate(db, small, 1)
+    populate(db, large, 40)
+
+    counts = []
+    for user_id in (small.id, large.id):
+        with recorded_queries() as statements:
+            _, document = build_portfolio(db, user_id)
+        counts.append(len(statements))
+        assert len(document["projects"]) == len(document["skills"])
+
+    assert counts[0] == counts[1] <= 7
+
+
+def test_portfolio_endpoint_query_count_does_not_grow(db, make_user):
+    small, large = make_user("small"), make_user("large")
+    populate(db, small, 1)
+    populate(db, large, 40)
+
+    usernames = (small.portfolio_username, large.portfolio_username)
+    for path in ("/portfolio/{}", "/portfolio/{}?sort=stars&fields=name,stars,media"):
+        counts = []
+        for username in usernames:
+            with recorded_queries() as statements:
+                response = get(path.format(username))
+            assert response.status_code == 200
+            counts.append(len(statements))
+        assert counts[0] == counts[1], path
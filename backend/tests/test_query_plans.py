@@ -0,0 +1,121 @@
+import re
+from datetime import datetime
+from typing import List
+
+import pytest
+
+from app.core.security import create_access_token
+from app.db.database import engine
+from app.main import app
+from app.models.education import Education
+from app.models.experience import Experience
+from app.models.media import Media
+from app.models.project import Project
+from app.models.skill import Skill
+from app.models.sync_job import SyncJob
+from app.services.project_pagination import encode_cursor
+from app.services.readme_store import save_readmes
+
+from conftest import get, recorded_queries
+
+
+@pytest.fixture
+def octocat(db, make_user):
+    """User with a few projects, READMEs, media, profile rows and a sync job; returns (user id, token, a project id, the job id)"""
+    user = make_user(resume_raw="Rust developer")
+    for i in range(5):
+        project = Project(
+            user_id=user.id, github_id=i, name=f"repo-{i}", url=f"https://github.com/octocat/repo-{i}",
+            stars=i % 2, status="code_only", readme_excerpt="A rust tool",
+        )
+        db.add(project)
+        db.flush()
+        save_readmes(db, {project.id: "# A rust tool"})
+        db.add(Media(user_id=user.id, project_id=project.id, filename="s.png", file_path="/s.png", media_type="screenshot"))
+    started = datetime(2020, 1, 1)
+    job = SyncJob(user_id=user.id)
+    db.add_all([
+        Skill(user_id=user.id, name="rust"),
+        Experience(user_id=user.id, title="Engineer", company="Acme", start_date=started),
+        Education(user_id=user.id, school="School", degree="BSc", start_date=started),
+        job,
+    ])
+    db.commit()
+    return user.id, create_access_token({"sub": str(user.id)}), project.id, job.id
+
+
+def query_plans(path: str, token: str) -> List[tuple]:
+    """(statement, plan lines) for every SELECT the request runs"""
+    with recorded_queries() as statements:
+        assert get(path, token).status_code == 200, path
+    plans = []
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            if statement.lstrip().upper().startswith("SELECT"):
+                rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                plans.append((statement, [row[3] for row in rows]))
+    return plans
+
+
+# Endpoint -> index its main query must search; "{project}", "{job}" and "{cursor}" are filled in
+ENDPOINTS = {
+    "/portfolio/octocat": "ix_portfolio_snapshots_portfolio_username",
+    "/portfolio/octocat?sort=stars&limit_projects=2": "ix_projects_user_stars",
+    "/users/octocat": "ix_users_portfolio_username",
+    "/users/me": "SEARCH users USING INTEGER PRIMARY KEY",
+    "/users/me/rate-limit": "SEARCH users USING INTEGER PRIMARY KEY",
+    "/projects": "ix_projects_user_id_id",
+    "/projects?sort=stars&limit=2": "ix_projects_user_stars",
+    "/projects?sort=stars&limit=2&cursor={cursor}": "ix_projects_user_stars",
+    "/projects?sort=updated_at&limit=2": "ix_projects_user_updated",
+    "/projects?status_filter=code_only": "ix_projects_user_status",
+    "/projects/{project}": "SEARCH projects USING INTEGER PRIMARY KEY",
+    "/projects/{project}/readme": "SEARCH project_readmes USING INTEGER PRIMARY KEY",
+    "/projects/sync/{job}": "SEARCH sync_jobs USING INTEGER PRIMARY KEY",
+    "/users/me/experience": "ix_experiences_user_id",
+    "/users/me/education": "ix_education_user_id",
+    "/users/me/skills": "ix_skills_user_id",
+    "/resume/text": "SEARCH users USING INTEGER PRIMARY KEY",
+    "/search?q=rust": "VIRTUAL TABLE",
+}
+
+# GET routes that run no database query of their own
+NO_QUERIES = {"/", "/health", "/auth/login", "/auth/callback"}
+
+
+def route_of(path: str, routes: List[str]) -> str:
+    """Route template serving a concrete path; literal routes win over parameterized ones"""
+    path = path.split("?", 1)[0]
+    if path in routes:
+        return path
+    for route in routes:
+        if re.fullmatch(re.sub(r"\{[^}]+\}", "[^/]+", route), path):
+            return route
+    return path
+
+
+def test_every_get_route_is_covered():
+    routes = [path for path, operations in app.openapi()["paths"].items() if "get" in operations]
+
+    covered = {route_of(path.format(project=1, job=1, cursor="c"), routes) for path in ENDPOINTS}
+
+    assert set(routes) - NO_QUERIES == covered
+
+
+@pytest.mark.parametrize("path, index", ENDPOINTS.items())
+def test_endpoint_queries_search_indexes(db, octocat, path, index):
+    user_id, token, project_id, job_id = octocat
+    last = db.query(Project).filter(Project.user_id == user_id).order_by(Project.id).first()
+    path = path.format(project=project_id, job=job_id, cursor=encode_cursor("stars", last))
+
+    plans = query_plans(path, token)
+
+    assert any(index in line for _, plan in plans for line in plan), plans
+    for statement, plan in plans:
+        for line in plan:
+            # FTS5 tables are always "scanned" through their own index and ranked with a sort
+            if "portfolio_search" in statement:
+                continue
+            assert not line.startswith("SCAN"), (statement, plan)
+            # Keyset orders come from the index; only tie-breaks may need a sort
+            assert "TEMP B-TREE FOR ORDER BY" not in line, (statement, plan)
@@ -0,0 +1,40 @@
+from app.services.readme_renderer import readme_renderer
+
+
+def test_emphasis_markers_in_link_urls_are_left_alone():
+    html = readme_renderer.render("[click](https://x.com/_a_b_) and **bold**")
+
+    assert '<a href="https://x.com/_a_b_" rel="nofollow noopener">click</a>' in html
+    assert "<strong>bold</strong>" in html
+    assert "<em>" not in html
+
+
+def test_placeholder_like_text_renders():
+    text = "Nul \x000\x00 and \x007\x00 bytes `code`"
+
+    assert "<code>code</code>" in readme_renderer.render(text)
+    assert readme_renderer.excerpt(text).endswith("bytes code")
+
+
+def test_unsafe_markup_is_dropped():
+    html = readme_renderer.render(
+        '<p align="center"><img src="logo.png" width="120" onerror="alert(1)"></p>\n\n'
+        '<script>alert(1)</script>\n\n'
+        '[home](javascript:alert(1)) <a href="javascript:alert(2)">raw</a>'
+    )
+
+    assert '<p align="center"><img src="logo.png" width="120"></p>' in html
+    assert "<script" not in html
+    assert "onerror" not in html
+    assert 'href="javascript' not in html
+
+
+def test_excerpt_uses_top_level_paragraphs():
+    text = (
+        "# Title\n\n![badge](https://img.shields.io/x.svg)\n\n"
+        "A *small* tool <script>track()</script>for [links](https://example.com).\n\n"
+        "- not a list item\n\n> nor a quote\n\n```\nnor code\n```\n\nLast words."
+    )
+
+    assert readme_renderer.excerpt(text) == "A small tool for links. Last words."
+    assert readme_renderer.excerpt("word " * 100, length=20) == "word word word word…"
@@ -0,0 +1,44 @@
+from app.models.project import Project
+from app.services.project_sync import repo_to_project_row, upsert_project_rows
+from app.services.static_export import StaticPortfolioExporter
+
+from conftest import rest_repo
+
+SCRIPT_HOMEPAGE = "javascript:alert(document.domain)//https://a.vercel.app"
+
+
+def export_page(tmp_path, username: str = "octocat") -> str:
+    StaticPortfolioExporter(str(tmp_path)).export()
+    return (tmp_path / username / "index.html").read_text()
+
+
+def test_script_urls_are_not_exported_as_links(db, make_user, tmp_path):
+    user = make_user(is_public=True)
+    db.add_all([
+        Project(user_id=user.id, github_id=1, name="alpha", url="https://github.com/octocat/alpha",
+                homepage=SCRIPT_HOMEPAGE, deployed_url=SCRIPT_HOMEPAGE, is_deployed=True),
+        Project(user_id=user.id, github_id=2, name="beta", url="javascript:alert(1)"),
+        Project(user_id=user.id, github_id=3, name="gamma", url="https://github.com/octocat/gamma",
+                deployed_url="https://gamma.vercel.app"),
+    ])
+    db.commit()
+
+    page = export_page(tmp_path)
+
+    assert "javascript:" not in page
+    assert '<a href="https://github.com/octocat/alpha">alpha</a>' in page
+    assert "<li>beta" in page
+    assert '<a href="https://gamma.vercel.app">gamma</a>' in page
+
+
+def test_synced_script_homepage_is_not_exported(db, make_user, tmp_path):
+    user = make_user(is_public=True)
+    upsert_project_rows(db, [repo_to_project_row(
+        user, rest_repo(1, "alpha", "2024-01-01T00:00:00Z", homepage=SCRIPT_HOMEPAGE), {"JavaScript": 10}, None,
+    )])
+    db.commit()
+
+    page = export_page(tmp_path)
+
+    assert "javascript:" not in page
+    assert '<a href="https://github.com/octocat/alpha">alpha</a>' in page
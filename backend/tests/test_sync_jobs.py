@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.models.sync_job import SyncJob
+from app.services import sync_jobs as sync_jobs_module
+from app.services.portfolio_snapshots import portfolio_snapshots
+from app.services.resync_scheduler import resync_scheduler
+from app.services.sync_jobs import sync_job_queue
+
+from conftest import rest_repo, serve_repo
+
+
+def test_progress_is_recorded_without_committing_the_sync(db, github, make_user, monkeypatch):
+    user = make_user()
+    github.json("GET", "/users/octocat/repos", [
+        rest_repo(i, f"repo-{i}", "2024-02-01T00:00:00Z") for i in range(1, 6)
+    ])
+    for i in range(1, 6):
+        serve_repo(github, f"repo-{i}", {"Python": i}, f"# Repo {i}")
+
+    progress = []
+    write_progress = sync_job_queue._write_progress
+
+    def record_progress(job_id, **values):
+        progress.append(values)
+        write_progress(job_id, **values)
+
+    rebuilds = []
+    rebuild = portfolio_snapshots.rebuild
+
+    def record_rebuild(user_ids, tech_stack_user_ids=(), stale_search=None):
+        rebuilds.append(set(user_ids))
+        rebuild(user_ids, tech_stack_user_ids, stale_search)
+
+    monkeypatch.setattr(sync_job_queue, "_write_progress", record_progress)
+    monkeypatch.setattr(portfolio_snapshots, "rebuild", record_rebuild)
+    monkeypatch.setattr(sync_jobs_module.SyncJobQueue, "PROGRESS_INTERVAL", 0.0)
+
+    job = sync_job_queue.enqueue(db, user, dispatch=False)
+    assert asyncio.run(sync_job_queue.run_job(job.id)) == "completed"
+
+    assert progress[-1] == {"repos_done": 5, "repos_total": 5}
+    # Snapshots are rebuilt once, for the sync's final commit
+    assert rebuilds == [{user.id}]
+    db.expire_all()
+    job = db.query(SyncJob).filter(SyncJob.id == job.id).one()
+    assert (job.repos_done, job.repos_total, job.synced_count) == (5, 5, 5)
+
+
+def test_job_is_claimed_by_one_worker(db, github, make_user):
+    user = make_user()
+    github.json("GET", "/users/octocat/repos", [rest_repo(1, "alpha", "2024-02-01T00:00:00Z")])
+    serve_repo(github, "alpha", {"Rust": 1}, "# Alpha")
+    job = sync_job_queue.enqueue(db, user, dispatch=False)
+
+    async def race():
+        return await asyncio.gather(sync_job_queue.run_job(job.id), sync_job_queue.run_job(job.id))
+
+    assert set(asyncio.run(race())) == {"completed", None}
+    assert github.paths().count("/users/octocat/repos") == 1
+
+
+def running_job(db, user, seconds_since_heartbeat: float) -> SyncJob:
+    job = SyncJob(user_id=user.id, status="running")
+    db.add(job)
+    db.commit()
+    db.query(SyncJob).filter(SyncJob.id == job.id).update({
+        SyncJob.updated_at: datetime.utcnow() - timedelta(seconds=seconds_since_heartbeat),
+    })
+    db.commit()
+    return job
+
+
+def test_enqueue_reclaims_a_job_whose_heartbeat_stopped(db, make_user):
+    user = make_user()
+    dead = running_job(db, user, settings.SYNC_JOB_STALE_AFTER + 60)
+
+    job = sync_job_queue.enqueue(db, user, dispatch=False)
+
+    assert job.id != dead.id
+    assert job.status == "queued"
+    db.refresh(dead)
+    assert dead.status == "failed"
+    assert dead.finished_at is not None
+
+
+def test_start_leaves_live_running_jobs_alone(db, make_user, monkeypatch):
+    dispatched = []
+    monkeypatch.setattr(sync_job_queue, "workers", 0)
+    monkeypatch.setattr(sync_job_queue, "_queue", None)
+    live = running_job(db, make_user("live"), 5)
+    dead = running_job(db, make_user("dead"), settings.SYNC_JOB_STALE_AFTER + 60)
+    queued = sync_job_queue.enqueue(db, make_user("queued"), dispatch=False)
+
+    async def start():
+        await sync_job_queue.start()
+        while not sync_job_queue._queue.empty():
+            dispatched.append(sync_job_queue._queue.get_nowait())
+    asyncio.run(start())
+
+    assert dispatched == [queued.id]
+    db.expire_all()
+    assert (live.status, dead.status) == ("running", "failed")
+
+
+def test_enqueue_coalesces_with_a_live_job(db, make_user):
+    user = make_user()
+    live = running_job(db, user, 5)
+
+    assert sync_job_queue.enqueue(db, user, dispatch=False).id == live.id
+
+
+def test_scheduler_resyncs_user_left_behind_by_a_killed_run(db, github, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "RESYNC_JITTER", 0.0)
+    user = make_user()
+    dead = running_job(db, user, settings.SYNC_JOB_STALE_AFTER + 60)
+    github.json("GET", "/users/octocat/repos", [rest_repo(1, "alpha", "2024-02-01T00:00:00Z")])
+    serve_repo(github, "alpha", {"Rust": 1}, "# Alpha")
+
+    metrics = asyncio.run(resync_scheduler.run_once())
+
+    assert (metrics["synced"], metrics["failed"]) == (1, 0)
+    db.refresh(dead)
+    assert dead.status == "failed"
+    assert db.query(SyncJob).filter(SyncJob.status == "completed").count() == 1
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from app.models.project import Project
+from app.services.project_sync import sync_user_projects
+from app.services.tech_stack import tech_stack
+
+from conftest import get, rest_repo, serve_repo
+
+
+def sync(github, user, db, repos: dict) -> None:
+    """Sync repos given as {name: (github id, pushed_at, languages)}"""
+    github.json("GET", "/users/octocat/repos", [
+        rest_repo(github_id, name, pushed_at) for name, (github_id, pushed_at, _) in repos.items()
+    ])
+    for name, (_, _, languages) in repos.items():
+        serve_repo(github, name, languages, f"# {name}")
+    asyncio.run(sync_user_projects(user, db))
+
+
+def section() -> dict:
+    response = get("/portfolio/octocat")
+    assert response.status_code == 200
+    return response.json()["tech_stack"]
+
+
+@pytest.fixture
+def refreshes(monkeypatch):
+    """User ids of each tech stack refresh that had any"""
+    calls = []
+    refresh = tech_stack.refresh
+
+    def record(db, user_ids):
+        user_ids = set(user_ids)
+        if user_ids:
+            calls.append(user_ids)
+        return refresh(db, user_ids)
+
+    monkeypatch.setattr(tech_stack, "refresh", record)
+    return calls
+
+
+def test_sync_builds_the_tech_stack_section(db, github, make_user):
+    user = make_user()
+    sync(github, user, db, {
+        "alpha": (1, "2024-02-01T00:00:00Z", {"Rust": 600, "Python": 200}),
+        "beta": (2, "2024-02-01T00:00:00Z", {"Rust": 200}),
+    })
+
+    assert section() == {
+        "total_bytes": 1000,
+        "languages": [
+            {"language": "Rust", "bytes": 800, "share": 0.8, "project_count": 2},
+            {"language": "Python", "bytes": 200, "share": 0.2, "project_count": 1},
+        ],
+        "other": {"bytes": 0, "share": 0.0, "language_count": 0},
+    }
+    assert tech_stack.get(db, user.id, top_n=1)["other"] == {"bytes": 200, "share": 0.2, "language_count": 1}
+
+
+def test_resync_refreshes_only_when_languages_change(db, github, make_user, refreshes):
+    user = make_user()
+    repos = {
+        "alpha": (1, "2024-02-01T00:00:00Z", {"Rust": 600, "Python": 200}),
+        "beta": (2, "2024-02-01T00:00:00Z", {"Rust": 200}),
+    }
+    sync(github, user, db, repos)
+    assert section()["total_bytes"] == 1000
+    refreshes.clear()
+
+    # Pushed again with the same languages: no refresh
+    repos["beta"] = (2, "2024-03-01T00:00:00Z", {"Rust": 200})
+    sync(github, user, db, repos)
+    assert refreshes == []
+
+    # Pushed with a new language mix
+    repos["alpha"] = (1, "2024-04-01T00:00:00Z", {"Go": 900})
+    sync(github, user, db, repos)
+    assert refreshes == [{user.id}]
+    assert section() == {
+        "total_bytes": 1100,
+        "languages": [
+            {"language": "Go", "bytes": 900, "share": 0.8182, "project_count": 1},
+            {"language": "Rust", "bytes": 200, "share": 0.1818, "project_count": 1},
+        ],
+        "other": {"bytes": 0, "share": 0.0, "language_count": 0},
+    }
+
+
+def test_hidden_project_leaves_the_tech_stack(db, github, make_user):
+    user = make_user()
+    sync(github, user, db, {
+        "alpha": (1, "2024-02-01T00:00:00Z", {"Rust": 600}),
+        "beta": (2, "2024-02-01T00:00:00Z", {"Go": 400}),
+    })
+
+    db.query(Project).filter(Project.name == "beta").one().is_visible = False
+    db.commit()
+
+    assert [row["language"] for row in section()["languages"]] == ["Rust"]
@@ -18,7 +18,7 @@ interface Project {
   name: string;
   description?: string;
   url: string;
-  status: 'deployed' | 'code_only' | 'in_progress';
+  status: 'deployed' | 'code_only' | 'in_progress' | 'library' | 'stale' | 'archived';
   deployed_url?: string;
   languages?: Record<string, number>;
 }
@@ -148,6 +148,9 @@ export default function ProjectsPage() {
                       <option value="deployed">Deployed</option>
                       <option value="code_only">Code Only</option>
                       <option value="in_progress">In Progress</option>
+                      <option value="library">Library</option>
+                      <option value="stale">Stale</option>
+                      <option value="archived">Archived</option>
                     </select>
                   </div>
                   <Input
@@ -95,7 +95,7 @@ export default function PublicPortfolioPage() {
               {portfolio.projects.map((project) => (
                 <Card key={project.id}>
                   <h3 className="text-lg font-bold mb-2">{project.name}</h3>
-                  <p className="text-gray-600 text-sm mb-3">{project.description}</p>
+                  <p className="text-gray-600 text-sm mb-3">{project.description || project.readme_excerpt}</p>
                   {project.languages && (
                     <div className="flex flex-wrap gap-2 mb-3">
                       {Object.keys(project.languages).map((lang) => (
@@ -94,9 +94,23 @@ export const deleteSkill = async (id: number) => {
 };
 
 // Projects
-export const syncProjects = async () => {
-  const response = await apiClient.post('/projects/sync');
-  return response.data;
+export const getSyncJob = async (jobId: number) => {
+  const response = await apiClient.get(`/projects/sync/${jobId}`);
+  return response.data;
+};
+
+// Queues a background sync and resolves once the job has finished
+export const syncProjects = async (full: boolean = false) => {
+  const response = await apiClient.post('/projects/sync', null, { params: { full } });
+  let job = response.data;
+  while (job.status === 'queued' || job.status === 'running') {
+    await new Promise((resolve) => setTimeout(resolve, 1000));
+    job = await getSyncJob(job.id);
+  }
+  if (job.status === 'failed') {
+    throw new Error(job.error || 'Sync failed');
+  }
+  return job;
 };
 
 export const getProjects = async (skip: number = 0, limit: number = 20, status?: string) => {